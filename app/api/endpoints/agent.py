@@ -1,14 +1,17 @@
 """
 API endpoints for agent.
 """
-from typing import Dict, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
+import json
 import uuid
 import logging
 from pydantic import BaseModel, Field
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from app.services.agent_service import get_agent_service, AgentService
+from app.core.config import settings
+from app.services.agent_service import get_agent_service, turn_messages, AgentService, AgentBusyError
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -21,42 +24,86 @@ class AgentRequest(BaseModel):
 
 class AgentResponse(BaseModel):
     """Response model for agent interactions."""
-    response: Dict[str, Any] = Field(..., description="Agent response")
+    messages: List[Dict[str, Any]] = Field(..., description="Messages produced by this turn")
+    response: Optional[Dict[str, Any]] = Field(
+        None, description="Full thread state, only returned with full_state=true"
+    )
     thread_id: str = Field(..., description="Thread ID for this conversation")
 
+
+def _build_response(state: Dict[str, Any], thread_id: str, full_state: bool) -> AgentResponse:
+    """Build the payload of a turn; the full thread state is opt-in."""
+    return AgentResponse(
+        messages=turn_messages(state),
+        response=state if full_state else None,
+        thread_id=thread_id
+    )
+
 # Create router
 router = APIRouter(tags=["agent"])
 
+
+def _too_many_requests(error: AgentBusyError) -> HTTPException:
+    """Build the 429 returned when the agent has no free slot on this worker."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
+def _event_stream(agent_service: AgentService, message: str, thread_id: str) -> StreamingResponse:
+    """Stream an agent run as server-sent events.
+
+    Capacity is checked before the response starts so that a saturated
+    worker still answers with a plain 429 instead of an opened stream.
+    """
+    if not agent_service.has_capacity():
+        raise _too_many_requests(AgentBusyError(settings.AGENT_RETRY_AFTER_SECONDS))
+
+    async def events() -> AsyncIterator[str]:
+        async for event in agent_service.stream_agent(message, thread_id):
+            data = json.dumps(event["data"], default=str, ensure_ascii=False)
+            yield f"event: {event['event']}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Thread-Id": thread_id,
+        }
+    )
+
 @router.post("/chat", response_model=AgentResponse)
 async def chat_with_agent(
     request: AgentRequest,
+    full_state: bool = Query(False, description="Return the whole thread state"),
     agent_service: AgentService = Depends(get_agent_service)
 ) -> AgentResponse:
     """Chat with the ReAct agent.
     
     Args:
         request: The chat request containing the user message and optional thread_id
+        full_state: Whether to include the whole thread state in the response
         agent_service: The agent service dependency
         
     Returns:
-        The agent's response and the thread_id
+        The messages of this turn and the thread_id
     """
     try:
-        # Utiliser le thread_id fourni ou laisser le service en générer un
-        thread_id = request.thread_id
-        logger.debug(f"API /chat endpoint received thread_id: {thread_id}")
+        # Utiliser le thread_id fourni ou en générer un, transmis au service
+        # pour que le client reçoive celui qui a réellement été utilisé
+        used_thread_id = request.thread_id or str(uuid.uuid4())
+        logger.debug(f"API /chat endpoint using thread_id: {used_thread_id}")
         
         # Invoquer l'agent
-        response = agent_service.invoke_agent(request.message, thread_id)
+        response = await agent_service.invoke_agent(request.message, used_thread_id)
         
-        # Récupérer le thread_id utilisé (qui peut être nouveau si aucun n'était fourni)
-        used_thread_id = thread_id or response.get("thread_id", str(uuid.uuid4()))
-        logger.debug(f"API /chat endpoint using thread_id: {used_thread_id}")
-        
-        return AgentResponse(
-            response=response,
-            thread_id=used_thread_id
-        )
+        return _build_response(response, used_thread_id, full_state)
+    except AgentBusyError as be:
+        raise _too_many_requests(be)
     except Exception as e:
         logger.error(f"Error in chat_with_agent: {str(e)}")
         raise HTTPException(
@@ -67,16 +114,18 @@ async def chat_with_agent(
 @router.post("/continue", response_model=AgentResponse)
 async def continue_conversation(
     request: AgentRequest,
+    full_state: bool = Query(False, description="Return the whole thread state"),
     agent_service: AgentService = Depends(get_agent_service)
 ) -> AgentResponse:
     """Continue an existing conversation with the agent.
     
     Args:
         request: The chat request containing the user message and thread_id
+        full_state: Whether to include the whole thread state in the response
         agent_service: The agent service dependency
         
     Returns:
-        The agent's response and the thread_id
+        The messages of this turn and the thread_id
     """
     try:
         # Thread ID is required for continuation
@@ -90,12 +139,11 @@ async def continue_conversation(
         logger.debug(f"API /continue endpoint with thread_id: {request.thread_id}")
         
         # Continue the conversation
-        response = agent_service.continue_conversation(request.message, request.thread_id)
+        response = await agent_service.continue_conversation(request.message, request.thread_id)
         
-        return AgentResponse(
-            response=response,
-            thread_id=request.thread_id
-        )
+        return _build_response(response, request.thread_id, full_state)
+    except AgentBusyError as be:
+        raise _too_many_requests(be)
     except ValueError as ve:
         logger.error(f"Value error in continue_conversation: {str(ve)}")
         raise HTTPException(
@@ -107,4 +155,49 @@ async def continue_conversation(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing request: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/chat/stream")
+async def stream_chat_with_agent(
+    request: AgentRequest,
+    agent_service: AgentService = Depends(get_agent_service)
+) -> StreamingResponse:
+    """Chat with the ReAct agent, streaming tokens and tool calls as SSE.
+
+    Args:
+        request: The chat request containing the user message and optional thread_id
+        agent_service: The agent service dependency
+
+    Returns:
+        A text/event-stream response; the thread_id is sent in the
+        X-Thread-Id header and in the final ``end`` event
+    """
+    thread_id = request.thread_id or str(uuid.uuid4())
+    logger.debug(f"API /chat/stream endpoint using thread_id: {thread_id}")
+    return _event_stream(agent_service, request.message, thread_id)
+
+
+@router.post("/continue/stream")
+async def stream_continue_conversation(
+    request: AgentRequest,
+    agent_service: AgentService = Depends(get_agent_service)
+) -> StreamingResponse:
+    """Continue an existing conversation, streaming tokens and tool calls as SSE.
+
+    Args:
+        request: The chat request containing the user message and thread_id
+        agent_service: The agent service dependency
+
+    Returns:
+        A text/event-stream response
+    """
+    if not request.thread_id:
+        logger.error("Thread ID missing in continue stream request")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Thread ID is required to continue a conversation"
+        )
+
+    logger.debug(f"API /continue/stream endpoint with thread_id: {request.thread_id}")
+    return _event_stream(agent_service, request.message, request.thread_id)
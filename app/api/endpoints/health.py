@@ -3,9 +3,12 @@ Endpoints de santé de l'application.
 """
 from typing import Dict, Any
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Response, status
 from pydantic import BaseModel
 
+from app.services.agent_service import agent_metrics, agent_ready
+from app.services.recipe_service import recipe_metrics
+
 
 class HealthResponse(BaseModel):
     """Modèle de réponse pour le health check."""
@@ -36,12 +39,34 @@ def health_check() -> HealthResponse:
     response_model=Dict[str, Any],
     status_code=status.HTTP_200_OK,
     summary="Readiness Check",
-    description="Vérifier si l'API est prête à recevoir du trafic"
+    description="Vérifier si l'API est prête à recevoir du trafic (503 tant que l'agent démarre)"
 )
-def readiness_check() -> Dict[str, Any]:
+def readiness_check(response: Response) -> Dict[str, Any]:
     """Endpoint de vérification de disponibilité."""
+    if not agent_ready():
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {
+            "status": "starting",
+            "message": "L'agent charge encore ses outils",
+            "version": "0.1.0"
+        }
     return {
         "status": "ready",
         "message": "L'API est prête à recevoir du trafic",
         "version": "0.1.0"
     }
+
+
+@router.get(
+    "/metrics",
+    response_model=Dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    summary="Metrics",
+    description="Compteurs internes du worker (conversations en mémoire, cache des recettes, évictions)"
+)
+def metrics() -> Dict[str, Any]:
+    """Endpoint d'exposition des compteurs internes du worker."""
+    return {
+        "agent": agent_metrics(),
+        "recipes": recipe_metrics()
+    }
@@ -1,22 +1,109 @@
 """
 API endpoints for recipes.
 """
-from typing import List, Optional
+from datetime import datetime, UTC
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+import hashlib
+import zlib
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, UploadFile, File
+from fastapi.responses import StreamingResponse
 
 from app.schemas.recipe import (
+    DifficultyLevel,
+    MealType,
     Recipe,
     RecipeCreate,
+    RecipeSearchFilters,
     RecipeUpdate,
     RecipeList,
+    RecipeSummary,
+    RecipeView,
     ImageURLResponse
 )
-from app.services.recipe_service import get_recipe_service, RecipeService
+from app.services.recipe_service import (
+    get_recipe_service,
+    RecipeConflictError,
+    RecipePreconditionFailedError,
+    RecipeService,
+    SearchNotReadyError
+)
 from app.services.image_service import get_image_service, ImageService
 
 router = APIRouter()
 
+# Les clients gardent les réponses mais les revalident à chaque requête
+CACHE_CONTROL = "no-cache"
+
+# Taille des morceaux envoyés par l'export, avant compression
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def _etag(versions: Iterable[Tuple[str, Optional[datetime]]], *extra: object) -> str:
+    """ETag fort d'une réponse, calculé sur l'identifiant et la date de modification de ses recettes.
+
+    Chaque écriture met à jour `updated_at` : l'ETag change dès qu'une
+    recette de la réponse change, sans hacher le corps. `extra` ajoute les
+    autres parties de la réponse (vue, pagination, curseur, total).
+    """
+    digest = hashlib.sha256()
+    for recipe_id, updated_at in versions:
+        version = _utc(updated_at).isoformat() if updated_at else ""
+        digest.update(f"{recipe_id}@{version}\n".encode())
+    for value in extra:
+        digest.update(f"{value}\n".encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def _utc(value: datetime) -> datetime:
+    """Rendre une date explicite en UTC (les dates naïves sont en UTC)."""
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def _matches(header: str, etag: str, weak: bool) -> bool:
+    """Indiquer si un ETag figure dans un en-tête If-Match / If-None-Match.
+
+    If-None-Match compare faiblement (le préfixe W/ est ignoré) ; If-Match
+    exige une comparaison forte, qu'une étiquette faible ne vérifie jamais.
+    """
+    for tag in header.split(","):
+        tag = tag.strip()
+        if weak:
+            tag = tag.removeprefix("W/")
+        if tag == "*" or tag == etag:
+            return True
+    return False
+
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Indiquer si la copie du client est à jour, d'après If-None-Match ou If-Modified-Since.
+
+    Comme le prévoit HTTP, If-Modified-Since est ignoré quand If-None-Match
+    est présent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _matches(if_none_match, etag, weak=True)
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # Les dates HTTP sont à la seconde près
+    return _utc(last_modified).replace(microsecond=0) <= _utc(since)
+
+
+def _validators(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """En-têtes de validation d'une réponse."""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+    return headers
+
 
 @router.post(
     "/",
@@ -39,6 +126,148 @@ async def create_recipe(
         )
 
 
+async def _ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Découper un corps reçu par morceaux en lignes, sans le charger entièrement."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+def _accepts_gzip(request: Request) -> bool:
+    """Indiquer si le client accepte une réponse compressée en gzip."""
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, *params = coding.split(";")
+        if name.strip().lower() != "gzip":
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        return quality > 0
+    return False
+
+
+async def _ndjson_chunks(recipes: AsyncIterator[Recipe], compress: bool) -> AsyncIterator[bytes]:
+    """Sérialiser des recettes en NDJSON par morceaux, éventuellement compressés."""
+    # wbits=31 : flux gzip (en-tête et somme de contrôle) plutôt que zlib brut
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer = bytearray()
+    
+    async for recipe in recipes:
+        buffer += recipe.model_dump_json().encode()
+        buffer += b"\n"
+        if len(buffer) >= EXPORT_CHUNK_BYTES:
+            chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+            buffer.clear()
+            if chunk:
+                yield chunk
+    
+    chunk = compressor.compress(bytes(buffer)) + compressor.flush() if compressor else bytes(buffer)
+    if chunk:
+        yield chunk
+
+
+@router.get(
+    "/export",
+    summary="Exporter toutes les recettes",
+    description=(
+        "Diffuser toutes les recettes en NDJSON (une recette par ligne, sans ordre "
+        "garanti), en un seul parcours de la table. Compressé en gzip si le client "
+        "l'accepte (`Accept-Encoding: gzip`)"
+    ),
+    response_class=StreamingResponse
+)
+async def export_recipes(
+    request: Request,
+    service: RecipeService = Depends(get_recipe_service)
+) -> StreamingResponse:
+    """Exporter le catalogue complet en NDJSON."""
+    compress = _accepts_gzip(request)
+    headers = {
+        "Content-Disposition": 'attachment; filename="recipes.ndjson"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        _ndjson_chunks(service.export_recipes(), compress),
+        media_type="application/x-ndjson",
+        headers=headers
+    )
+
+
+@router.post(
+    "/bulk",
+    summary="Importer des recettes en masse",
+    description=(
+        "Créer des recettes à partir d'un corps NDJSON (une recette JSON par ligne, "
+        "au format de `POST /recipes`). La réponse, en NDJSON, est diffusée au fil de "
+        "l'import : une ligne par recette avec son numéro de ligne et l'identifiant "
+        "créé ou la raison de l'échec, dans l'ordre d'achèvement"
+    ),
+    response_class=StreamingResponse
+)
+async def import_recipes(
+    request: Request,
+    service: RecipeService = Depends(get_recipe_service)
+) -> StreamingResponse:
+    """Importer des recettes depuis un flux NDJSON."""
+    async def results() -> AsyncIterator[str]:
+        async for result in service.import_recipes(_ndjson_lines(request.stream())):
+            yield result.model_dump_json() + "\n"
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/search",
+    response_model=RecipeList,
+    summary="Rechercher des recettes",
+    description=(
+        "Rechercher dans les titres, descriptions, tags et ingrédients (`q`, classé par "
+        "pertinence) et/ou par ingrédient (`ingredient`, via l'index des ingrédients)"
+    )
+)
+async def search_recipes(
+    q: Optional[str] = Query(None, min_length=2, description="Texte recherché"),
+    ingredient: Optional[str] = Query(None, min_length=2, description="Ingrédient recherché"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    service: RecipeService = Depends(get_recipe_service)
+) -> RecipeList:
+    """Rechercher des recettes par texte et/ou par ingrédient."""
+    if not q and not ingredient:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Préciser `q` ou `ingredient`"
+        )
+    try:
+        recipes, total = await service.search_recipes(
+            query=q, ingredient=ingredient, skip=skip, limit=limit
+        )
+    except SearchNotReadyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"}
+        )
+    return RecipeList(
+        recipes=recipes,
+        total=total,
+        skip=skip,
+        limit=limit
+    )
+
+
 @router.get(
     "/{recipe_id}",
     response_model=Recipe,
@@ -47,15 +276,21 @@ async def create_recipe(
 )
 async def get_recipe(
     recipe_id: str,
+    request: Request,
+    response: Response,
     service: RecipeService = Depends(get_recipe_service)
-) -> Recipe:
-    """Récupérer une recette par son ID."""
+) -> Union[Recipe, Response]:
+    """Récupérer une recette par son ID, ou 304 si la copie du client est à jour."""
     recipe = await service.get_recipe(recipe_id)
     if not recipe:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Recipe not found"
         )
+    headers = _validators(_etag([(recipe.id, recipe.updated_at)]), recipe.updated_at)
+    if _not_modified(request, headers["ETag"], recipe.updated_at):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
     return recipe
 
 
@@ -63,20 +298,93 @@ async def get_recipe(
     "/",
     response_model=RecipeList,
     summary="Lister les recettes",
-    description="Récupérer une liste paginée de recettes"
+    description=(
+        "Récupérer une page de recettes. Passer `next_cursor` de la réponse "
+        "dans `cursor` pour obtenir la page suivante ; `skip` est conservé "
+        "pour compatibilité mais coûte plus cher. Avec des filtres (difficulté, "
+        "type de repas, temps maximums, tags, ingrédient), `total` n'est renvoyé "
+        "que s'il est connu sans parcourir la table. La page porte un ETag : "
+        "avec `If-None-Match`, une page inchangée renvoie 304"
+    )
 )
 async def get_recipes(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Curseur renvoyé par la page précédente"),
+    view: RecipeView = Query(
+        RecipeView.FULL, description="`summary` pour ne renvoyer que titre, difficulté, temps et image"
+    ),
+    difficulty: Optional[DifficultyLevel] = Query(None),
+    meal_type: Optional[MealType] = Query(None),
+    max_prep_time: Optional[int] = Query(None, ge=1, description="Temps de préparation maximum"),
+    max_total_time: Optional[int] = Query(None, ge=1, description="Temps total maximum"),
+    tags: Optional[List[str]] = Query(None, description="Au moins un de ces tags"),
+    ingredient: Optional[str] = Query(None, min_length=2, description="Recherche par ingrédient"),
     service: RecipeService = Depends(get_recipe_service)
-) -> RecipeList:
-    """Lister les recettes avec pagination."""
-    recipes, total = await service.get_all_recipes(skip=skip, limit=limit)
+) -> Union[RecipeList, Response]:
+    """Lister les recettes avec pagination par curseur, éventuellement filtrées."""
+    filters = RecipeSearchFilters(
+        difficulty=difficulty,
+        meal_type=meal_type,
+        max_prep_time=max_prep_time,
+        max_total_time=max_total_time,
+        tags=tags,
+        ingredient=ingredient
+    )
+    if filters.model_dump(exclude_none=True):
+        try:
+            recipes, next_cursor, total = await service.list_recipes(
+                skip=skip,
+                limit=limit,
+                filters=filters,
+                summary=view == RecipeView.SUMMARY,
+                cursor=cursor
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        return _recipe_page(request, response, recipes, view, total, skip, limit, next_cursor)
+    
+    try:
+        recipes, next_cursor = await service.get_recipes_page(
+            limit=limit, cursor=cursor, skip=skip, summary=view == RecipeView.SUMMARY
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    total = await service.count_recipes()
+    return _recipe_page(request, response, recipes, view, total, skip, limit, next_cursor)
+
+
+def _recipe_page(
+    request: Request,
+    response: Response,
+    recipes: List[Union[Recipe, RecipeSummary]],
+    view: RecipeView,
+    total: Optional[int],
+    skip: int,
+    limit: int,
+    next_cursor: Optional[str]
+) -> Union[RecipeList, Response]:
+    """Construire une page de liste avec son ETag, ou 304 si la copie du client est à jour."""
+    versions = [(recipe.id, recipe.updated_at) for recipe in recipes]
+    # Deux vues ou deux paginations des mêmes recettes sont des corps différents
+    headers = _validators(_etag(versions, view.value, skip, limit, next_cursor, total))
+    if _not_modified(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
     return RecipeList(
         recipes=recipes,
         total=total,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor
     )
 
 
@@ -84,20 +392,44 @@ async def get_recipes(
     "/{recipe_id}",
     response_model=Recipe,
     summary="Mettre à jour une recette",
-    description="Mettre à jour une recette existante"
+    description=(
+        "Mettre à jour une recette existante. Avec `If-Match` (ETag d'une lecture "
+        "précédente), la mise à jour est refusée (412) si la recette a changé depuis"
+    )
 )
 async def update_recipe(
     recipe_id: str,
     recipe_update: RecipeUpdate,
+    request: Request,
+    response: Response,
     service: RecipeService = Depends(get_recipe_service)
 ) -> Recipe:
-    """Mettre à jour une recette."""
-    updated_recipe = await service.update_recipe(recipe_id, recipe_update)
+    """Mettre à jour une recette, éventuellement à condition qu'elle n'ait pas changé."""
+    if_match = request.headers.get("if-match")
+    precondition = None
+    if if_match is not None:
+        precondition = lambda updated_at: _matches(if_match, _etag([(recipe_id, updated_at)]), weak=False)
+    
+    try:
+        updated_recipe = await service.update_recipe(recipe_id, recipe_update, precondition)
+    except RecipePreconditionFailedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=str(e)
+        )
+    except RecipeConflictError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     if not updated_recipe:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Recipe not found"
         )
+    response.headers.update(
+        _validators(_etag([(updated_recipe.id, updated_recipe.updated_at)]), updated_recipe.updated_at)
+    )
     return updated_recipe
 
 
@@ -152,6 +484,8 @@ async def upload_recipe_image(
         return ImageURLResponse(url=image_url, image_type=image_type)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except RecipeConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.post(
@@ -186,6 +520,8 @@ async def upload_additional_recipe_image(
         return ImageURLResponse(url=image_url, image_type=image_type)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except RecipeConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.get(
@@ -0,0 +1,120 @@
+"""
+Registre des clients Azure partagés par le worker.
+
+Les clients Table Storage et Blob Storage asynchrones sont créés une seule
+fois par processus et partagent une même session aiohttp, ce qui évite de
+rouvrir des connexions et de re-provisionner la table et le conteneur à
+chaque requête.
+"""
+import asyncio
+from typing import Dict, Optional
+
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.data.tables.aio import TableServiceClient, TableClient
+from azure.storage.blob.aio import BlobServiceClient
+
+from app.core.azure_config import AzureSettings, azure_settings
+
+
+class AzureClients:
+    """Registre des clients Azure, ouvert au démarrage et fermé à l'arrêt."""
+
+    def __init__(self, settings: AzureSettings = azure_settings):
+        """Initialiser le registre sans ouvrir de connexion."""
+        self.settings = settings
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.table_service_client: Optional[TableServiceClient] = None
+        self.blob_service_client: Optional[BlobServiceClient] = None
+        self._table_clients: Dict[str, TableClient] = {}
+        self._lock = asyncio.Lock()
+        # Vrai une fois les tables et le conteneur provisionnés
+        self._ready = False
+
+    @property
+    def is_open(self) -> bool:
+        """Indique si les clients ont été créés et le stockage provisionné."""
+        return self._ready
+
+    def _build_session(self) -> aiohttp.ClientSession:
+        """Créer la session HTTP partagée avec un pool de connexions borné."""
+        connector = aiohttp.TCPConnector(limit=self.settings.azure_http_pool_size)
+        return aiohttp.ClientSession(connector=connector)
+
+    async def open(self) -> None:
+        """Créer les clients et provisionner les tables et le conteneur une seule fois.
+
+        Si le provisionnement échoue, la session et les clients déjà créés
+        sont fermés avant de propager l'erreur ; l'appel suivant réessaie.
+        """
+        if self.is_open or not self.settings.is_azure_configured:
+            return
+
+        async with self._lock:
+            if self.is_open:
+                return
+
+            # Rattachés au registre dès leur création, pour que close() les retrouve
+            self.session = self._build_session()
+            connection_string = self.settings.azure_storage_connection_string
+            try:
+                # Chaque client a son propre transport mais tous partagent la session
+                self.table_service_client = TableServiceClient.from_connection_string(
+                    connection_string,
+                    transport=AioHttpTransport(session=self.session, session_owner=False),
+                )
+                self.blob_service_client = BlobServiceClient.from_connection_string(
+                    connection_string,
+                    transport=AioHttpTransport(session=self.session, session_owner=False),
+                )
+
+                for table_name in self.settings.table_names:
+                    await self.table_service_client.create_table_if_not_exists(table_name)
+                try:
+                    await self.blob_service_client.create_container(
+                        self.settings.blob_container_name,
+                        public_access="blob"
+                    )
+                except Exception:
+                    # Le conteneur existe déjà ou erreur de permissions
+                    pass
+            except BaseException:
+                await self.close()
+                raise
+
+            self._ready = True
+
+    async def close(self) -> None:
+        """Fermer les clients et la session HTTP partagée."""
+        self._ready = False
+        for table_client in self._table_clients.values():
+            await table_client.close()
+        self._table_clients.clear()
+
+        if self.table_service_client:
+            await self.table_service_client.close()
+            self.table_service_client = None
+        if self.blob_service_client:
+            await self.blob_service_client.close()
+            self.blob_service_client = None
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def get_table_client(self, table_name: str) -> Optional[TableClient]:
+        """Retourner le client partagé d'une table, ou None si Azure n'est pas configuré."""
+        await self.open()
+        if not self.table_service_client:
+            return None
+        if table_name not in self._table_clients:
+            self._table_clients[table_name] = self.table_service_client.get_table_client(table_name)
+        return self._table_clients[table_name]
+
+    async def get_blob_service_client(self) -> Optional[BlobServiceClient]:
+        """Retourner le client Blob Storage partagé, ou None si Azure n'est pas configuré."""
+        await self.open()
+        return self.blob_service_client
+
+
+# Registre global, un par worker
+azure_clients = AzureClients()
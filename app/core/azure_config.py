@@ -1,7 +1,7 @@
 """
 Configuration pour les services Azure.
 """
-from typing import Optional
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class AzureSettings(BaseSettings):
@@ -21,9 +21,28 @@ class AzureSettings(BaseSettings):
     
     # Nom de la table pour les recettes
     recipes_table_name: str = "recipes"
+    # Nom de la table d'index ingrédient -> recettes
+    ingredient_index_table_name: str = "ingredientindex"
+    # Nom de la table d'index tag -> recettes
+    tag_index_table_name: str = "tagindex"
+    # Nom de la table d'index type de repas -> recettes
+    meal_type_index_table_name: str = "mealtypeindex"
     # Nom du conteneur pour les images
     blob_container_name: str = "recipe-images"
 
+    # Nombre maximum de connexions HTTP ouvertes vers le stockage, par worker
+    azure_http_pool_size: int = 100
+
+    @property
+    def table_names(self) -> List[str]:
+        """Tables provisionnées au démarrage."""
+        return [
+            self.recipes_table_name,
+            self.ingredient_index_table_name,
+            self.tag_index_table_name,
+            self.meal_type_index_table_name,
+        ]
+
     @property
     def is_azure_configured(self) -> bool:
         """Vérifie si Azure est configuré."""
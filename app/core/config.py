@@ -1,7 +1,7 @@
 """
 Configuration de l'application.
 """
-from typing import List
+from typing import List, Optional
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -26,5 +26,50 @@ class Settings(BaseSettings):
     # Configuration OpenAI
     OPENAI_API_KEY: str = ""
 
+    # Agent
+    # Nombre maximum d'exécutions simultanées de l'agent par worker
+    AGENT_MAX_CONCURRENCY: int = 4
+    # Attente maximale d'un créneau libre avant de répondre 429 (0 = refus immédiat)
+    AGENT_QUEUE_TIMEOUT_SECONDS: float = 0.0
+    # Valeur de l'en-tête Retry-After renvoyé quand l'agent est saturé
+    AGENT_RETRY_AFTER_SECONDS: int = 5
+    # Nombre maximum de conversations gardées en mémoire par worker
+    AGENT_MAX_THREADS: int = 1000
+    # Durée d'inactivité après laquelle une conversation est oubliée (0 = jamais)
+    AGENT_THREAD_IDLE_TTL_SECONDS: float = 3600.0
+    # Stockage des conversations : "memory" (par worker) ou "sqlite" (partagé, durable)
+    AGENT_CHECKPOINTER: str = "memory"
+    # Fichier SQLite des conversations, sur disque local
+    AGENT_SQLITE_PATH: str = "data/checkpoints.sqlite"
+    # Délai avant de relancer un démarrage de l'agent en échec, doublé à chaque échec
+    AGENT_STARTUP_RETRY_SECONDS: float = 1.0
+    # Délai maximum entre deux tentatives de démarrage de l'agent
+    AGENT_STARTUP_RETRY_MAX_SECONDS: float = 60.0
+    # Sessions MCP gardées ouvertes par serveur (0 = une session par appel d'outil)
+    MCP_POOL_SIZE: int = 2
+    # Intervalle entre deux pings des sessions MCP inactives (0 = désactivé)
+    MCP_HEALTHCHECK_INTERVAL_SECONDS: float = 30.0
+
+    # Recettes
+    # Intervalle de réconciliation du compteur de recettes (0 = désactivée)
+    RECIPE_COUNT_RECONCILE_SECONDS: float = 3600.0
+    # Nombre de partitions entre lesquelles les recettes sont réparties (1 = partition unique
+    # "recipe") ; à changer uniquement après `python -m app.services.recipe_partitions <n>`
+    RECIPE_PARTITION_BUCKETS: int = 1
+    # Cache des recettes décodées, par worker : nombre d'entrées et durée de vie (0 = désactivé)
+    RECIPE_CACHE_MAX_ENTRIES: int = 1000
+    RECIPE_CACHE_TTL_SECONDS: float = 60.0
+    # Cache partagé entre workers : redis://... (ou rediss://...), memory:// ou vide pour aucun
+    SHARED_CACHE_URL: Optional[str] = None
+    # Durée de vie dans le cache partagé d'une recette et d'une page de liste
+    SHARED_CACHE_RECIPE_TTL_SECONDS: float = 300.0
+    SHARED_CACHE_LIST_TTL_SECONDS: float = 60.0
+    # Indexer au démarrage les recettes créées avant les index secondaires
+    RECIPE_INDEX_BACKFILL_ON_STARTUP: bool = False
+    # Moteur de recherche plein texte en mémoire, construit au démarrage de chaque worker
+    SEARCH_ENGINE_ENABLED: bool = True
+    # Intervalle de reconstruction, pour voir les écritures des autres workers (0 = jamais)
+    SEARCH_ENGINE_REFRESH_SECONDS: float = 900.0
+
 
 settings = Settings()
\ No newline at end of file
@@ -1,11 +1,43 @@
 """
 Point d'entrée principal de l'application FastAPI.
 """
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.router import api_router
+from app.core.azure_clients import azure_clients
 from app.core.config import settings
+from app.services.agent_service import close_agent_service, start_agent_service
+from app.services.image_service import close_image_service, get_image_service
+from app.services.recipe_service import (
+    close_recipe_service,
+    get_recipe_service,
+    start_recipe_maintenance,
+    stop_recipe_maintenance,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Ouvrir les clients Azure une fois par worker et les fermer à l'arrêt, avec l'agent."""
+    await azure_clients.open()
+    # Instancier les services partagés avant la première requête
+    recipe_service = await get_recipe_service()
+    await get_image_service()
+    start_recipe_maintenance(recipe_service)
+    # Démarrer les serveurs MCP de l'agent en arrière-plan ; /health/ready attend la fin
+    start_agent_service()
+    try:
+        yield
+    finally:
+        await close_agent_service()
+        await stop_recipe_maintenance()
+        await close_recipe_service()
+        close_image_service()
+        await azure_clients.close()
 
 
 def create_application() -> FastAPI:
@@ -15,6 +47,7 @@ def create_application() -> FastAPI:
         version=settings.VERSION,
         description=settings.DESCRIPTION,
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        lifespan=lifespan,
     )
 
     # Configuration CORS
@@ -24,6 +57,8 @@ def create_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Validateurs des requêtes conditionnelles, lisibles par les clients web
+        expose_headers=["ETag", "Last-Modified"],
     )
 
     # Inclusion des routeurs
@@ -3,7 +3,7 @@ Schémas Pydantic pour les recettes de cuisine.
 """
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import List, Optional, Union
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field, validator, ConfigDict
@@ -125,6 +125,34 @@ class Recipe(RecipeBase):
     total_time_minutes: int = Field(..., description="Temps total (préparation + cuisson)")
 
 
+class RecipeView(str, Enum):
+    """Vue renvoyée par les listes de recettes."""
+    FULL = "full"
+    SUMMARY = "summary"
+
+
+class RecipeSummary(BaseModel):
+    """Vue allégée d'une recette pour les écrans de liste."""
+    id: str = Field(..., description="Identifiant unique de la recette")
+    title: str
+    difficulty: DifficultyLevel
+    prep_time_minutes: Optional[int] = None
+    cook_time_minutes: Optional[int] = None
+    total_time_minutes: int
+    main_image_url: Optional[str] = None
+    updated_at: Optional[datetime] = Field(None, description="Date de dernière modification")
+
+    class Config:
+        use_enum_values = True
+
+
+class RecipeImportResult(BaseModel):
+    """Résultat de l'import d'une ligne NDJSON."""
+    line: int = Field(..., description="Numéro de la ligne dans le fichier importé")
+    id: Optional[str] = Field(None, description="Identifiant de la recette créée")
+    error: Optional[str] = Field(None, description="Raison de l'échec")
+
+
 class RecipeSearchFilters(BaseModel):
     """Filtres pour la recherche de recettes."""
     difficulty: Optional[DifficultyLevel] = None
@@ -137,10 +165,17 @@ class RecipeSearchFilters(BaseModel):
 
 class RecipeList(BaseModel):
     """Modèle pour une liste paginée de recettes."""
-    recipes: List[Recipe] = Field(..., description="Liste des recettes")
-    total: int = Field(..., description="Nombre total de recettes")
+    recipes: List[Union[Recipe, RecipeSummary]] = Field(
+        ..., description="Liste des recettes, complètes ou résumées selon la vue demandée"
+    )
+    total: Optional[int] = Field(
+        ..., description="Nombre total de recettes, absent quand le calculer coûterait un parcours complet"
+    )
     skip: int = Field(..., description="Nombre d'éléments ignorés")
     limit: int = Field(..., description="Nombre maximum d'éléments retournés")
+    next_cursor: Optional[str] = Field(
+        None, description="Curseur opaque de la page suivante, absent sur la dernière page"
+    )
 
 
 class ImageURLResponse(BaseModel):
@@ -1,25 +1,40 @@
 """Agent service module for handling ReAct agent interactions."""
 
-from typing import Dict, Any
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Any, List
+import asyncio
 import uuid
 from langgraph.prebuilt import create_react_agent 
-from langgraph.checkpoint.memory import InMemorySaver
 from langchain_openai import ChatOpenAI
 from langchain_mcp_adapters.client import MultiServerMCPClient
 import logging
 
 from app.core.config import settings
+from app.services.checkpointer import BoundedInMemorySaver, open_sqlite_saver
+from app.services.mcp_pool import MCPSessionPool
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+
+class AgentBusyError(Exception):
+    """Raised when every agent slot of this worker is already in use."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Agent is at capacity, retry later")
+        self.retry_after = retry_after
+
+
 class AgentService:
     """Service for handling ReAct agent interactions."""
     
     def __init__(self):
         """Initialize the agent service with basic components."""
-        # Create an in-memory saver for checkpointing conversations
-        self.checkpointer = InMemorySaver()
+        # Create a bounded in-memory saver for checkpointing conversations
+        self.checkpointer = BoundedInMemorySaver(
+            max_threads=settings.AGENT_MAX_THREADS,
+            idle_ttl_seconds=settings.AGENT_THREAD_IDLE_TTL_SECONDS,
+        )
         
         # Get API key from settings and clean it
         api_key = settings.OPENAI_API_KEY
@@ -51,25 +66,55 @@ class AgentService:
 )
         # Agent will be initialized in the setup method
         self.tools = None
+        self.mcp_pool = None
         self.agent = None
+
+        # Caps the number of agent runs executing concurrently on this worker
+        self._semaphore = asyncio.Semaphore(settings.AGENT_MAX_CONCURRENCY)
         
     @classmethod
     async def create(cls):
         """Asynchronous factory method to create and initialize the agent service.
+
+        If initialization fails, the MCP sessions and the checkpointer
+        connection opened so far are closed before the error is raised.
         
         Returns:
             An initialized AgentService instance
         """
         service = cls()
-        # Define tools that the agent can use
-        service.tools = await service.client.get_tools()
+        try:
+            if settings.AGENT_CHECKPOINTER == "sqlite":
+                # Share conversations with the other workers and across restarts
+                service.checkpointer = await open_sqlite_saver(settings.AGENT_SQLITE_PATH)
+
+            # Define tools that the agent can use
+            if settings.MCP_POOL_SIZE > 0:
+                # Reuse long-lived sessions instead of spawning a server per tool call
+                service.mcp_pool = MCPSessionPool(
+                    service.client,
+                    size=settings.MCP_POOL_SIZE,
+                    healthcheck_interval=settings.MCP_HEALTHCHECK_INTERVAL_SECONDS,
+                )
+                await service.mcp_pool.start()
+                service.tools = service.mcp_pool.get_tools()
+            else:
+                service.tools = await service.client.get_tools()
         
-        # Initialize the agent with the model
-        service.agent = create_react_agent(
-            model=service.model, 
-            tools=service.tools,
-            checkpointer=service.checkpointer,
-        )
+            # Initialize the agent with the model
+            service.agent = create_react_agent(
+                model=service.model, 
+                tools=service.tools,
+                checkpointer=service.checkpointer,
+            )
+        except BaseException:
+            # A failed build is retried: release what it opened so that
+            # attempts do not pile up connections and MCP servers
+            try:
+                await service.close()
+            except Exception:
+                logger.exception("Error releasing a failed agent service build")
+            raise
         
         return service
     
@@ -83,8 +128,32 @@ class AgentService:
             A string describing the weather
         """
         return f"It's always sunny in {city}!"
+
+    @asynccontextmanager
+    async def _concurrency_slot(self) -> AsyncIterator[None]:
+        """Hold one agent slot for the duration of a run.
+
+        Raises:
+            AgentBusyError: If no slot frees up within AGENT_QUEUE_TIMEOUT_SECONDS
+        """
+        timeout = settings.AGENT_QUEUE_TIMEOUT_SECONDS
+        try:
+            if timeout <= 0:
+                if self._semaphore.locked():
+                    raise asyncio.TimeoutError
+                await self._semaphore.acquire()
+            else:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Agent at capacity, rejecting run")
+            raise AgentBusyError(settings.AGENT_RETRY_AFTER_SECONDS)
+
+        try:
+            yield
+        finally:
+            self._semaphore.release()
     
-    def invoke_agent(self, message: str, thread_id: str = None) -> Dict[str, Any]:
+    async def invoke_agent(self, message: str, thread_id: str = None) -> Dict[str, Any]:
         """Invoke the agent with a user message.
         
         Args:
@@ -110,17 +179,20 @@ class AgentService:
         logger.debug(f"Agent config: {config}")
         
         try:
-            response = self.agent.invoke(
-                {"messages": [{"role": "user", "content": message}]},
-                config
-            )
+            async with self._concurrency_slot():
+                response = await self.agent.ainvoke(
+                    {"messages": [{"role": "user", "content": message}]},
+                    config
+                )
             logger.debug(f"Agent response keys: {response.keys()}")
             return response
+        except AgentBusyError:
+            raise
         except Exception as e:
             logger.error(f"Error invoking agent: {str(e)}")
             raise
     
-    def continue_conversation(self, message: str, thread_id: str) -> Dict[str, Any]:
+    async def continue_conversation(self, message: str, thread_id: str) -> Dict[str, Any]:
         """Continue an existing conversation with the agent.
         
         Args:
@@ -145,28 +217,259 @@ class AgentService:
         logger.debug(f"Continue config: {config}")
         
         try:
-            response = self.agent.invoke(
-                {"messages": [{"role": "user", "content": message}]},
-                config
-            )
+            async with self._concurrency_slot():
+                response = await self.agent.ainvoke(
+                    {"messages": [{"role": "user", "content": message}]},
+                    config
+                )
             logger.debug(f"Continue response keys: {response.keys()}")
             return response
+        except AgentBusyError:
+            raise
         except Exception as e:
             logger.error(f"Error continuing conversation: {str(e)}")
             raise
 
+    async def close(self) -> None:
+        """Release the MCP sessions and the resources held by the checkpointer."""
+        if self.mcp_pool is not None:
+            await self.mcp_pool.close()
+        conn = getattr(self.checkpointer, "conn", None)
+        if conn is not None:
+            await conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return runtime counters for monitoring.
+
+        Returns:
+            Checkpointer size and eviction counters (in-memory checkpointer only)
+            and MCP session pool counters
+        """
+        stats = getattr(self.checkpointer, "stats", None)
+        result = {
+            "checkpointer": stats() if stats is not None else {"backend": settings.AGENT_CHECKPOINTER}
+        }
+        if self.mcp_pool is not None:
+            result["mcp_sessions"] = self.mcp_pool.stats()
+        return result
+
+    def has_capacity(self) -> bool:
+        """Tell whether a new run would get a slot (or may queue for one).
+
+        Streaming endpoints call this before sending headers so that a
+        saturated worker can still answer with a plain 429.
+        """
+        return settings.AGENT_QUEUE_TIMEOUT_SECONDS > 0 or not self._semaphore.locked()
+
+    async def stream_agent(self, message: str, thread_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Run the agent and yield progress events as they happen.
+
+        Each event is a dict with an ``event`` name and a ``data`` payload:
+        ``token`` for model output chunks, ``tool_start`` / ``tool_end`` for
+        MCP tool calls, then ``end`` (or ``error``) once the run is over.
+
+        Args:
+            message: The user message to process
+            thread_id: The thread ID for conversation continuity
+
+        Yields:
+            The agent events, in order
+        """
+        config = {
+            "configurable": {
+                "thread_id": thread_id
+            }
+        }
+
+        logger.debug(f"Streaming agent run with thread_id: {thread_id}")
+
+        try:
+            async with self._concurrency_slot():
+                async for event in self.agent.astream_events(
+                    {"messages": [{"role": "user", "content": message}]},
+                    config,
+                    version="v2"
+                ):
+                    kind = event["event"]
+                    if kind == "on_chat_model_stream":
+                        content = _chunk_text(event["data"]["chunk"])
+                        if content:
+                            yield {"event": "token", "data": {"content": content}}
+                    elif kind == "on_tool_start":
+                        yield {
+                            "event": "tool_start",
+                            "data": {"name": event["name"], "input": event["data"].get("input")}
+                        }
+                    elif kind == "on_tool_end":
+                        output = event["data"].get("output")
+                        yield {
+                            "event": "tool_end",
+                            "data": {"name": event["name"], "output": getattr(output, "content", output)}
+                        }
+            yield {"event": "end", "data": {"thread_id": thread_id}}
+        except AgentBusyError as e:
+            yield {"event": "error", "data": {"detail": str(e), "retry_after": e.retry_after}}
+        except Exception as e:
+            logger.error(f"Error streaming agent run: {str(e)}")
+            yield {"event": "error", "data": {"detail": f"Error processing request: {str(e)}"}}
+
+
+def turn_messages(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return the messages produced by the latest turn of a thread, serialized.
+
+    The final state of a run holds the whole thread; the turn starts right
+    after the last human message, which is the one sent for this run.
+
+    Args:
+        state: The state returned by the agent run
+
+    Returns:
+        The AI and tool messages of the turn as plain dicts
+    """
+    messages = state.get("messages", [])
+    start = 0
+    for index in range(len(messages) - 1, -1, -1):
+        if getattr(messages[index], "type", None) == "human":
+            start = index + 1
+            break
+    return [_message_to_dict(message) for message in messages[start:]]
+
+
+def _message_to_dict(message: Any) -> Dict[str, Any]:
+    """Serialize a LangChain message to the fields clients actually use."""
+    data = {
+        "type": message.type,
+        "content": message.content,
+        "id": message.id,
+    }
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        data["tool_calls"] = [
+            {"id": call.get("id"), "name": call["name"], "args": call["args"]}
+            for call in tool_calls
+        ]
+    if message.type == "tool":
+        data["name"] = message.name
+        data["tool_call_id"] = message.tool_call_id
+    return data
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Extract the text of a streamed model chunk (str or list of content blocks)."""
+    content = getattr(chunk, "content", "")
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "") for block in content
+        if isinstance(block, dict) and block.get("type") == "text"
+    )
+
 
 # Singleton instance
 _agent_service = None
+# Background initialization started by the application lifespan
+_agent_startup = None
+# Background loop retrying a failed initialization until it succeeds
+_agent_supervisor = None
+
+
+async def _build_agent_service() -> AgentService:
+    """Build the agent service (MCP servers and tools) and publish it."""
+    global _agent_service
+    try:
+        _agent_service = await AgentService.create()
+    except Exception:
+        logger.exception("Error initializing agent service")
+        raise
+    logger.info(f"Agent service ready with {len(_agent_service.tools)} tools")
+    return _agent_service
+
+
+def _agent_startup_task() -> "asyncio.Task[AgentService]":
+    """Return the shared build of the agent service, starting it if needed.
+
+    Runs without awaiting, so concurrent callers on the event loop always
+    get the same task. A failed build is replaced by a new attempt.
+    """
+    global _agent_startup
+    if _agent_startup is None or (_agent_startup.done() and _agent_startup.exception() is not None):
+        _agent_startup = asyncio.create_task(_build_agent_service())
+    return _agent_startup
+
+
+async def _supervise_agent_startup() -> None:
+    """Retry a failed build of the agent service until it succeeds.
+
+    Waits AGENT_STARTUP_RETRY_SECONDS after the first failure, doubling the
+    delay up to AGENT_STARTUP_RETRY_MAX_SECONDS, so that a worker whose MCP
+    servers were briefly unavailable becomes ready without a chat request.
+    """
+    delay = settings.AGENT_STARTUP_RETRY_SECONDS
+    while _agent_service is None:
+        try:
+            # Shielded so that stopping the loop does not abort a build awaited by requests
+            await asyncio.shield(_agent_startup_task())
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning(f"Agent service unavailable, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.AGENT_STARTUP_RETRY_MAX_SECONDS)
+
+
+def start_agent_service() -> None:
+    """Start building the agent service in the background.
+
+    Called from the application lifespan so that the MCP servers are
+    spawned and their tools loaded before the first chat request, while the
+    worker already answers health probes. Failed builds are retried in the
+    background until one succeeds.
+    """
+    global _agent_supervisor
+    if _agent_service is None and (_agent_supervisor is None or _agent_supervisor.done()):
+        _agent_supervisor = asyncio.create_task(_supervise_agent_startup())
+
+
+def agent_ready() -> bool:
+    """Tell whether the agent service is initialized and can take requests."""
+    return _agent_service is not None
 
 
 async def get_agent_service() -> AgentService:
     """Get or create the agent service singleton asynchronously.
+
+    Concurrent callers on a cold worker all await the same build, so the
+    MCP servers are only spawned once.
     
     Returns:
         The agent service instance
     """
-    global _agent_service
+    if _agent_service is not None:
+        return _agent_service
+    # Shielded so that a cancelled request does not abort the shared build
+    return await asyncio.shield(_agent_startup_task())
+
+
+async def close_agent_service() -> None:
+    """Close the agent service singleton if it was started."""
+    global _agent_service, _agent_startup, _agent_supervisor
+    if _agent_supervisor is not None and not _agent_supervisor.done():
+        _agent_supervisor.cancel()
+    _agent_supervisor = None
+    if _agent_startup is not None and not _agent_startup.done():
+        _agent_startup.cancel()
+    _agent_startup = None
+    if _agent_service is not None:
+        await _agent_service.close()
+        _agent_service = None
+
+
+def agent_metrics() -> Dict[str, Any]:
+    """Get the agent service counters without initializing the service.
+
+    Returns:
+        The service stats, or an empty dict if the agent is not started yet
+    """
     if _agent_service is None:
-        _agent_service = await AgentService.create()
-    return _agent_service
\ No newline at end of file
+        return {}
+    return _agent_service.stats()
@@ -0,0 +1,146 @@
+"""Checkpointers used to persist agent conversations."""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import logging
+import os
+import threading
+import time
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple
+from langgraph.checkpoint.memory import InMemorySaver
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedInMemorySaver(InMemorySaver):
+    """In-memory checkpointer that caps the number of resident threads.
+
+    Threads are tracked in least-recently-used order. A thread idle for
+    longer than ``idle_ttl_seconds`` is dropped, and once more than
+    ``max_threads`` threads are resident the least recently used ones are
+    evicted. Evicted threads behave like unknown thread IDs: the next
+    message starts a fresh conversation.
+    """
+
+    def __init__(self, max_threads: int, idle_ttl_seconds: float, **kwargs: Any):
+        """Initialize the checkpointer.
+
+        Args:
+            max_threads: Maximum number of threads kept in memory
+            idle_ttl_seconds: Idle time after which a thread is dropped (0 disables expiry)
+        """
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.evictions = 0
+        self.expirations = 0
+        # thread_id -> last access time, oldest first
+        self._last_access: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _drop(self, thread_id: str) -> None:
+        """Remove a thread and everything stored for it."""
+        self._last_access.pop(thread_id, None)
+        super().delete_thread(thread_id)
+
+    def _expire_idle(self, now: float) -> None:
+        """Drop the threads idle for longer than the TTL."""
+        if self.idle_ttl_seconds <= 0:
+            return
+        while self._last_access:
+            thread_id, last_access = next(iter(self._last_access.items()))
+            if now - last_access <= self.idle_ttl_seconds:
+                break
+            self._drop(thread_id)
+            self.expirations += 1
+            logger.debug(f"Expired idle thread {thread_id}")
+
+    def _touch(self, thread_id: str) -> None:
+        """Mark a thread as just used, then enforce the size limit."""
+        self._last_access[thread_id] = time.monotonic()
+        self._last_access.move_to_end(thread_id)
+        while len(self._last_access) > self.max_threads:
+            oldest = next(iter(self._last_access))
+            self._drop(oldest)
+            self.evictions += 1
+            logger.debug(f"Evicted least recently used thread {oldest}")
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Get a checkpoint tuple, refreshing the thread's position in the LRU."""
+        thread_id = str(config["configurable"]["thread_id"])
+        with self._lock:
+            self._expire_idle(time.monotonic())
+            if thread_id in self._last_access:
+                self._touch(thread_id)
+            return super().get_tuple(config)
+
+    def put(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> RunnableConfig:
+        """Save a checkpoint and account for its thread."""
+        thread_id = str(config["configurable"]["thread_id"])
+        with self._lock:
+            self._expire_idle(time.monotonic())
+            result = super().put(config, *args, **kwargs)
+            self._touch(thread_id)
+            return result
+
+    def put_writes(self, config: RunnableConfig, *args: Any, **kwargs: Any) -> None:
+        """Save intermediate writes and account for their thread."""
+        thread_id = str(config["configurable"]["thread_id"])
+        with self._lock:
+            super().put_writes(config, *args, **kwargs)
+            self._touch(thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete a thread explicitly (not counted as an eviction)."""
+        with self._lock:
+            self._drop(str(thread_id))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return resident size and eviction counters for monitoring."""
+        with self._lock:
+            self._expire_idle(time.monotonic())
+            return {
+                "resident_threads": len(self._last_access),
+                "max_threads": self.max_threads,
+                "idle_ttl_seconds": self.idle_ttl_seconds,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+async def open_sqlite_saver(path: str, busy_timeout_ms: int = 5000) -> BaseCheckpointSaver:
+    """Open a SQLite checkpointer shared by every worker of the host.
+
+    The database runs in WAL mode so that readers never block the writer,
+    with ``synchronous=NORMAL`` so that commits are only fsynced when the
+    WAL is checkpointed rather than once per saved step. Workers racing for
+    the write lock wait up to ``busy_timeout_ms`` instead of failing.
+
+    Args:
+        path: Path of the database file on local disk
+        busy_timeout_ms: How long a writer waits for the lock, in milliseconds
+
+    Returns:
+        A ready-to-use checkpointer; close it with ``saver.conn.close()``
+    """
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = await aiosqlite.connect(path)
+    try:
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        saver = AsyncSqliteSaver(conn)
+        await saver.setup()
+    except BaseException:
+        await conn.close()
+        raise
+    logger.info(f"Using SQLite checkpointer at {path}")
+    return saver
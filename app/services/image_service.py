@@ -4,32 +4,24 @@ Service pour la gestion des images avec Azure Blob Storage.
 import uuid
 from typing import List, Optional
 from fastapi import UploadFile, HTTPException
-from azure.storage.blob import BlobServiceClient, BlobClient
+from azure.storage.blob.aio import BlobServiceClient
 from azure.core.exceptions import ResourceNotFoundError
-from io import BytesIO
 
+from app.core.azure_clients import azure_clients
 from app.core.azure_config import azure_settings
 
 
 class ImageService:
     """Service pour gérer les images dans Azure Blob Storage."""
     
-    def __init__(self):
-        """Initialiser le service avec la connexion Azure Blob Storage."""
+    def __init__(self, blob_service_client: Optional[BlobServiceClient] = None):
+        """Initialiser le service avec un client Azure Blob Storage partagé.
+
+        Le conteneur est provisionné par le registre des clients au démarrage,
+        pas à chaque instanciation du service.
+        """
         self.container_name = azure_settings.blob_container_name
-        self.blob_service_client: Optional[BlobServiceClient] = None
-        
-        # Initialiser seulement si Azure est configuré
-        if azure_settings.is_azure_configured:
-            self.blob_service_client = BlobServiceClient.from_connection_string(
-                azure_settings.azure_storage_connection_string
-            )
-            # Créer le conteneur s'il n'existe pas
-            try:
-                self.blob_service_client.create_container(self.container_name, public_access="blob")
-            except Exception:
-                # Le conteneur existe déjà ou erreur de permissions
-                pass
+        self.blob_service_client: Optional[BlobServiceClient] = blob_service_client
     
     async def upload_image(
         self,
@@ -69,7 +61,7 @@ class ImageService:
                 blob=blob_name
             )
             
-            blob_client.upload_blob(content, overwrite=True)
+            await blob_client.upload_blob(content, overwrite=True)
             
             return blob_client.url
             
@@ -102,7 +94,7 @@ class ImageService:
                 blob=blob_name
             )
             
-            blob_client.delete_blob()
+            await blob_client.delete_blob()
             return True
             
         except ResourceNotFoundError:
@@ -131,7 +123,7 @@ class ImageService:
             ).list_blobs(name_starts_with=blob_prefix)
             
             image_urls = []
-            for blob in blobs:
+            async for blob in blobs:
                 blob_client = self.blob_service_client.get_blob_client(
                     container=self.container_name,
                     blob=blob.name
@@ -201,10 +193,20 @@ class ImageService:
             return None
 
 
+# Instance partagée par le worker
+_image_service: Optional[ImageService] = None
+
+
 # Fonction factory pour l'injection de dépendances
-def get_image_service() -> ImageService:
-    """Retourne une instance du service d'images pour l'injection de dépendances."""
-    return ImageService()
+async def get_image_service() -> ImageService:
+    """Retourne l'instance partagée du service d'images pour l'injection de dépendances."""
+    global _image_service
+    if _image_service is None:
+        _image_service = ImageService(await azure_clients.get_blob_service_client())
+    return _image_service
+
 
-# Pour la compatibilité avec le code existant
-image_service = ImageService()
+def close_image_service() -> None:
+    """Oublier l'instance partagée ; son client Blob Storage est fermé avec azure_clients."""
+    global _image_service
+    _image_service = None
@@ -0,0 +1,213 @@
+"""Pool of long-lived MCP sessions shared by the agent's tools."""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import logging
+
+from langchain_core.tools import BaseTool, StructuredTool
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
+
+logger = logging.getLogger(__name__)
+
+
+class _SessionSlot:
+    """One open MCP session and the tools bound to it.
+
+    The session lives in a dedicated task: the stdio transport must be
+    entered and exited from the same task, so the task holds it open until
+    the slot is stopped.
+    """
+
+    def __init__(self, client: MultiServerMCPClient, server_name: str):
+        self.client = client
+        self.server_name = server_name
+        self.session = None
+        self.tools: Dict[str, BaseTool] = {}
+        self.restarts = 0
+        self._task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._error: Optional[BaseException] = None
+
+    @property
+    def alive(self) -> bool:
+        """Tell whether the session is open and its task still running."""
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Open the session and load its tools.
+
+        Raises:
+            Exception: If the server could not be started
+        """
+        self._ready.clear()
+        self._stop.clear()
+        self._error = None
+        self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    async def _run(self) -> None:
+        try:
+            async with self.client.session(self.server_name) as session:
+                self.tools = {tool.name: tool for tool in await load_mcp_tools(session)}
+                self.session = session
+                self._ready.set()
+                await self._stop.wait()
+        except Exception as e:
+            self._error = e
+            logger.error(f"MCP session for {self.server_name} failed: {str(e)}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def stop(self) -> None:
+        """Close the session and wait for its server to exit."""
+        self._stop.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def restart(self) -> None:
+        """Replace a dead or unhealthy session with a fresh one."""
+        await self.stop()
+        self.restarts += 1
+        logger.warning(f"Restarting MCP session for {self.server_name}")
+        await self.start()
+
+
+class MCPSessionPool:
+    """Keep ``size`` sessions open per MCP server and route tool calls to them.
+
+    Tools returned by ``MultiServerMCPClient.get_tools()`` open a new stdio
+    session, hence a new server process, for every call. The pooled tools
+    instead check out an idle session, call the tool on it and hand it
+    back. Dead sessions are restarted when checked out, and idle ones are
+    pinged every ``healthcheck_interval`` seconds.
+    """
+
+    def __init__(self, client: MultiServerMCPClient, size: int, healthcheck_interval: float = 30.0):
+        """Initialize the pool.
+
+        Args:
+            client: The client holding the MCP server connections
+            size: Number of sessions kept open per server
+            healthcheck_interval: Seconds between pings of idle sessions (0 disables them)
+        """
+        self.client = client
+        self.size = size
+        self.healthcheck_interval = healthcheck_interval
+        self._slots: Dict[str, List[_SessionSlot]] = {}
+        self._idle: Dict[str, asyncio.Queue] = {}
+        self._tools: List[BaseTool] = []
+        self._healthcheck: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Open every session and build the pooled tools.
+
+        If a session fails to start, every session already opened (of this
+        server and of the previous ones) is closed before the error is raised.
+        """
+        for server_name in self.client.connections:
+            slots = [_SessionSlot(self.client, server_name) for _ in range(self.size)]
+            results = await asyncio.gather(*(slot.start() for slot in slots), return_exceptions=True)
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                await asyncio.gather(*(slot.stop() for slot in slots))
+                await self.close()
+                raise errors[0]
+            self._slots[server_name] = slots
+            self._idle[server_name] = asyncio.Queue()
+            for slot in slots:
+                self._idle[server_name].put_nowait(slot)
+            self._tools.extend(
+                self._pooled_tool(server_name, tool) for tool in slots[0].tools.values()
+            )
+        if self.healthcheck_interval > 0:
+            self._healthcheck = asyncio.create_task(self._healthcheck_loop())
+        logger.info(f"MCP session pool started with {self.size} sessions per server")
+
+    def get_tools(self) -> List[BaseTool]:
+        """Return the tools of every server, bound to the pool."""
+        return list(self._tools)
+
+    async def close(self) -> None:
+        """Stop the health checks and close every session."""
+        if self._healthcheck is not None:
+            self._healthcheck.cancel()
+            await asyncio.gather(self._healthcheck, return_exceptions=True)
+            self._healthcheck = None
+        slots = [slot for server_slots in self._slots.values() for slot in server_slots]
+        await asyncio.gather(*(slot.stop() for slot in slots))
+        self._slots.clear()
+        self._idle.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-server session counters for monitoring."""
+        return {
+            server_name: {
+                "size": len(slots),
+                "idle": self._idle[server_name].qsize(),
+                "alive": sum(slot.alive for slot in slots),
+                "restarts": sum(slot.restarts for slot in slots),
+            }
+            for server_name, slots in self._slots.items()
+        }
+
+    @asynccontextmanager
+    async def _checkout(self, server_name: str) -> AsyncIterator[_SessionSlot]:
+        """Hold an idle session of a server for the duration of a call."""
+        idle = self._idle[server_name]
+        slot = await idle.get()
+        try:
+            if not slot.alive:
+                await slot.restart()
+            yield slot
+        finally:
+            idle.put_nowait(slot)
+
+    def _pooled_tool(self, server_name: str, template: BaseTool) -> BaseTool:
+        """Wrap a tool so that each call runs on a pooled session."""
+        async def call_tool(**arguments: Any) -> Any:
+            async with self._checkout(server_name) as slot:
+                try:
+                    return await slot.tools[template.name].coroutine(**arguments)
+                except Exception:
+                    if not slot.alive:
+                        # The server died during the call; the next checkout restarts it
+                        logger.warning(f"MCP session for {server_name} died during {template.name}")
+                    raise
+
+        return StructuredTool(
+            name=template.name,
+            description=template.description,
+            args_schema=template.args_schema,
+            coroutine=call_tool,
+            response_format=template.response_format,
+            metadata=template.metadata,
+        )
+
+    async def _healthcheck_loop(self) -> None:
+        """Ping idle sessions periodically and restart the unresponsive ones."""
+        while True:
+            await asyncio.sleep(self.healthcheck_interval)
+            for server_name, idle in self._idle.items():
+                for _ in range(idle.qsize()):
+                    slot = idle.get_nowait()
+                    try:
+                        if slot.alive:
+                            await asyncio.wait_for(slot.session.send_ping(), timeout=self.healthcheck_interval)
+                        else:
+                            await slot.restart()
+                    except Exception as e:
+                        logger.warning(f"MCP session for {server_name} failed its health check: {str(e)}")
+                        try:
+                            await slot.restart()
+                        except Exception:
+                            # Already logged by the slot; retried on next checkout
+                            pass
+                    finally:
+                        idle.put_nowait(slot)
@@ -0,0 +1,95 @@
+"""
+Cache en mémoire des recettes décodées, propre à chaque worker.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+import time
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """Cache LRU dont les entrées expirent après `ttl_seconds`.
+
+    Les valeurs sont partagées entre les appelants : elles ne doivent pas
+    être modifiées. `version` change à chaque invalidation ; une valeur lue
+    avant une invalidation n'est pas mise en cache (voir `put`), ce qui
+    évite de réinsérer une recette périmée après une écriture concurrente.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        """Initialiser un cache vide.
+
+        Args:
+            max_entries: Nombre maximum d'entrées gardées
+            ttl_seconds: Durée de vie d'une entrée
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # clé -> (date d'expiration, valeur), la moins récemment utilisée en tête
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Retourner la valeur en cache, ou None si elle est absente ou expirée."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: V, version: Optional[int] = None) -> None:
+        """Mettre une valeur en cache.
+
+        Args:
+            key: Clé de la valeur
+            value: Valeur à garder
+            version: `version` relevée avant de lire la valeur ; si une
+                invalidation a eu lieu depuis, la valeur est ignorée
+        """
+        if version is not None and version != self.version:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Retirer une valeur après une écriture."""
+        self.version += 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Vider le cache."""
+        self.version += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Taille et compteurs du cache, pour la supervision."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,71 @@
+"""
+Index secondaires des recettes stockés dans Azure Table Storage.
+"""
+from typing import Iterable, List, Optional, Set
+import asyncio
+
+from azure.data.tables import TableEntity
+from azure.data.tables.aio import TableClient
+
+# Taille des pages lues dans une liste de postings
+POSTING_PAGE_SIZE = 1000
+
+
+class PostingIndex:
+    """Index inversé clé -> identifiants de recettes.
+
+    Chaque clé est une partition de la table et chaque recette qui la porte
+    une ligne de cette partition : une recherche ne lit que les lignes des
+    recettes trouvées, quelle que soit la taille du catalogue.
+    """
+
+    def __init__(self, table_client: Optional[TableClient]):
+        """Initialiser l'index avec le client de sa table."""
+        self.table_client = table_client
+
+    async def add(self, recipe_id: str, keys: Iterable[str]) -> None:
+        """Rattacher une recette à des clés."""
+        async def put(key: str) -> None:
+            entity = TableEntity()
+            entity["PartitionKey"] = key
+            entity["RowKey"] = recipe_id
+            await self.table_client.upsert_entity(entity=entity)
+
+        await asyncio.gather(*(put(key) for key in set(keys)))
+
+    async def remove(self, recipe_id: str, keys: Iterable[str]) -> None:
+        """Retirer une recette des postings de ces clés."""
+        await asyncio.gather(*(
+            self.table_client.delete_entity(partition_key=key, row_key=recipe_id)
+            for key in set(keys)
+        ))
+
+    async def replace(self, recipe_id: str, old_keys: Set[str], new_keys: Set[str]) -> None:
+        """Mettre à jour les clés d'une recette en n'écrivant que la différence."""
+        await asyncio.gather(
+            self.remove(recipe_id, old_keys - new_keys),
+            self.add(recipe_id, new_keys - old_keys),
+        )
+
+    async def lookup(self, key: str) -> Set[str]:
+        """Retourner les identifiants des recettes portant une clé."""
+        entities = self.table_client.query_entities(
+            query_filter="PartitionKey eq @key",
+            parameters={"key": key},
+            select=["RowKey"],
+            results_per_page=POSTING_PAGE_SIZE
+        )
+        return {entity["RowKey"] async for entity in entities}
+
+    async def lookup_all(self, keys: Iterable[str]) -> Set[str]:
+        """Retourner les identifiants des recettes portant toutes les clés."""
+        keys = list(set(keys))
+        if not keys:
+            return set()
+        postings: List[Set[str]] = await asyncio.gather(*(self.lookup(key) for key in keys))
+        return set.intersection(*postings)
+
+    async def lookup_any(self, keys: Iterable[str]) -> Set[str]:
+        """Retourner les identifiants des recettes portant au moins une des clés."""
+        postings: List[Set[str]] = await asyncio.gather(*(self.lookup(key) for key in set(keys)))
+        return set().union(*postings)
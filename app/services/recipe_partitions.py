@@ -0,0 +1,126 @@
+"""
+Répartition des recettes entre partitions Azure Table Storage.
+
+Avec une seule partition, toutes les recettes vivent dans la partition
+historique "recipe". Au-delà, chaque recette est rangée dans un seau
+("recipe-000", "recipe-001"...) déterminé par un hachage de son identifiant :
+une lecture ponctuelle reste un seul appel, et le débit n'est plus plafonné
+par celui d'une partition.
+
+Changer le nombre de partitions impose de re-ranger la table existante,
+application arrêtée :
+
+    python -m app.services.recipe_partitions <nombre de partitions>
+"""
+from typing import List, Optional
+import asyncio
+import sys
+import zlib
+
+from azure.data.tables import TableEntity
+from azure.data.tables.aio import TableClient
+
+# Partition historique, utilisée tant que les recettes ne sont pas réparties
+RECIPE_PARTITION = "recipe"
+
+# Bornes couvrant "recipe" et "recipe-NNN", mais pas la partition des métadonnées
+_RECIPE_PARTITIONS_FILTER = "PartitionKey ge 'recipe' and PartitionKey lt 'recipf'"
+
+# Recettes déplacées en parallèle par la migration
+MIGRATION_CONCURRENCY = 16
+
+# Recettes lues par page et déplacées par lot pendant la migration
+MIGRATION_BATCH_SIZE = 1000
+
+
+def recipe_partition(recipe_id: str, buckets: int) -> str:
+    """Partition d'une recette pour un nombre de partitions donné."""
+    if buckets <= 1:
+        return RECIPE_PARTITION
+    return f"{RECIPE_PARTITION}-{zlib.crc32(recipe_id.encode()) % buckets:03d}"
+
+
+def recipe_partitions(buckets: int) -> List[str]:
+    """Toutes les partitions de recettes pour un nombre de partitions donné."""
+    if buckets <= 1:
+        return [RECIPE_PARTITION]
+    return [f"{RECIPE_PARTITION}-{bucket:03d}" for bucket in range(buckets)]
+
+
+async def migrate_partitions(table_client: TableClient, buckets: int) -> int:
+    """Re-ranger toutes les recettes selon un nouveau nombre de partitions.
+
+    Chaque recette mal placée est copiée dans sa nouvelle partition puis
+    supprimée de l'ancienne : une migration interrompue peut être relancée.
+    Les recettes sont lues et déplacées par lots de MIGRATION_BATCH_SIZE :
+    la mémoire ne dépend pas de la taille de la table.
+
+    Returns:
+        Le nombre de recettes déplacées
+    """
+    semaphore = asyncio.Semaphore(MIGRATION_CONCURRENCY)
+
+    async def move(entity: TableEntity, partition: str) -> None:
+        async with semaphore:
+            moved = TableEntity()
+            moved.update(entity)
+            moved["PartitionKey"] = partition
+            await table_client.upsert_entity(entity=moved, mode="replace")
+            await table_client.delete_entity(partition_key=entity["PartitionKey"], row_key=entity["RowKey"])
+
+    async def read_batch(after: Optional[TableEntity]) -> List[TableEntity]:
+        # Reprendre après la dernière entité lue, et non sur un jeton de
+        # continuation : les lots déplacés modifient les partitions parcourues
+        query_filter = _RECIPE_PARTITIONS_FILTER
+        parameters = {}
+        if after is not None:
+            query_filter += (
+                " and (PartitionKey gt @partition"
+                " or (PartitionKey eq @partition and RowKey gt @row))"
+            )
+            parameters = {"partition": after["PartitionKey"], "row": after["RowKey"]}
+        pages = table_client.query_entities(
+            query_filter=query_filter,
+            parameters=parameters,
+            results_per_page=MIGRATION_BATCH_SIZE
+        ).by_page()
+        batch: List[TableEntity] = []
+        async for page in pages:
+            batch.extend([entity async for entity in page])
+            if len(batch) >= MIGRATION_BATCH_SIZE:
+                break
+        return batch
+
+    moved = 0
+    batch = await read_batch(None)
+    while batch:
+        misplaced = []
+        for entity in batch:
+            partition = recipe_partition(entity["RowKey"], buckets)
+            if entity["PartitionKey"] != partition:
+                misplaced.append((entity, partition))
+        await asyncio.gather(*(move(entity, partition) for entity, partition in misplaced))
+        moved += len(misplaced)
+        batch = await read_batch(batch[-1])
+    return moved
+
+
+async def _main(buckets: int) -> None:
+    from app.core.azure_clients import azure_clients
+    from app.core.azure_config import azure_settings
+
+    await azure_clients.open()
+    try:
+        table_client = await azure_clients.get_table_client(azure_settings.recipes_table_name)
+        if table_client is None:
+            raise SystemExit("Azure n'est pas configuré")
+        moved = await migrate_partitions(table_client, buckets)
+        print(f"{moved} recettes déplacées vers {buckets} partition(s)")
+    finally:
+        await azure_clients.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or not sys.argv[1].isdigit() or int(sys.argv[1]) < 1:
+        raise SystemExit("Usage : python -m app.services.recipe_partitions <nombre de partitions>")
+    asyncio.run(_main(int(sys.argv[1])))
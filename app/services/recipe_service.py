@@ -2,46 +2,189 @@
 Service pour la gestion des recettes avec Azure Table Storage.
 """
 from datetime import datetime, UTC
-from typing import List, Optional, Tuple
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+import asyncio
+import base64
+import binascii
+import hashlib
+import heapq
+import random
 import uuid
 import json
 
-from azure.data.tables import TableServiceClient, TableEntity, TableClient
-from azure.core.exceptions import ResourceNotFoundError
+from azure.core import MatchConditions
+from azure.data.tables import TableEntity
+from azure.data.tables.aio import TableClient
+from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
 
+from app.core.azure_clients import azure_clients
 from app.core.azure_config import azure_settings
-from app.schemas.recipe import Recipe, RecipeCreate, RecipeUpdate, RecipeSearchFilters
+from app.core.config import settings
+from app.schemas.recipe import (
+    DifficultyLevel,
+    Recipe,
+    RecipeCreate,
+    RecipeImportResult,
+    RecipeSearchFilters,
+    RecipeSummary,
+    RecipeUpdate,
+)
+from app.services.recipe_cache import LRUCache
+from app.services.recipe_index import PostingIndex
+from app.services.recipe_partitions import recipe_partition, recipe_partitions
+from app.services.search_engine import SearchEngine, recipe_fields
+from app.services.shared_cache import SharedCache, open_shared_cache
+from app.services.text import ingredient_keys, label_key
+
+
+# Colonnes lues par _entity_to_recipe, demandées explicitement au service de table
+RECIPE_COLUMNS = [
+    "RowKey", "title", "description", "difficulty", "meal_type", "servings",
+    "prep_time_minutes", "cook_time_minutes", "total_time_minutes",
+    "created_at", "updated_at", "ingredients", "steps", "tags",
+    "main_image_url", "additional_images",
+]
+
+# Colonnes de la vue résumée : ni les ingrédients ni les étapes ne sont téléchargés
+SUMMARY_COLUMNS = [
+    "RowKey", "title", "difficulty", "prep_time_minutes", "cook_time_minutes",
+    "total_time_minutes", "main_image_url", "updated_at",
+]
+
+# Taille des pages utilisées pour parcourir les seules clés des recettes
+KEY_SCAN_PAGE_SIZE = 1000
+
+# Entité de métadonnées tenant le nombre de recettes, hors de la partition des recettes
+META_PARTITION = "meta"
+RECIPE_COUNT_ROW = "recipe_count"
+# Tentatives de mise à jour optimiste du compteur avant d'abandonner au profit de la réconciliation
+COUNTER_MAX_RETRIES = 10
+
+# Tentatives d'écriture conditionnelle (ETag) d'une recette disputée, et attente
+# de base avant de relire ; l'attente double à chaque tentative, avec un tirage
+# aléatoire pour désynchroniser les écrivains concurrents
+RECIPE_WRITE_MAX_RETRIES = 10
+RECIPE_WRITE_BACKOFF_SECONDS = 0.01
+
+# Import en masse : écritures par transaction (maximum de Table Storage) et
+# transactions soumises en parallèle
+IMPORT_BATCH_SIZE = 100
+IMPORT_CONCURRENCY = 8
+
+
+# Colonnes lues pour vérifier les filtres qui ne passent pas par un index
+FILTER_COLUMNS = ["RowKey", "difficulty", "prep_time_minutes", "total_time_minutes", "tags", "meal_type"]
+# Au-delà de ce nombre de candidates issues des index, les filtres restants
+# sont vérifiés par un parcours filtré côté serveur plutôt que par lectures ponctuelles
+FILTER_POINT_READ_LIMIT = 200
+
+# Clés du cache partagé : recette décodée, version des listes et page de liste.
+# La version est incrémentée à chaque écriture, ce qui rend toutes les pages
+# en cache inaccessibles sans avoir à les parcourir ; elles expirent ensuite.
+SHARED_RECIPE_KEY = "recipe:{}"
+SHARED_LIST_VERSION_KEY = "recipes:version"
+SHARED_LIST_KEY = "recipes:list:{}:{}"
+
+# Colonnes lues pour alimenter le moteur de recherche plein texte
+SEARCH_COLUMNS = ["RowKey", "title", "description", "tags", "ingredients"]
+
+
+class SearchNotReadyError(RuntimeError):
+    """Le moteur de recherche plein texte n'est pas (encore) construit sur ce worker."""
+
+
+class RecipePreconditionFailedError(RuntimeError):
+    """La recette ne vérifie plus la condition posée par l'appelant (If-Match)."""
+
+
+class RecipeConflictError(RuntimeError):
+    """La recette a été modifiée en continu par d'autres écrivains : l'écriture est abandonnée."""
+
+
+def encode_cursor(after: Optional[str]) -> Optional[str]:
+    """Encoder une position de lecture (dernière recette renvoyée) en curseur opaque."""
+    if not after:
+        return None
+    raw = json.dumps({"after": after}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, bool]:
+    """Décoder un curseur opaque ; ValueError s'il a été altéré.
+
+    Returns:
+        L'identifiant de départ et s'il est inclus : les curseurs d'avant
+        ce format ({"RowKey": ...}) désignent la prochaine recette à lire
+    """
+    try:
+        token = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Curseur de pagination invalide")
+    if isinstance(token, dict) and isinstance(token.get("after"), str):
+        return token["after"], False
+    if isinstance(token, dict) and isinstance(token.get("RowKey"), str):
+        return token["RowKey"], True
+    raise ValueError("Curseur de pagination invalide")
 
 
 class RecipeService:
     """Service pour la gestion des recettes avec Azure Table Storage."""
     
-    def __init__(self):
-        """Initialiser le service avec la connexion Azure Table Storage."""
+    def __init__(
+        self,
+        table_client: Optional[TableClient] = None,
+        ingredient_index: Optional[PostingIndex] = None,
+        tag_index: Optional[PostingIndex] = None,
+        meal_type_index: Optional[PostingIndex] = None,
+        partition_buckets: Optional[int] = None,
+        cache: Optional[LRUCache[Recipe]] = None,
+        shared_cache: Optional[SharedCache] = None
+    ):
+        """Initialiser le service avec un client Azure Table Storage partagé.
+
+        La table est provisionnée par le registre des clients au démarrage,
+        pas à chaque instanciation du service. Sans index secondaire, la
+        recherche et les filtres correspondants parcourent la table. Le
+        cache, s'il est fourni, garde les recettes lues par get_recipe ; le
+        cache partagé, commun aux workers, garde aussi les pages de liste.
+        """
         self.table_name = azure_settings.recipes_table_name
-        self.table_client: Optional[TableClient] = None
-        
-        # Initialiser seulement si Azure est configuré
-        if azure_settings.is_azure_configured:
-            self.table_service_client = TableServiceClient.from_connection_string(
-                azure_settings.azure_storage_connection_string
-            )
-            # Créer la table si elle n'existe pas
-            self.table_service_client.create_table_if_not_exists(self.table_name)
-            self.table_client = self.table_service_client.get_table_client(self.table_name)
+        self.table_client: Optional[TableClient] = table_client
+        self.ingredient_index = ingredient_index
+        self.tag_index = tag_index
+        self.meal_type_index = meal_type_index
+        self.partition_buckets = partition_buckets or settings.RECIPE_PARTITION_BUCKETS
+        self.cache = cache
+        self.shared_cache = shared_cache
+        # Construit en arrière-plan par rebuild_search_engine
+        self.search_engine: Optional[SearchEngine] = None
+        # Écritures survenues pendant une reconstruction, rejouées sur le nouvel index
+        self._search_replay: Optional[List[Tuple[str, Optional[Dict[str, str]]]]] = None
+    
+    def _partition(self, recipe_id: str) -> str:
+        """Partition d'une recette, calculée à partir de son identifiant."""
+        return recipe_partition(recipe_id, self.partition_buckets)
+    
+    async def _get_entity(self, recipe_id: str, select: Optional[List[str]] = None) -> TableEntity:
+        """Lecture ponctuelle d'une recette dans sa partition."""
+        return await self.table_client.get_entity(
+            partition_key=self._partition(recipe_id), row_key=recipe_id, select=select
+        )
     
-    def _ensure_table_exists(self) -> None:
+    async def _ensure_table_exists(self) -> None:
         """S'assurer que la table existe."""
         try:
             if self.table_client:
-                self.table_client.create_table_if_not_exists(self.table_name)
+                await self.table_client.create_table()
+        except ResourceExistsError:
+            pass
         except Exception as e:
             print(f"Erreur lors de la création de la table: {e}")
     
     def _recipe_to_entity(self, recipe: Recipe) -> TableEntity:
         """Convertir une recette en entité Table Storage."""
         entity = TableEntity()
-        entity["PartitionKey"] = "recipe"
+        entity["PartitionKey"] = self._partition(recipe.id)
         entity["RowKey"] = recipe.id
         entity["title"] = recipe.title
         entity["description"] = recipe.description or ""
@@ -62,8 +205,8 @@ class RecipeService:
         # Ajouter les URLs d'images
         if recipe.main_image_url:
             entity["main_image_url"] = recipe.main_image_url
-        if recipe.additional_images:
-            entity["additional_images"] = json.dumps(recipe.additional_images)
+        if recipe.additional_images_urls:
+            entity["additional_images"] = json.dumps(recipe.additional_images_urls)
         
         return entity
     
@@ -113,16 +256,10 @@ class RecipeService:
                 print(f"Erreur lors de la création d'un ingrédient: {e}")
         
         # Récupérer les URLs d'images
-        main_image_url = entity.get("main_image_url")
+        main_image_url = entity.get("main_image_url") or None
         additional_images = safe_json_loads(entity.get("additional_images", "[]"), [])
         
-        # Gérer la difficulté avec valeur par défaut
-        difficulty_str = entity.get("difficulty", "Facile")
-        try:
-            difficulty = DifficultyLevel(difficulty_str.capitalize())
-        except ValueError:
-            print(f"Niveau de difficulté invalide: {difficulty_str}, utilisation de 'Facile'")
-            difficulty = DifficultyLevel.FACILE
+        difficulty = self._parse_difficulty(entity)
         
         # Gérer les types de repas
         meal_type_data = safe_json_loads(entity.get("meal_type", "[]"), [])
@@ -144,7 +281,7 @@ class RecipeService:
             difficulty=difficulty,
             meal_type=meal_types,
             servings=entity["servings"],
-            prep_time_minutes=entity["prep_time_minutes"],
+            prep_time_minutes=entity.get("prep_time_minutes"),
             cook_time_minutes=entity["cook_time_minutes"] if entity.get("cook_time_minutes", 0) > 0 else None,
             total_time_minutes=entity["total_time_minutes"],
             ingredients=ingredients,
@@ -153,14 +290,53 @@ class RecipeService:
             created_at=entity["created_at"],
             updated_at=entity["updated_at"],
             main_image_url=main_image_url,
-            additional_images=additional_images
+            additional_images_urls=additional_images
+        )
+    
+    def _entity_to_summary(self, entity: TableEntity) -> RecipeSummary:
+        """Convertir une entité projetée sur SUMMARY_COLUMNS en résumé de recette."""
+        cook_time = entity.get("cook_time_minutes") or 0
+        return RecipeSummary(
+            id=entity["RowKey"],
+            title=entity["title"],
+            difficulty=self._parse_difficulty(entity),
+            prep_time_minutes=entity.get("prep_time_minutes"),
+            cook_time_minutes=cook_time if cook_time > 0 else None,
+            total_time_minutes=entity["total_time_minutes"],
+            main_image_url=entity.get("main_image_url") or None,
+            updated_at=entity.get("updated_at"),
         )
     
+    def _parse_difficulty(self, entity: TableEntity) -> DifficultyLevel:
+        """Lire la difficulté d'une entité, 'Facile' par défaut."""
+        difficulty_str = entity.get("difficulty") or "Facile"
+        try:
+            return DifficultyLevel(difficulty_str.capitalize())
+        except ValueError:
+            print(f"Niveau de difficulté invalide: {difficulty_str}, utilisation de 'Facile'")
+            return DifficultyLevel.EASY
+    
     async def create_recipe(self, recipe_data: RecipeCreate) -> Recipe:
         """Créer une nouvelle recette."""
         if not self.table_client:
             raise RuntimeError("Azure n'est pas configuré")
         
+        recipe = self._new_recipe(recipe_data)
+        entity = self._recipe_to_entity(recipe)
+        
+        try:
+            await self.table_client.create_entity(entity=entity)
+        except Exception as e:
+            raise RuntimeError(f"Erreur lors de la création de la recette: {e}")
+        
+        await self._invalidate(recipe.id)
+        await self._adjust_recipe_count(1)
+        await self._reindex(recipe.id, {}, self._index_keys(recipe))
+        self._index_search(recipe.id, self._recipe_search_fields(recipe))
+        return recipe
+    
+    def _new_recipe(self, recipe_data: RecipeCreate) -> Recipe:
+        """Construire une nouvelle recette, avec son identifiant et ses dates."""
         recipe_id = str(uuid.uuid4())
         now = datetime.now(UTC)
         
@@ -176,96 +352,774 @@ class RecipeService:
             if field in recipe_dict:
                 recipe_dict.pop(field)
         
-        recipe = Recipe(
+        return Recipe(
             id=recipe_id,
             created_at=now,
             updated_at=now,
             **recipe_dict
         )
+    
+    async def import_recipes(self, lines: AsyncIterable[bytes]) -> AsyncIterator[RecipeImportResult]:
+        """Créer des recettes en masse à partir de lignes JSON (NDJSON).
+
+        Chaque ligne est validée par RecipeCreate au fil de la lecture. Les
+        recettes valides sont regroupées par partition en transactions de
+        IMPORT_BATCH_SIZE écritures, soumises en parallèle (au plus
+        IMPORT_CONCURRENCY à la fois ; la lecture attend au-delà, ce qui
+        borne la mémoire). Si une transaction échoue, ses recettes sont
+        créées une à une pour isoler les lignes fautives.
+
+        Yields:
+            Le résultat de chaque ligne non vide, dans l'ordre d'achèvement
+        """
+        if not self.table_client:
+            raise RuntimeError("Azure n'est pas configuré")
         
-        entity = self._recipe_to_entity(recipe)
+        results: "asyncio.Queue[Optional[RecipeImportResult]]" = asyncio.Queue()
+        semaphore = asyncio.Semaphore(IMPORT_CONCURRENCY)
+        created = 0
+        
+        async def submit(batch: List[Tuple[int, Recipe]]) -> None:
+            nonlocal created
+            try:
+                try:
+                    await self.table_client.submit_transaction(
+                        [("create", self._recipe_to_entity(recipe)) for _, recipe in batch]
+                    )
+                    outcomes = [(line, recipe, None) for line, recipe in batch]
+                except Exception as e:
+                    print(f"Erreur lors de l'import d'un lot de recettes, reprise ligne par ligne: {e}")
+                    outcomes = await asyncio.gather(*(create_one(line, recipe) for line, recipe in batch))
+                
+                succeeded = [recipe for _, recipe, error in outcomes if error is None]
+                created += len(succeeded)
+                await asyncio.gather(*(
+                    self._reindex(recipe.id, {}, self._index_keys(recipe)) for recipe in succeeded
+                ))
+                for recipe in succeeded:
+                    self._index_search(recipe.id, self._recipe_search_fields(recipe))
+                for line, recipe, error in outcomes:
+                    results.put_nowait(RecipeImportResult(line=line, id=None if error else recipe.id, error=error))
+            finally:
+                semaphore.release()
+        
+        async def create_one(line: int, recipe: Recipe) -> Tuple[int, Recipe, Optional[str]]:
+            try:
+                await self.table_client.create_entity(entity=self._recipe_to_entity(recipe))
+                return line, recipe, None
+            except Exception as e:
+                return line, recipe, f"Erreur lors de la création de la recette: {e}"
         
+        async def produce() -> None:
+            pending: Dict[str, List[Tuple[int, Recipe]]] = {}
+            tasks: Set[asyncio.Task] = set()
+            
+            async def launch(batch: List[Tuple[int, Recipe]]) -> None:
+                await semaphore.acquire()
+                task = asyncio.create_task(submit(batch))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            
+            try:
+                line = 0
+                async for raw in lines:
+                    line += 1
+                    if not raw.strip():
+                        continue
+                    try:
+                        recipe = self._new_recipe(RecipeCreate.model_validate_json(raw))
+                    except ValueError as e:
+                        results.put_nowait(RecipeImportResult(line=line, error=str(e)))
+                        continue
+                    except Exception as e:
+                        # Une ligne fautive ne doit pas interrompre l'import
+                        results.put_nowait(
+                            RecipeImportResult(line=line, error=f"Erreur lors de la lecture de la recette: {e}")
+                        )
+                        continue
+                    batch = pending.setdefault(self._partition(recipe.id), [])
+                    batch.append((line, recipe))
+                    if len(batch) == IMPORT_BATCH_SIZE:
+                        await launch(pending.pop(self._partition(recipe.id)))
+                for batch in pending.values():
+                    await launch(batch)
+                await asyncio.gather(*list(tasks))
+            finally:
+                # Laisser aboutir les lots déjà soumis : leurs recettes sont
+                # écrites, elles doivent être comptées et signalées
+                await asyncio.gather(*list(tasks), return_exceptions=True)
+                if created:
+                    await self._adjust_recipe_count(created)
+                    await self._invalidate_listings()
+                results.put_nowait(None)
+        
+        producer = asyncio.create_task(produce())
         try:
-            self.table_client.create_entity(entity=entity)
-            return recipe
-        except Exception as e:
-            raise RuntimeError(f"Erreur lors de la création de la recette: {e}")
+            while (result := await results.get()) is not None:
+                yield result
+            # Propager une erreur de lecture de l'entrée
+            await producer
+        finally:
+            producer.cancel()
     
     async def get_recipe(self, recipe_id: str) -> Optional[Recipe]:
-        """Récupérer une recette par son ID."""
+        """Récupérer une recette par son ID, depuis le cache si possible.
+
+        La recette renvoyée peut être partagée avec d'autres requêtes : elle
+        ne doit pas être modifiée.
+        """
+        version = None
+        if self.cache is not None:
+            recipe = self.cache.get(recipe_id)
+            if recipe is not None:
+                return recipe
+            version = self.cache.version
+        
+        shared_key = SHARED_RECIPE_KEY.format(recipe_id)
+        payload = await self._shared_get(shared_key)
+        if payload is not None:
+            recipe = Recipe.model_validate_json(payload)
+        else:
+            recipe = await self._load_recipe(recipe_id)
+            if recipe is None:
+                return None
+            await self._shared_set(
+                shared_key, recipe.model_dump_json().encode(), settings.SHARED_CACHE_RECIPE_TTL_SECONDS
+            )
+        
+        if self.cache is not None:
+            self.cache.put(recipe_id, recipe, version)
+        return recipe
+    
+    async def _load_recipe(self, recipe_id: str) -> Optional[Recipe]:
+        """Lire et décoder une recette depuis la table, sans passer par le cache."""
         if not self.table_client:
             raise RuntimeError("Azure n'est pas configuré")
         
         try:
-            entity = self.table_client.get_entity(partition_key="recipe", row_key=recipe_id)
+            entity = await self._get_entity(recipe_id)
             return self._entity_to_recipe(entity)
         except ResourceNotFoundError:
             return None
         except Exception as e:
             raise RuntimeError(f"Erreur lors de la récupération de la recette: {e}")
     
-    async def get_all_recipes(self, skip: int = 0, limit: int = 10) -> Tuple[List[Recipe], int]:
-        """Récupérer toutes les recettes avec pagination."""
+    async def _invalidate(self, recipe_id: str) -> None:
+        """Retirer une recette des caches et périmer les pages de liste après une écriture."""
+        if self.cache is not None:
+            self.cache.invalidate(recipe_id)
+        if self.shared_cache is None:
+            return
+        try:
+            await asyncio.gather(
+                self.shared_cache.delete(SHARED_RECIPE_KEY.format(recipe_id)),
+                self.shared_cache.incr(SHARED_LIST_VERSION_KEY),
+            )
+        except Exception as e:
+            print(f"Erreur lors de l'invalidation du cache partagé: {e}")
+    
+    async def _invalidate_listings(self) -> None:
+        """Périmer les pages de liste du cache partagé après des créations."""
+        if self.shared_cache is None:
+            return
+        try:
+            await self.shared_cache.incr(SHARED_LIST_VERSION_KEY)
+        except Exception as e:
+            print(f"Erreur lors de l'invalidation du cache partagé: {e}")
+    
+    async def _shared_get(self, key: str) -> Optional[bytes]:
+        """Lire le cache partagé ; une panne du cache compte comme une absence."""
+        if self.shared_cache is None:
+            return None
+        try:
+            return await self.shared_cache.get(key)
+        except Exception as e:
+            print(f"Erreur lors de la lecture du cache partagé: {e}")
+            return None
+    
+    async def _shared_set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """Écrire dans le cache partagé, sans faire échouer la requête."""
+        if self.shared_cache is None:
+            return
+        try:
+            await self.shared_cache.set(key, value, ttl_seconds)
+        except Exception as e:
+            print(f"Erreur lors de l'écriture dans le cache partagé: {e}")
+    
+    async def _listing_key(self, **params: Any) -> Optional[str]:
+        """Clé du cache partagé d'une page de liste, préfixée par la version courante."""
+        if self.shared_cache is None:
+            return None
+        version = await self._shared_get(SHARED_LIST_VERSION_KEY)
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return SHARED_LIST_KEY.format(int(version or 0), digest)
+    
+    async def _cached_listing(
+        self, key: Optional[str], summary: bool
+    ) -> Optional[Tuple[List[Union[Recipe, RecipeSummary]], Optional[str], Optional[int]]]:
+        """Relire une page de liste du cache partagé."""
+        if key is None:
+            return None
+        payload = await self._shared_get(key)
+        if payload is None:
+            return None
+        listing = json.loads(payload)
+        model = RecipeSummary if summary else Recipe
+        recipes = [model.model_validate(recipe) for recipe in listing["recipes"]]
+        return recipes, listing["next_cursor"], listing["total"]
+    
+    async def _cache_listing(
+        self,
+        key: Optional[str],
+        recipes: List[Union[Recipe, RecipeSummary]],
+        next_cursor: Optional[str],
+        total: Optional[int]
+    ) -> None:
+        """Garder une page de liste dans le cache partagé."""
+        if key is None:
+            return
+        payload = json.dumps({
+            "recipes": [recipe.model_dump(mode="json") for recipe in recipes],
+            "next_cursor": next_cursor,
+            "total": total,
+        })
+        await self._shared_set(key, payload.encode(), settings.SHARED_CACHE_LIST_TTL_SECONDS)
+    
+    async def get_recipes_page(
+        self,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        summary: bool = False
+    ) -> Tuple[List[Union[Recipe, RecipeSummary]], Optional[str]]:
+        """Récupérer une page de recettes à partir d'un curseur.
+
+        Seules `limit` entités sont lues par appel. Le curseur renvoyé est
+        None sur la dernière page. `skip` (sans curseur) n'est conservé que
+        pour compatibilité : le saut se fait en ne lisant que les clés.
+        Avec `summary`, seules les colonnes du résumé sont téléchargées.
+
+        Raises:
+            ValueError: Si le curseur est invalide
+        """
+        key = await self._listing_key(page=True, limit=limit, cursor=cursor, skip=skip, summary=summary)
+        cached = await self._cached_listing(key, summary)
+        if cached is not None:
+            recipes, next_cursor, _ = cached
+            return recipes, next_cursor
+        
+        recipes, next_cursor = await self._read_recipes_page(limit, cursor, skip, summary)
+        await self._cache_listing(key, recipes, next_cursor, None)
+        return recipes, next_cursor
+    
+    async def _read_recipes_page(
+        self,
+        limit: int,
+        cursor: Optional[str],
+        skip: int,
+        summary: bool
+    ) -> Tuple[List[Union[Recipe, RecipeSummary]], Optional[str]]:
+        """Lire une page de recettes dans la table (voir get_recipes_page)."""
+        if not self.table_client:
+            raise RuntimeError("Azure n'est pas configuré")
+        
+        start, inclusive = decode_cursor(cursor) if cursor else (None, False)
+        if start is None and skip > 0:
+            start = await self._skip_to_start(skip)
+            if start is None:
+                return [], None
+        
+        try:
+            entities, after = await self._read_page(
+                "", {}, SUMMARY_COLUMNS if summary else RECIPE_COLUMNS, limit, start, inclusive=inclusive
+            )
+        except Exception as e:
+            raise RuntimeError(f"Erreur lors de la récupération des recettes: {e}")
+        
+        convert = self._entity_to_summary if summary else self._entity_to_recipe
+        recipes = []
+        for entity in entities:
+            try:
+                recipes.append(convert(entity))
+            except Exception as e:
+                # Log l'erreur mais continuer avec les autres recettes
+                print(f"Erreur lors de la conversion d'une recette: {e}")
+        
+        return recipes, encode_cursor(after)
+    
+    async def _read_page(
+        self,
+        criteria: str,
+        parameters: Dict[str, Any],
+        select: List[str],
+        limit: int,
+        start: Optional[str],
+        predicate: Optional[Callable[[TableEntity], bool]] = None,
+        inclusive: bool = False
+    ) -> Tuple[List[TableEntity], Optional[str]]:
+        """Lire, par identifiant croissant, jusqu'à `limit` entités retenues après `start`.
+
+        Chaque partition est interrogée en parallèle pour `limit` lignes et
+        les pages sont fusionnées. Une partition qui a encore des lignes
+        n'est complète que jusqu'à la dernière qu'elle a renvoyée : au-delà
+        de la plus petite de ces bornes, la lecture reprend après elle.
+        Avec `predicate`, la lecture continue jusqu'à remplir la page.
+
+        Args:
+            start: Identifiant de la dernière recette déjà lue (None pour le début)
+            inclusive: Lire à partir de `start` inclus plutôt qu'après
+
+        Returns:
+            Les entités et, s'il en reste d'autres, l'identifiant de la
+            dernière renvoyée (None à la fin)
+        """
+        entities: List[TableEntity] = []
+        while True:
+            pages = await asyncio.gather(*(
+                self._first_page(partition, criteria, parameters, select, limit, start, inclusive)
+                for partition in recipe_partitions(self.partition_buckets)
+            ))
+            ends = [rows[-1]["RowKey"] for rows, more in pages if more]
+            bound = min(ends) if ends else None
+            for entity in heapq.merge(*(rows for rows, _ in pages), key=lambda entity: entity["RowKey"]):
+                if bound is not None and entity["RowKey"] > bound:
+                    break
+                if predicate is not None and not predicate(entity):
+                    continue
+                if len(entities) == limit:
+                    return entities, entities[-1]["RowKey"]
+                entities.append(entity)
+            if bound is None:
+                return entities, None
+            if len(entities) == limit:
+                return entities, entities[-1]["RowKey"]
+            start, inclusive = bound, False
+    
+    async def _first_page(
+        self,
+        partition: str,
+        criteria: str,
+        parameters: Dict[str, Any],
+        select: List[str],
+        limit: int,
+        start: Optional[str],
+        inclusive: bool = False
+    ) -> Tuple[List[TableEntity], bool]:
+        """Lire la première page non vide d'une partition après `start`.
+
+        Le jeton de continuation est opaque : seule sa présence est lue,
+        pour savoir s'il reste des lignes. Le service peut renvoyer une page
+        vide accompagnée d'un jeton, d'où la lecture jusqu'à la première
+        page non vide.
+
+        Returns:
+            Les entités et s'il reste des lignes dans la partition
+        """
+        clauses = ["PartitionKey eq @partition"]
+        parameters = {**parameters, "partition": partition}
+        if start is not None:
+            clauses.append("RowKey ge @start" if inclusive else "RowKey gt @start")
+            parameters["start"] = start
+        if criteria:
+            clauses.append(criteria)
+        pages = self.table_client.query_entities(
+            query_filter=" and ".join(clauses),
+            parameters=parameters,
+            select=select,
+            results_per_page=limit
+        ).by_page()
+        entities: List[TableEntity] = []
+        async for page in pages:
+            entities = [entity async for entity in page]
+            if entities:
+                break
+        return entities, pages.continuation_token is not None
+    
+    async def _scan(
+        self,
+        select: List[str],
+        criteria: str = "",
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[TableEntity]:
+        """Parcourir toutes les partitions en parallèle, sans ordre garanti.
+
+        Chaque partition est lue par sa propre tâche ; les pages sont
+        transmises au fur et à mesure, au plus deux d'avance par partition.
+        """
+        partitions = recipe_partitions(self.partition_buckets)
+        query_filter = "PartitionKey eq @partition" + (f" and {criteria}" if criteria else "")
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * len(partitions))
+        
+        async def read(partition: str) -> None:
+            try:
+                pages = self.table_client.query_entities(
+                    query_filter=query_filter,
+                    parameters={**(parameters or {}), "partition": partition},
+                    select=select,
+                    results_per_page=KEY_SCAN_PAGE_SIZE
+                ).by_page()
+                async for page in pages:
+                    await queue.put([entity async for entity in page])
+            finally:
+                await queue.put(None)
+        
+        readers = [asyncio.create_task(read(partition)) for partition in partitions]
+        try:
+            finished = 0
+            while finished < len(readers):
+                page = await queue.get()
+                if page is None:
+                    finished += 1
+                    continue
+                for entity in page:
+                    yield entity
+            # Remonter l'erreur d'une partition
+            await asyncio.gather(*readers)
+        finally:
+            for reader in readers:
+                reader.cancel()
+    
+    async def export_recipes(self) -> AsyncIterator[Recipe]:
+        """Parcourir toutes les recettes en un seul passage, sans ordre garanti.
+
+        Les entités sont décodées au fil des pages : la mémoire utilisée ne
+        dépend pas de la taille du catalogue. Une entité illisible est
+        signalée et ignorée plutôt que d'interrompre l'export.
+        """
+        if not self.table_client:
+            raise RuntimeError("Azure n'est pas configuré")
+        
+        async for entity in self._scan(RECIPE_COLUMNS):
+            try:
+                recipe = self._entity_to_recipe(entity)
+            except Exception as e:
+                print(f"Recette {entity.get('RowKey')} illisible, ignorée dans l'export: {e}")
+                continue
+            yield recipe
+    
+    async def _skip_to_start(
+        self,
+        skip: int,
+        criteria: str = "",
+        parameters: Optional[Dict[str, Any]] = None,
+        predicate: Optional[Callable[[TableEntity], bool]] = None
+    ) -> Optional[str]:
+        """Trouver l'identifiant de la dernière des `skip` premières recettes retenues.
+
+        Seules les clés sont lues (et les colonnes filtrables avec
+        `predicate`) ; chaque page reprend après la dernière clé vue. La
+        lecture de la page demandée reprend ensuite après l'identifiant
+        renvoyé.
+
+        Returns:
+            L'identifiant, ou None si le catalogue compte moins de `skip` recettes
+        """
+        select = ["RowKey"] if predicate is None else FILTER_COLUMNS
+        after = None
+        while True:
+            entities, last_seen = await self._read_page(
+                criteria, parameters or {}, select, min(skip, KEY_SCAN_PAGE_SIZE), after, predicate
+            )
+            if len(entities) == skip:
+                return entities[-1]["RowKey"]
+            skip -= len(entities)
+            if last_seen is None:
+                return None
+            after = last_seen
+    
+    async def count_recipes(self) -> int:
+        """Retourner le nombre de recettes tenu par l'entité compteur.
+
+        Le compteur est créé par une réconciliation s'il n'existe pas encore.
+        """
+        if not self.table_client:
+            raise RuntimeError("Azure n'est pas configuré")
+        
+        try:
+            entity = await self.table_client.get_entity(
+                partition_key=META_PARTITION, row_key=RECIPE_COUNT_ROW
+            )
+            return entity["count"]
+        except ResourceNotFoundError:
+            return await self.reconcile_recipe_count()
+        except Exception as e:
+            raise RuntimeError(f"Erreur lors du comptage des recettes: {e}")
+    
+    async def reconcile_recipe_count(self) -> int:
+        """Recompter les recettes en ne lisant que leurs clés et corriger le compteur.
+
+        Rattrape les écarts laissés par des mises à jour abandonnées ou des
+        écritures concurrentes ; à lancer périodiquement.
+        """
         if not self.table_client:
             raise RuntimeError("Azure n'est pas configuré")
         
         try:
-            # Récupérer toutes les recettes
-            entities = list(self.table_client.query_entities(query_filter="PartitionKey eq 'recipe'"))
+            count = 0
+            async for _ in self._scan(select=["RowKey"]):
+                count += 1
             
-            # Calculer le total
-            total = len(entities)
+            counter = TableEntity()
+            counter["PartitionKey"] = META_PARTITION
+            counter["RowKey"] = RECIPE_COUNT_ROW
+            counter["count"] = count
+            await self.table_client.upsert_entity(entity=counter, mode="replace")
+            return count
+        except Exception as e:
+            raise RuntimeError(f"Erreur lors du comptage des recettes: {e}")
+    
+    async def _adjust_recipe_count(self, delta: int) -> None:
+        """Ajouter `delta` au compteur de recettes par mise à jour optimiste (ETag).
+
+        Un échec n'interrompt pas l'écriture de la recette : l'écart est
+        corrigé par la prochaine réconciliation.
+        """
+        for _ in range(COUNTER_MAX_RETRIES):
+            try:
+                counter = await self.table_client.get_entity(
+                    partition_key=META_PARTITION, row_key=RECIPE_COUNT_ROW
+                )
+            except ResourceNotFoundError:
+                # Pas encore de compteur : le premier comptage le créera
+                return
+            except Exception as e:
+                print(f"Erreur lors de la lecture du compteur de recettes: {e}")
+                return
             
-            # Appliquer la pagination
-            paginated_entities = entities[skip:skip + limit]
+            counter["count"] = max(0, counter["count"] + delta)
+            try:
+                await self.table_client.update_entity(
+                    entity=counter,
+                    mode="replace",
+                    etag=counter.metadata["etag"],
+                    match_condition=MatchConditions.IfNotModified
+                )
+                return
+            except ResourceModifiedError:
+                # Un autre worker a modifié le compteur entre-temps : relire et recommencer
+                continue
+            except Exception as e:
+                print(f"Erreur lors de la mise à jour du compteur de recettes: {e}")
+                return
+        
+        print("Compteur de recettes trop disputé, correction laissée à la réconciliation")
+    
+    async def _modify_recipe(
+        self,
+        recipe_id: str,
+        change: Callable[[Recipe], None]
+    ) -> Optional[Tuple[TableEntity, Recipe]]:
+        """Lire, modifier et réécrire une recette, à condition qu'elle n'ait pas changé entre-temps.
+
+        L'écriture est conditionnée à l'ETag de l'entité lue : si un autre
+        écrivain est passé entre la lecture et l'écriture (412), la recette
+        est relue et la modification réappliquée, au plus
+        RECIPE_WRITE_MAX_RETRIES fois.
+
+        Args:
+            recipe_id: Identifiant de la recette
+            change: Modification à appliquer sur place à la recette lue
+
+        Returns:
+            L'entité lue et la recette écrite, ou None si la recette n'existe pas
+
+        Raises:
+            RecipeConflictError: Si les tentatives sont épuisées
+        """
+        for attempt in range(RECIPE_WRITE_MAX_RETRIES):
+            try:
+                entity = await self._get_entity(recipe_id)
+            except ResourceNotFoundError:
+                return None
             
-            # Convertir les entités en recettes
-            recipes = []
-            for entity in paginated_entities:
-                try:
-                    recipe = self._entity_to_recipe(entity)
-                    recipes.append(recipe)
-                except Exception as e:
-                    # Log l'erreur mais continuer avec les autres recettes
-                    print(f"Erreur lors de la conversion d'une recette: {e}")
+            recipe = self._entity_to_recipe(entity)
+            change(recipe)
+            recipe.updated_at = datetime.now(UTC)
             
-            return recipes, total
+            try:
+                await self.table_client.update_entity(
+                    entity=self._recipe_to_entity(recipe),
+                    mode="replace",
+                    etag=entity.metadata["etag"],
+                    match_condition=MatchConditions.IfNotModified
+                )
+                return entity, recipe
+            except ResourceNotFoundError:
+                # Supprimée entre la lecture et l'écriture
+                return None
+            except ResourceModifiedError:
+                await asyncio.sleep(random.uniform(0, RECIPE_WRITE_BACKOFF_SECONDS * 2 ** attempt))
         
-        except Exception as e:
-            raise RuntimeError(f"Erreur lors de la récupération des recettes: {e}")
+        raise RecipeConflictError(f"La recette {recipe_id} est trop disputée, réessayer plus tard")
     
-    async def update_recipe(self, recipe_id: str, recipe_update: RecipeUpdate) -> Optional[Recipe]:
-        """Mettre à jour une recette existante."""
+    async def update_recipe(
+        self,
+        recipe_id: str,
+        recipe_update: RecipeUpdate,
+        precondition: Optional[Callable[[datetime], bool]] = None
+    ) -> Optional[Recipe]:
+        """Mettre à jour une recette existante.
+
+        Seules les colonnes modifiées sont écrites (fusion). Les colonnes
+        anciennes ne sont lues que si l'écriture en dépend (index, temps
+        total, précondition) ; l'écriture est alors conditionnée à l'ETag de
+        cette lecture. La recette renvoyée est relue après l'écriture, ce qui
+        remplit aussi les caches.
+
+        Args:
+            recipe_id: Identifiant de la recette
+            recipe_update: Champs à modifier
+            precondition: Condition que la date de modification stockée doit
+                vérifier au moment de l'écriture, par exemple la
+                correspondance avec un ETag If-Match
+
+        Raises:
+            RecipePreconditionFailedError: Si la recette ne vérifie pas `precondition`
+            RecipeConflictError: Si la recette est modifiée en continu par ailleurs
+        """
         if not self.table_client:
             raise RuntimeError("Azure n'est pas configuré")
         
-        existing_recipe = await self.get_recipe(recipe_id)
-        if not existing_recipe:
-            return None
+        changes = self._update_columns(recipe_update)
+        reindexed = [
+            column for column, index in self._indexes().items() if index is not None and column in changes
+        ]
         
-        update_data = recipe_update.model_dump(exclude_unset=True)
+        try:
+            old_entity = await self._merge_recipe(recipe_id, changes, reindexed, precondition)
+        except (RecipePreconditionFailedError, RecipeConflictError):
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Erreur lors de la mise à jour de la recette: {e}")
+        finally:
+            await self._invalidate(recipe_id)
+        if old_entity is None:
+            return None
         
-        # Mettre à jour les champs modifiés
+        recipe = await self.get_recipe(recipe_id)
+        if recipe is None:
+            return None
+        if reindexed:
+            old_keys = self._entity_index_keys(old_entity)
+            new_keys = self._index_keys(recipe)
+            await self._reindex(
+                recipe_id,
+                {column: old_keys[column] for column in reindexed},
+                {column: new_keys[column] for column in reindexed}
+            )
+        if changes.keys() & set(SEARCH_COLUMNS):
+            self._index_search(recipe_id, self._recipe_search_fields(recipe))
+        return recipe
+    
+    def _update_columns(self, recipe_update: RecipeUpdate) -> Dict[str, Any]:
+        """Colonnes de l'entité à écrire pour une mise à jour, sans relire la recette.
+
+        Une valeur nulle efface les champs facultatifs ; elle est ignorée
+        pour les champs obligatoires, qui ne peuvent pas être effacés.
+        """
+        update_data = recipe_update.model_dump(mode="json", exclude_unset=True)
+        changes: Dict[str, Any] = {}
         for field, value in update_data.items():
-            setattr(existing_recipe, field, value)
+            if field == "description":
+                changes["description"] = value or ""
+            elif field == "cook_time_minutes":
+                changes["cook_time_minutes"] = value or 0
+            elif field == "tags":
+                changes["tags"] = json.dumps(value or [])
+            elif field == "main_image_url":
+                # Une fusion ne peut pas retirer une colonne : la chaîne vide vaut absence
+                changes["main_image_url"] = value or ""
+            elif field == "additional_images":
+                changes["additional_images"] = json.dumps(value or [])
+            elif value is None:
+                continue
+            elif field == "meal_type":
+                changes["meal_type"] = json.dumps([value])
+            elif field == "ingredients":
+                changes["ingredients"] = json.dumps(value)
+            elif field == "steps":
+                changes["steps"] = json.dumps(
+                    [step["description"] for step in sorted(value, key=lambda step: step["order"])]
+                )
+            else:
+                changes[field] = value
         
-        # Recalculer le temps total si nécessaire
-        if 'prep_time_minutes' in update_data or 'cook_time_minutes' in update_data:
-            existing_recipe.total_time_minutes = self._calculate_total_time(
-                existing_recipe.prep_time_minutes,
-                existing_recipe.cook_time_minutes
+        if "prep_time_minutes" in changes and "cook_time_minutes" in changes:
+            changes["total_time_minutes"] = self._calculate_total_time(
+                changes["prep_time_minutes"], changes["cook_time_minutes"]
             )
+        changes["updated_at"] = datetime.now(UTC)
+        return changes
+    
+    async def _merge_recipe(
+        self,
+        recipe_id: str,
+        changes: Dict[str, Any],
+        reindexed: List[str],
+        precondition: Optional[Callable[[datetime], bool]]
+    ) -> Optional[TableEntity]:
+        """Fusionner des colonnes dans une recette.
+
+        Sans colonne ancienne à lire, la fusion est écrite directement. Sinon
+        les colonnes nécessaires sont lues et la fusion conditionnée à leur
+        ETag, avec relecture sur conflit comme `_modify_recipe`.
+
+        Returns:
+            L'entité lue avant l'écriture (vide sans lecture), ou None si la
+            recette n'existe pas
+        """
+        entity = TableEntity()
+        entity["PartitionKey"] = self._partition(recipe_id)
+        entity["RowKey"] = recipe_id
+        entity.update(changes)
         
-        # Mettre à jour la date de modification
-        existing_recipe.updated_at = datetime.now(UTC)
+        # Colonnes anciennes dont dépend l'écriture
+        select = list(reindexed)
+        if precondition is not None:
+            select.append("updated_at")
+        if ("prep_time_minutes" in changes) != ("cook_time_minutes" in changes):
+            select += ["prep_time_minutes", "cook_time_minutes"]
         
-        entity = self._recipe_to_entity(existing_recipe)
+        if not select:
+            try:
+                await self.table_client.update_entity(entity=entity, mode="merge")
+            except ResourceNotFoundError:
+                return None
+            return TableEntity()
         
-        try:
-            self.table_client.update_entity(entity=entity, mode="replace")
-            return existing_recipe
-        except Exception as e:
-            raise RuntimeError(f"Erreur lors de la mise à jour de la recette: {e}")
+        for attempt in range(RECIPE_WRITE_MAX_RETRIES):
+            try:
+                old_entity = await self._get_entity(recipe_id, select=["RowKey"] + select)
+            except ResourceNotFoundError:
+                return None
+            
+            if precondition is not None and not precondition(self._stored_datetime(old_entity["updated_at"])):
+                raise RecipePreconditionFailedError(f"La recette {recipe_id} a été modifiée")
+            if "total_time_minutes" not in changes and "prep_time_minutes" in select:
+                entity["total_time_minutes"] = self._calculate_total_time(
+                    entity.get("prep_time_minutes", old_entity.get("prep_time_minutes") or 0),
+                    entity.get("cook_time_minutes", old_entity.get("cook_time_minutes"))
+                )
+            
+            try:
+                await self.table_client.update_entity(
+                    entity=entity,
+                    mode="merge",
+                    etag=old_entity.metadata["etag"],
+                    match_condition=MatchConditions.IfNotModified
+                )
+                return old_entity
+            except ResourceNotFoundError:
+                return None
+            except ResourceModifiedError:
+                await asyncio.sleep(random.uniform(0, RECIPE_WRITE_BACKOFF_SECONDS * 2 ** attempt))
+        
+        raise RecipeConflictError(f"La recette {recipe_id} est trop disputée, réessayer plus tard")
+    
+    @staticmethod
+    def _stored_datetime(value: Any) -> datetime:
+        """Lire une date stockée, qu'elle revienne décodée ou au format ISO."""
+        return value if isinstance(value, datetime) else datetime.fromisoformat(value)
     
     async def delete_recipe(self, recipe_id: str) -> bool:
         """Supprimer une recette."""
@@ -273,80 +1127,445 @@ class RecipeService:
             raise RuntimeError("Azure n'est pas configuré")
         
         try:
-            self.table_client.delete_entity(partition_key="recipe", row_key=recipe_id)
-            return True
+            # Le service ne signale pas toujours l'absence de l'entité à la suppression,
+            # et les colonnes indexées sont nécessaires pour nettoyer les index
+            entity = await self._get_entity(recipe_id, select=["RowKey", "ingredients", "tags", "meal_type"])
+            await self.table_client.delete_entity(partition_key=self._partition(recipe_id), row_key=recipe_id)
         except ResourceNotFoundError:
             return False
         except Exception as e:
             raise RuntimeError(f"Erreur lors de la suppression de la recette: {e}")
+        finally:
+            await self._invalidate(recipe_id)
+        
+        await self._adjust_recipe_count(-1)
+        await self._reindex(recipe_id, self._entity_index_keys(entity), {})
+        self._index_search(recipe_id, None)
+        return True
     
     async def list_recipes(
         self,
         skip: int = 0,
         limit: int = 10,
-        filters: Optional[RecipeSearchFilters] = None
-    ) -> List[Recipe]:
-        """Lister les recettes avec pagination et filtres."""
+        filters: Optional[RecipeSearchFilters] = None,
+        summary: bool = False,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Union[Recipe, RecipeSummary]], Optional[str], Optional[int]]:
+        """Lister une page de recettes correspondant aux filtres, triées par identifiant.
+
+        Quand les index réduisent les candidates à peu de recettes, toutes
+        sont vérifiées et le total est connu. Sinon les critères sont poussés
+        dans le filtre OData et la page est lue à partir du curseur : le
+        total n'est pas calculé, il coûterait un parcours complet. Comme pour
+        get_recipes_page, `skip` n'est utilisé que sans curseur.
+
+        Returns:
+            La page, le curseur de la page suivante (None sur la dernière) et
+            le nombre total de recettes correspondantes s'il est connu
+
+        Raises:
+            ValueError: Si le curseur est invalide
+        """
+        filters = filters or RecipeSearchFilters()
+        key = await self._listing_key(
+            filters=filters.model_dump(mode="json"), skip=skip, limit=limit, summary=summary, cursor=cursor
+        )
+        cached = await self._cached_listing(key, summary)
+        if cached is not None:
+            return cached
+        
+        listing = await self._list_recipes(skip, limit, filters, summary, cursor)
+        await self._cache_listing(key, *listing)
+        return listing
+    
+    async def _list_recipes(
+        self,
+        skip: int,
+        limit: int,
+        filters: RecipeSearchFilters,
+        summary: bool,
+        cursor: Optional[str]
+    ) -> Tuple[List[Union[Recipe, RecipeSummary]], Optional[str], Optional[int]]:
+        """Lire une page de recettes filtrées dans la table (voir list_recipes)."""
         if not self.table_client:
             raise RuntimeError("Azure n'est pas configuré")
         
-        # Construire le filtre OData
-        filter_query = "PartitionKey eq 'recipe'"
-        
-        if filters:
-            if filters.difficulty:
-                filter_query += f" and difficulty eq '{filters.difficulty.value}'"
-            if filters.meal_type:
-                filter_query += f" and meal_type eq '{filters.meal_type.value}'"
-            if filters.max_prep_time:
-                filter_query += f" and prep_time_minutes le {filters.max_prep_time}"
-            if filters.max_total_time:
-                filter_query += f" and total_time_minutes le {filters.max_total_time}"
-        
-        entities = self.table_client.query_entities(
-            query_filter=filter_query,
-            results_per_page=limit
-        )
+        start, inclusive = decode_cursor(cursor) if cursor else (None, False)
+        candidates, residual = await self._index_candidates(filters)
         
-        recipes = []
-        count = 0
-        for entity in entities:
-            if count < skip:
-                count += 1
-                continue
-            if len(recipes) >= limit:
-                break
-            
-            recipe = self._entity_to_recipe(entity)
-            
-            # Filtres additionnels qui ne peuvent pas être faits avec OData
-            if filters and filters.tags:
-                if not any(tag in recipe.tags for tag in filters.tags):
-                    continue
-            
-            recipes.append(recipe)
+        if candidates is not None and (
+            not residual.model_dump(exclude_none=True) or len(candidates) <= FILTER_POINT_READ_LIMIT
+        ):
+            matching = await self._check_candidates(candidates, residual)
+            if start is not None:
+                remaining = [
+                    recipe_id for recipe_id in matching
+                    if recipe_id > start or (inclusive and recipe_id == start)
+                ]
+            else:
+                remaining = matching[skip:]
+            next_cursor = None
+            if len(remaining) > limit:
+                next_cursor = encode_cursor(remaining[limit - 1])
+            fetch = self.get_recipe_summaries if summary else self.get_recipes
+            return await fetch(remaining[:limit]), next_cursor, len(matching)
         
-        return recipes
-            
+        criteria, parameters = self._filter_query(residual)
+        # Critères que le filtre OData ne sait pas exprimer, vérifiés à la lecture
+        local = residual.model_copy(update={"difficulty": None, "max_prep_time": None, "max_total_time": None})
+        predicate = None
+        select = SUMMARY_COLUMNS if summary else RECIPE_COLUMNS
+        if candidates is not None or local.model_dump(exclude_none=True):
+            def predicate(entity: TableEntity) -> bool:
+                return (
+                    (candidates is None or entity["RowKey"] in candidates)
+                    and self._matches_filters(entity, local)
+                )
+            select = select + [column for column in ("tags", "meal_type") if column not in select]
+        
+        if start is None and skip > 0:
+            start = await self._skip_to_start(skip, criteria, parameters, predicate)
+            if start is None:
+                return [], None, None
+        
+        entities, after = await self._read_page(
+            criteria, parameters, select, limit, start, predicate, inclusive=inclusive
+        )
+        convert = self._entity_to_summary if summary else self._entity_to_recipe
+        return [convert(entity) for entity in entities], encode_cursor(after), None
+    
+    async def _index_candidates(
+        self, filters: RecipeSearchFilters
+    ) -> Tuple[Optional[Set[str]], RecipeSearchFilters]:
+        """Résoudre par les index les critères qui en ont un.
+
+        Les tags (au moins un), le type de repas et l'ingrédient sont
+        résolus en intersectant les listes des index, sans lire de recette.
+
+        Returns:
+            Les candidates (None si aucun index n'a servi) et les critères
+            restant à vérifier sur les recettes elles-mêmes
+        """
+        residual = filters.model_copy()
+        lookups = []
+        if filters.tags and self.tag_index is not None:
+            lookups.append(self.tag_index.lookup_any(self._label_keys(filters.tags)))
+            residual.tags = None
+        if filters.meal_type and self.meal_type_index is not None:
+            lookups.append(self.meal_type_index.lookup(self._label_key(filters.meal_type)))
+            residual.meal_type = None
+        if filters.ingredient:
+            lookups.append(self._ingredient_id_set(filters.ingredient))
+            residual.ingredient = None
+        
+        if not lookups:
+            return None, residual
+        postings: List[Set[str]] = await asyncio.gather(*lookups)
+        return set.intersection(*postings), residual
+    
+    async def _check_candidates(self, candidates: Set[str], filters: RecipeSearchFilters) -> List[str]:
+        """Garder les candidates satisfaisant les critères, par lectures ponctuelles projetées."""
+        if not filters.model_dump(exclude_none=True):
+            return sorted(candidates)
+        entities = await asyncio.gather(*(
+            self._get_filter_columns(recipe_id) for recipe_id in candidates
+        ))
+        return sorted(
+            entity["RowKey"] for entity in entities
+            if entity is not None and self._matches_filters(entity, filters)
+        )
+    
+    async def _ingredient_id_set(self, ingredient_name: str) -> Set[str]:
+        """Recettes contenant un ingrédient, sous forme d'ensemble."""
+        return set(await self.find_recipe_ids_by_ingredient(ingredient_name))
+    
+    async def _get_filter_columns(self, recipe_id: str) -> Optional[TableEntity]:
+        """Lire les colonnes filtrables d'une recette (None si elle n'existe plus)."""
+        try:
+            return await self._get_entity(recipe_id, select=FILTER_COLUMNS)
+        except ResourceNotFoundError:
+            return None
+    
+    @staticmethod
+    def _filter_query(filters: RecipeSearchFilters) -> Tuple[str, Dict[str, Any]]:
+        """Filtre OData des critères exprimables sur les colonnes de la table, hors partition."""
+        clauses = []
+        parameters: Dict[str, Any] = {}
+        if filters.difficulty:
+            clauses.append("difficulty eq @difficulty")
+            parameters["difficulty"] = DifficultyLevel(filters.difficulty).value
+        if filters.max_prep_time:
+            clauses.append("prep_time_minutes le @max_prep_time")
+            parameters["max_prep_time"] = filters.max_prep_time
+        if filters.max_total_time:
+            clauses.append("total_time_minutes le @max_total_time")
+            parameters["max_total_time"] = filters.max_total_time
+        return " and ".join(clauses), parameters
+    
+    def _matches_filters(self, entity: TableEntity, filters: RecipeSearchFilters) -> bool:
+        """Vérifier les critères sur une entité projetée sur FILTER_COLUMNS.
+
+        `meal_type` et `tags` sont des tableaux JSON que le filtre OData ne
+        sait pas interroger : ils sont vérifiés ici quand leur index manque.
+        """
+        if filters.difficulty and self._parse_difficulty(entity) != DifficultyLevel(filters.difficulty):
+            return False
+        for column, maximum in (
+            ("prep_time_minutes", filters.max_prep_time),
+            ("total_time_minutes", filters.max_total_time),
+        ):
+            if maximum and (entity.get(column) is None or entity[column] > maximum):
+                return False
+        if filters.meal_type and self._label_key(filters.meal_type) not in self._entity_label_keys(entity, "meal_type"):
+            return False
+        if filters.tags and not self._label_keys(filters.tags) & self._entity_label_keys(entity, "tags"):
+            return False
+        return True
+    
     async def search_recipes_by_ingredient(self, ingredient_name: str) -> List[Recipe]:
         """Rechercher des recettes par nom d'ingrédient."""
+        recipe_ids = await self.find_recipe_ids_by_ingredient(ingredient_name)
+        return await self.get_recipes(recipe_ids)
+    
+    async def find_recipe_ids_by_ingredient(self, ingredient_name: str) -> List[str]:
+        """Trouver les recettes contenant un ingrédient, triées par identifiant.
+
+        Tous les mots significatifs de la recherche doivent apparaître dans
+        les ingrédients de la recette ("tomates cerises" -> tomate et cerise).
+        Avec l'index, seules les lignes des recettes trouvées sont lues.
+        """
         if not self.table_client:
             raise RuntimeError("Azure n'est pas configuré")
         
-        entities = self.table_client.query_entities(query_filter="PartitionKey eq 'recipe'")
+        keys = ingredient_keys(ingredient_name)
+        if not keys:
+            return []
         
-        matching_recipes = []
-        for entity in entities:
-            recipe = self._entity_to_recipe(entity)
+        if self.ingredient_index is not None:
+            return sorted(await self.ingredient_index.lookup_all(keys))
+        
+        return sorted([
+            entity["RowKey"] async for entity in self._scan(["RowKey", "ingredients"])
+            if keys <= self._entity_ingredient_keys(entity)
+        ])
+    
+    async def get_recipes(self, recipe_ids: Iterable[str]) -> List[Recipe]:
+        """Récupérer plusieurs recettes en parallèle, dans l'ordre des identifiants.
+
+        Les identifiants sans recette (index en retard sur la table) sont ignorés.
+        """
+        recipes = await asyncio.gather(*(self.get_recipe(recipe_id) for recipe_id in recipe_ids))
+        return [recipe for recipe in recipes if recipe is not None]
+    
+    async def get_recipe_summaries(self, recipe_ids: Iterable[str]) -> List[RecipeSummary]:
+        """Récupérer la vue résumée de plusieurs recettes, dans l'ordre des identifiants."""
+        async def get_summary(recipe_id: str) -> Optional[RecipeSummary]:
+            try:
+                entity = await self._get_entity(recipe_id, select=SUMMARY_COLUMNS)
+            except ResourceNotFoundError:
+                return None
+            return self._entity_to_summary(entity)
+        
+        summaries = await asyncio.gather(*(get_summary(recipe_id) for recipe_id in recipe_ids))
+        return [summary for summary in summaries if summary is not None]
+    
+    async def backfill_indexes(self) -> int:
+        """Indexer les ingrédients, tags et types de repas de toutes les recettes existantes.
+
+        Les écritures sont idempotentes ; à lancer une fois sur un catalogue
+        créé avant les index.
+
+        Returns:
+            Le nombre de recettes indexées
+        """
+        if not self.table_client or not any(self._indexes().values()):
+            return 0
+        
+        indexed = 0
+        async for entity in self._scan(["RowKey", "ingredients", "tags", "meal_type"]):
+            await self._reindex(entity["RowKey"], {}, self._entity_index_keys(entity))
+            indexed += 1
+        return indexed
+    
+    def _indexes(self) -> Dict[str, Optional[PostingIndex]]:
+        """Index secondaires du service, par colonne indexée."""
+        return {
+            "ingredients": self.ingredient_index,
+            "tags": self.tag_index,
+            "meal_type": self.meal_type_index,
+        }
+    
+    def _index_keys(self, recipe: Recipe) -> Dict[str, Set[str]]:
+        """Clés d'une recette dans chaque index secondaire."""
+        return {
+            "ingredients": self._ingredient_keys(recipe.ingredients),
+            "tags": self._label_keys(recipe.tags or []),
+            "meal_type": self._label_keys(recipe.meal_type),
+        }
+    
+    def _entity_index_keys(self, entity: TableEntity) -> Dict[str, Set[str]]:
+        """Clés d'une entité dans chaque index secondaire, sans construire la recette."""
+        return {
+            "ingredients": self._entity_ingredient_keys(entity),
+            "tags": self._entity_label_keys(entity, "tags"),
+            "meal_type": self._entity_label_keys(entity, "meal_type"),
+        }
+    
+    @staticmethod
+    def _ingredient_keys(ingredients: Iterable[Any]) -> Set[str]:
+        """Clés d'index des ingrédients d'une recette."""
+        keys: Set[str] = set()
+        for ingredient in ingredients:
+            name = ingredient["name"] if isinstance(ingredient, dict) else ingredient.name
+            keys |= ingredient_keys(name)
+        return keys
+    
+    def _entity_ingredient_keys(self, entity: TableEntity) -> Set[str]:
+        """Clés d'index des ingrédients d'une entité, sans construire la recette."""
+        try:
+            return self._ingredient_keys(json.loads(entity.get("ingredients") or "[]"))
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return set()
+    
+    @staticmethod
+    def _label_key(label: Any) -> str:
+        """Clé d'index d'un tag ou d'un type de repas (valeur brute ou enum)."""
+        return label_key(getattr(label, "value", label))
+    
+    def _label_keys(self, labels: Iterable[Any]) -> Set[str]:
+        """Clés d'index d'une liste de tags ou de types de repas."""
+        return {key for key in map(self._label_key, labels) if key}
+    
+    def _entity_label_keys(self, entity: TableEntity, column: str) -> Set[str]:
+        """Clés d'index d'une colonne de tags ou de types de repas stockée en JSON."""
+        try:
+            labels = json.loads(entity.get(column) or "[]")
+        except (json.JSONDecodeError, TypeError):
+            return set()
+        return self._label_keys(label for label in labels if isinstance(label, str))
+    
+    async def _reindex(self, recipe_id: str, old_keys: Dict[str, Set[str]], new_keys: Dict[str, Set[str]]) -> None:
+        """Reporter les clés d'une recette dans les index secondaires, sans faire échouer l'écriture."""
+        async def replace(column: str, index: PostingIndex) -> None:
+            try:
+                await index.replace(recipe_id, old_keys.get(column, set()), new_keys.get(column, set()))
+            except Exception as e:
+                print(f"Erreur lors de la mise à jour de l'index {column}: {e}")
+        
+        await asyncio.gather(*(
+            replace(column, index) for column, index in self._indexes().items() if index is not None
+        ))
             
-            # Vérifier si l'ingrédient est présent
-            for ingredient in recipe.ingredients:
-                if ingredient_name.lower() in ingredient.name.lower():
-                    matching_recipes.append(recipe)
-                    break
+    async def search_recipes(
+        self,
+        query: Optional[str] = None,
+        ingredient: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 10
+    ) -> Tuple[List[Recipe], int]:
+        """Rechercher des recettes par texte libre et/ou par ingrédient.
+
+        Le texte est cherché dans les titres, descriptions, tags et
+        ingrédients et les résultats classés par pertinence (BM25). Avec un
+        ingrédient seul, les résultats sont triés par identifiant.
+
+        Returns:
+            La page de recettes et le nombre total de résultats
+
+        Raises:
+            SearchNotReadyError: Si un texte est demandé avant la construction du moteur
+        """
+        if query:
+            if self.search_engine is None:
+                raise SearchNotReadyError("La recherche plein texte n'est pas encore disponible")
+            if ingredient:
+                candidates = await self.find_recipe_ids_by_ingredient(ingredient)
+                recipe_ids = self.search_engine.rank(query, candidates)
+                total = len(recipe_ids)
+                recipe_ids = recipe_ids[skip:skip + limit]
+            else:
+                hits, total = self.search_engine.search(query, limit=limit, offset=skip)
+                recipe_ids = [recipe_id for recipe_id, _ in hits]
+        else:
+            recipe_ids = await self.find_recipe_ids_by_ingredient(ingredient or "")
+            total = len(recipe_ids)
+            recipe_ids = recipe_ids[skip:skip + limit]
         
-        return matching_recipes
+        return await self.get_recipes(recipe_ids), total
+    
+    async def rebuild_search_engine(self) -> int:
+        """(Re)construire le moteur de recherche à partir de la table.
+
+        Tant qu'il n'est pas publié, le nouveau moteur n'est utilisé par
+        personne : l'indexation de chaque page lue et le calcul des
+        contributions (`warm`) tournent dans un thread, sans bloquer la
+        boucle. Les écritures faites pendant la reconstruction sont rejouées
+        sur la boucle juste avant de remplacer l'ancien index.
+
+        Returns:
+            Le nombre de recettes indexées
+        """
+        if not self.table_client:
+            return 0
+        
+        engine = SearchEngine()
+        self._search_replay = []
+        try:
+            batch: List[TableEntity] = []
+            async for entity in self._scan(SEARCH_COLUMNS):
+                batch.append(entity)
+                if len(batch) == KEY_SCAN_PAGE_SIZE:
+                    await asyncio.to_thread(self._index_entities, engine, batch)
+                    batch = []
+            await asyncio.to_thread(self._index_entities, engine, batch)
+            await asyncio.to_thread(engine.warm)
             
+            # Sans attente entre le rejeu et la publication : aucune écriture ne se perd
+            for recipe_id, fields in self._search_replay:
+                if fields is None:
+                    engine.remove(recipe_id)
+                else:
+                    engine.index(recipe_id, fields)
+            self.search_engine = engine
+        finally:
+            self._search_replay = None
+        return len(engine)
+    
+    def _index_search(self, recipe_id: str, fields: Optional[Dict[str, str]]) -> None:
+        """Reporter une écriture dans le moteur de recherche (None pour une suppression)."""
+        if self._search_replay is not None:
+            self._search_replay.append((recipe_id, fields))
+        if self.search_engine is None:
+            return
+        if fields is None:
+            self.search_engine.remove(recipe_id)
+        else:
+            self.search_engine.index(recipe_id, fields)
+    
+    @staticmethod
+    def _recipe_search_fields(recipe: Recipe) -> Dict[str, str]:
+        """Champs indexés d'une recette."""
+        return recipe_fields(
+            recipe.title,
+            recipe.description,
+            recipe.tags or [],
+            [ingredient.name for ingredient in recipe.ingredients]
+        )
+    
+    def _index_entities(self, engine: SearchEngine, entities: List[TableEntity]) -> None:
+        """Indexer des entités projetées sur SEARCH_COLUMNS dans un moteur non publié."""
+        for entity in entities:
+            engine.index(entity["RowKey"], self._entity_search_fields(entity))
+    
+    def _entity_search_fields(self, entity: TableEntity) -> Dict[str, str]:
+        """Champs indexés d'une entité projetée sur SEARCH_COLUMNS, sans construire la recette."""
+        try:
+            tags = json.loads(entity.get("tags") or "[]")
+            ingredients = [ingredient["name"] for ingredient in json.loads(entity.get("ingredients") or "[]")]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            tags, ingredients = [], []
+        return recipe_fields(entity.get("title") or "", entity.get("description"), tags, ingredients)
+    
     async def search_by_ingredient(self, ingredient_name: str) -> List[Recipe]:
         """Rechercher des recettes par nom d'ingrédient (alias pour search_recipes_by_ingredient)."""
         return await self.search_recipes_by_ingredient(ingredient_name)
@@ -356,65 +1575,154 @@ class RecipeService:
         if not self.table_client:
             raise RuntimeError("Azure n'est pas configuré")
         
-        try:
-            # Récupérer la recette existante
-            entity = self.table_client.get_entity(partition_key="recipe", row_key=recipe_id)
-            recipe = self._entity_to_recipe(entity)
-            
-            # Ajouter l'URL d'image
+        def change(recipe: Recipe) -> None:
             if image_type == "main":
                 recipe.main_image_url = image_url
             else:
-                if not recipe.additional_images:
-                    recipe.additional_images = []
-                recipe.additional_images.append(image_url)
-            
-            # Mettre à jour l'entité
-            updated_entity = self._recipe_to_entity(recipe)
-            self.table_client.update_entity(updated_entity, mode="replace")
-            
-            return recipe
-            
-        except ResourceNotFoundError:
-            return None
+                recipe.additional_images_urls.append(image_url)
+        
+        try:
+            modified = await self._modify_recipe(recipe_id, change)
+            return modified[1] if modified else None
+        except RecipeConflictError:
+            raise
         except Exception as e:
             raise RuntimeError(f"Erreur lors de l'ajout de l'URL d'image: {e}")
+        finally:
+            await self._invalidate(recipe_id)
     
     async def clear_image_urls(self, recipe_id: str) -> Optional[Recipe]:
         """Supprimer toutes les URLs d'images d'une recette."""
         if not self.table_client:
             raise RuntimeError("Azure n'est pas configuré")
         
-        try:
-            # Récupérer la recette existante
-            entity = self.table_client.get_entity(partition_key="recipe", row_key=recipe_id)
-            recipe = self._entity_to_recipe(entity)
-            
-            # Supprimer les URLs d'images
+        def change(recipe: Recipe) -> None:
             recipe.main_image_url = None
-            recipe.additional_images = []
-            
-            # Mettre à jour l'entité
-            updated_entity = self._recipe_to_entity(recipe)
-            self.table_client.update_entity(updated_entity, mode="replace")
-            
-            return recipe
-            
-        except ResourceNotFoundError:
-            return None
+            recipe.additional_images_urls = []
+        
+        try:
+            modified = await self._modify_recipe(recipe_id, change)
+            return modified[1] if modified else None
+        except RecipeConflictError:
+            raise
         except Exception as e:
             raise RuntimeError(f"Erreur lors de la suppression des URLs d'images: {e}")
+        finally:
+            await self._invalidate(recipe_id)
     
-    def _calculate_total_time(self, prep_time: int, cook_time: Optional[int]) -> int:
+    def _calculate_total_time(self, prep_time: Optional[int], cook_time: Optional[int]) -> int:
         """Calculer le temps total de préparation."""
-        return prep_time + (cook_time or 0)
+        return (prep_time or 0) + (cook_time or 0)
+
+
+# Instance partagée par le worker
+_recipe_service: Optional[RecipeService] = None
+
+
+def _build_recipe_cache() -> Optional[LRUCache[Recipe]]:
+    """Cache des recettes décodées, désactivé si sa taille ou sa durée de vie est nulle."""
+    if settings.RECIPE_CACHE_MAX_ENTRIES <= 0 or settings.RECIPE_CACHE_TTL_SECONDS <= 0:
+        return None
+    return LRUCache(settings.RECIPE_CACHE_MAX_ENTRIES, settings.RECIPE_CACHE_TTL_SECONDS)
+
+
+async def close_recipe_service() -> None:
+    """Fermer les connexions du service de recettes (cache partagé)."""
+    global _recipe_service
+    if _recipe_service is not None and _recipe_service.shared_cache is not None:
+        await _recipe_service.shared_cache.close()
+    _recipe_service = None
+
+
+def recipe_metrics() -> Dict[str, Any]:
+    """Compteurs du service de recettes, sans l'initialiser.
+
+    Returns:
+        Les compteurs du cache, ou un dict vide si le service n'est pas encore créé
+    """
+    if _recipe_service is None or _recipe_service.cache is None:
+        return {}
+    return {"cache": _recipe_service.cache.stats()}
 
 
 # Fonction factory pour l'injection de dépendances
-def get_recipe_service() -> RecipeService:
-    """Retourne une instance du service de recettes pour l'injection de dépendances."""
-    return RecipeService()
+async def get_recipe_service() -> RecipeService:
+    """Retourne l'instance partagée du service de recettes pour l'injection de dépendances."""
+    global _recipe_service
+    if _recipe_service is None:
+        async def posting_index(table_name: str) -> Optional[PostingIndex]:
+            index_client = await azure_clients.get_table_client(table_name)
+            return PostingIndex(index_client) if index_client else None
+        
+        _recipe_service = RecipeService(
+            await azure_clients.get_table_client(azure_settings.recipes_table_name),
+            ingredient_index=await posting_index(azure_settings.ingredient_index_table_name),
+            tag_index=await posting_index(azure_settings.tag_index_table_name),
+            meal_type_index=await posting_index(azure_settings.meal_type_index_table_name),
+            cache=_build_recipe_cache(),
+            shared_cache=open_shared_cache(settings.SHARED_CACHE_URL)
+        )
+    return _recipe_service
+
+
+
+# Tâches de maintenance en arrière-plan, lancées par le lifespan
+_maintenance_tasks: List[asyncio.Task] = []
+
+
+async def _reconcile_count_periodically(service: RecipeService, interval: float) -> None:
+    """Recompter les recettes toutes les `interval` secondes."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await service.reconcile_recipe_count()
+        except Exception as e:
+            print(f"Erreur lors de la réconciliation du compteur de recettes: {e}")
+
+
+async def _backfill_indexes(service: RecipeService) -> None:
+    """Indexer le catalogue existant une fois."""
+    try:
+        indexed = await service.backfill_indexes()
+        print(f"Index secondaires remplis pour {indexed} recettes")
+    except Exception as e:
+        print(f"Erreur lors du remplissage des index secondaires: {e}")
+
+
+async def _build_search_engine_periodically(service: RecipeService, interval: float) -> None:
+    """Construire le moteur de recherche, puis le reconstruire toutes les `interval` secondes.
+
+    La reconstruction récupère les écritures faites par les autres workers.
+    """
+    while True:
+        try:
+            indexed = await service.rebuild_search_engine()
+            print(f"Moteur de recherche construit sur {indexed} recettes")
+        except Exception as e:
+            print(f"Erreur lors de la construction du moteur de recherche: {e}")
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+
+
+def start_recipe_maintenance(service: RecipeService) -> None:
+    """Démarrer la maintenance des recettes (compteur, index, recherche) si Azure est configuré."""
+    if _maintenance_tasks or not service.table_client:
+        return
+    interval = settings.RECIPE_COUNT_RECONCILE_SECONDS
+    if interval > 0:
+        _maintenance_tasks.append(asyncio.create_task(_reconcile_count_periodically(service, interval)))
+    if settings.RECIPE_INDEX_BACKFILL_ON_STARTUP:
+        _maintenance_tasks.append(asyncio.create_task(_backfill_indexes(service)))
+    if settings.SEARCH_ENGINE_ENABLED:
+        _maintenance_tasks.append(asyncio.create_task(
+            _build_search_engine_periodically(service, settings.SEARCH_ENGINE_REFRESH_SECONDS)
+        ))
 
-# Pour la compatibilité avec le code existant
-recipe_service = RecipeService()
 
+async def stop_recipe_maintenance() -> None:
+    """Arrêter la maintenance des recettes."""
+    for task in _maintenance_tasks:
+        task.cancel()
+    await asyncio.gather(*_maintenance_tasks, return_exceptions=True)
+    _maintenance_tasks.clear()
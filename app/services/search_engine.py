@@ -0,0 +1,305 @@
+"""
+Moteur de recherche plein texte en mémoire sur le catalogue de recettes.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+import bisect
+import heapq
+import math
+
+from app.services.text import analyze
+
+# Écart relatif de taille du corpus au-delà duquel les contributions en cache sont recalculées
+STATS_TOLERANCE = 0.05
+
+# Documents scorés par l'algorithme à seuil avant de tenter l'intersection
+THRESHOLD_BUDGET = 2000
+
+# Poids des champs : un terme du titre compte autant que trois de la description
+FIELD_WEIGHTS = {
+    "title": 3,
+    "tags": 2,
+    "ingredients": 2,
+    "description": 1,
+}
+
+
+class SearchEngine:
+    """Index inversé en mémoire classant les recettes par BM25.
+
+    Les documents sont identifiés en interne par un entier pour garder les
+    listes de postings compactes. Les mises à jour sont incrémentales :
+    `index` remplace un document, `remove` le retire.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """Initialiser un index vide.
+
+        Args:
+            k1: Saturation de la fréquence des termes
+            b: Poids de la normalisation par la longueur du document
+        """
+        self.k1 = k1
+        self.b = b
+        # terme -> {document -> fréquence pondérée}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        # document -> termes, pour pouvoir le retirer
+        self._doc_terms: Dict[int, Dict[str, int]] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self._doc_numbers: Dict[str, int] = {}
+        self._doc_ids: Dict[int, str] = {}
+        self._next_number = 0
+        # terme -> contributions BM25 en cache, voir _term_impacts
+        self._impacts: Dict[str, _TermImpacts] = {}
+        # Statistiques du corpus utilisées par les contributions en cache
+        self._cached_documents = 0
+        self._length_norm = (0.0, 0.0)
+        # Documents dont le score a été calculé par les recherches
+        self.documents_scored = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def index(self, recipe_id: str, fields: Dict[str, str]) -> None:
+        """Indexer (ou réindexer) une recette.
+
+        Args:
+            recipe_id: Identifiant de la recette
+            fields: Texte de chaque champ de FIELD_WEIGHTS
+        """
+        self.remove(recipe_id)
+
+        terms: Counter = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in analyze(fields.get(field) or ""):
+                terms[term] += weight
+        if not terms:
+            return
+
+        number = self._next_number
+        self._next_number += 1
+        self._doc_numbers[recipe_id] = number
+        self._doc_ids[number] = recipe_id
+        self._doc_terms[number] = dict(terms)
+        length = sum(terms.values())
+        self._doc_lengths[number] = length
+        self._total_length += length
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[number] = frequency
+            cached = self._impacts.get(term)
+            if cached is not None:
+                cached.add(number, self._impact(cached.weight, frequency, length))
+
+    def remove(self, recipe_id: str) -> None:
+        """Retirer une recette de l'index (sans effet si elle n'y est pas)."""
+        number = self._doc_numbers.pop(recipe_id, None)
+        if number is None:
+            return
+        del self._doc_ids[number]
+        self._total_length -= self._doc_lengths.pop(number)
+        for term in self._doc_terms.pop(number):
+            postings = self._postings[term]
+            del postings[number]
+            cached = self._impacts.get(term)
+            if cached is not None:
+                cached.remove(number)
+            if not postings:
+                del self._postings[term]
+                self._impacts.pop(term, None)
+
+    def search(self, query: str, limit: int = 10, offset: int = 0) -> Tuple[List[Tuple[str, float]], int]:
+        """Chercher les recettes correspondant à au moins un terme de la requête.
+
+        Args:
+            query: Texte libre
+            limit: Nombre de résultats à renvoyer
+            offset: Nombre de résultats à sauter
+
+        Returns:
+            Les couples (identifiant, score) par score décroissant, et le
+            nombre total de recettes trouvées
+        """
+        terms = [term for term in set(analyze(query)) if term in self._postings]
+        if not terms:
+            return [], 0
+
+        impacts = [self._term_impacts(term) for term in terms]
+        if len(terms) == 1:
+            total = len(self._postings[terms[0]])
+        else:
+            total = len(set().union(*(self._postings[term] for term in terms)))
+
+        # Le seuil converge vite quand les contributions sont contrastées ; sinon
+        # l'intersection des documents complets est moins chère à scorer
+        wanted = offset + limit
+        top = self._threshold_top(impacts, wanted, budget=THRESHOLD_BUDGET)
+        if top is None:
+            top = self._conjunctive_top(impacts, wanted)
+        if top is None:
+            top = self._threshold_top(impacts, wanted)
+
+        return [(self._doc_ids[number], score) for score, number in top[offset:]], total
+
+    def rank(self, query: str, recipe_ids: Iterable[str]) -> List[str]:
+        """Classer des recettes candidates, en ne gardant que celles qui correspondent.
+
+        Le coût est proportionnel au nombre de candidates, pas au nombre de
+        recettes contenant les termes.
+        """
+        maps = [
+            self._term_impacts(term).by_document
+            for term in set(analyze(query)) if term in self._postings
+        ]
+        scores = {}
+        for recipe_id in recipe_ids:
+            number = self._doc_numbers.get(recipe_id)
+            if number is None:
+                continue
+            score = sum(impact_map.get(number, 0.0) for impact_map in maps)
+            if score > 0:
+                scores[recipe_id] = score
+        return sorted(scores, key=scores.get, reverse=True)
+
+    def warm(self) -> None:
+        """Calculer d'avance les contributions de tous les termes."""
+        for term in self._postings:
+            self._term_impacts(term)
+
+    def _conjunctive_top(self, impacts: List["_TermImpacts"], wanted: int) -> Optional[List[Tuple[float, int]]]:
+        """Top-k exact parmi les documents contenant tous les termes, si cela suffit.
+
+        Un document auquel il manque un terme ne peut dépasser la somme des
+        meilleures contributions des autres termes. Si le k-ième document
+        complet fait au moins aussi bien, le top-k ne contient que des
+        documents complets et l'intersection (faite en C) suffit.
+        """
+        if len(impacts) < 2:
+            return None
+        maps = sorted((term.by_document for term in impacts), key=len)
+        common = maps[0].keys() & maps[1].keys()
+        for impact_map in maps[2:]:
+            common &= impact_map.keys()
+        if len(common) < wanted:
+            return None
+        self.documents_scored += len(common)
+
+        # Scores calculés colonne par colonne pour rester dans les boucles C
+        numbers = list(common)
+        columns = [map(impact_map.__getitem__, numbers) for impact_map in maps]
+        top = heapq.nlargest(wanted, zip(map(sum, zip(*columns)), numbers))
+        best = [term.best for term in impacts]
+        if top[-1][0] >= sum(best) - min(best):
+            return top
+        return None
+
+    def _threshold_top(
+        self,
+        impacts: List["_TermImpacts"],
+        wanted: int,
+        budget: Optional[int] = None
+    ) -> Optional[List[Tuple[float, int]]]:
+        """Top-k par l'algorithme à seuil de Fagin.
+
+        Les listes sont parcourues en parallèle par contribution décroissante ;
+        le parcours s'arrête dès qu'aucun document non vu ne peut plus entrer
+        dans le top-k. Renvoie None si plus de `budget` documents ont été
+        scorés sans conclure.
+        """
+        maps = [term.by_document for term in impacts]
+        top: List[Tuple[float, int]] = []
+        seen = set()
+        depth = 0
+        while True:
+            threshold = 0.0
+            exhausted = True
+            for term in impacts:
+                if depth >= len(term.ordered):
+                    continue
+                exhausted = False
+                negative_impact, number = term.ordered[depth]
+                threshold -= negative_impact
+                if number in seen:
+                    continue
+                seen.add(number)
+                self.documents_scored += 1
+                score = sum(impact_map.get(number, 0.0) for impact_map in maps)
+                if len(top) < wanted:
+                    heapq.heappush(top, (score, number))
+                elif score > top[0][0]:
+                    heapq.heapreplace(top, (score, number))
+            depth += 1
+            if exhausted or (len(top) >= wanted and top[0][0] >= threshold):
+                break
+            if budget is not None and len(seen) > budget:
+                return None
+        return sorted(top, reverse=True)
+
+    def _impact(self, weight: float, frequency: int, length: int) -> float:
+        """Contribution BM25 d'un terme de poids `weight` à un document."""
+        base, per_length = self._length_norm
+        return weight * frequency / (frequency + base + per_length * length)
+
+    def _term_impacts(self, term: str) -> "_TermImpacts":
+        """Contributions BM25 d'un terme par document, triées et indexées.
+
+        Calculées une fois puis tenues à jour par les écritures. Elles sont
+        recalculées quand la taille du corpus a assez changé pour fausser
+        l'IDF et la longueur moyenne.
+        """
+        documents = len(self._doc_terms)
+        if abs(documents - self._cached_documents) > STATS_TOLERANCE * max(self._cached_documents, 1):
+            self._impacts.clear()
+            self._cached_documents = documents
+            # Constantes de la normalisation par la longueur, sorties des boucles
+            self._length_norm = (
+                self.k1 * (1 - self.b),
+                self.k1 * self.b * documents / self._total_length,
+            )
+
+        cached = self._impacts.get(term)
+        if cached is not None:
+            return cached
+
+        postings = self._postings[term]
+        idf = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+        weight = idf * (self.k1 + 1)
+        lengths = self._doc_lengths
+        cached = _TermImpacts(weight, {
+            number: self._impact(weight, frequency, lengths[number])
+            for number, frequency in postings.items()
+        })
+        self._impacts[term] = cached
+        return cached
+
+
+class _TermImpacts:
+    """Contributions BM25 d'un terme : par document, et triées par valeur décroissante."""
+
+    def __init__(self, weight: float, by_document: Dict[int, float]):
+        self.weight = weight
+        self.by_document = by_document
+        # Couples (-contribution, document) en ordre croissant
+        self.ordered = sorted((-impact, number) for number, impact in by_document.items())
+
+    @property
+    def best(self) -> float:
+        return -self.ordered[0][0] if self.ordered else 0.0
+
+    def add(self, number: int, impact: float) -> None:
+        self.by_document[number] = impact
+        bisect.insort(self.ordered, (-impact, number))
+
+    def remove(self, number: int) -> None:
+        impact = self.by_document.pop(number)
+        del self.ordered[bisect.bisect_left(self.ordered, (-impact, number))]
+
+
+def recipe_fields(title: str, description: Optional[str], tags: Iterable[str], ingredients: Iterable[str]) -> Dict[str, str]:
+    """Assembler les champs indexés d'une recette."""
+    return {
+        "title": title,
+        "description": description or "",
+        "tags": " ".join(tags),
+        "ingredients": " ".join(ingredients),
+    }
@@ -0,0 +1,109 @@
+"""
+Cache partagé entre les workers (second niveau), derrière le cache local de chaque worker.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+import time
+
+
+class SharedCache(ABC):
+    """Cache clé -> octets partagé entre workers, avec durée de vie par clé."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Retourner la valeur d'une clé, ou None si elle est absente ou expirée."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """Écrire une valeur qui expirera après `ttl_seconds`."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Supprimer une clé."""
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """Incrémenter atomiquement un compteur (créé à 1) et retourner sa nouvelle valeur."""
+
+    async def close(self) -> None:
+        """Libérer les connexions."""
+
+
+class InMemorySharedCache(SharedCache):
+    """Cache partagé tenu en mémoire, pour les tests et le développement.
+
+    Il n'est partagé qu'au sein d'un processus : en production avec
+    plusieurs workers, utiliser RedisSharedCache.
+    """
+
+    def __init__(self):
+        # clé -> (date d'expiration ou None, valeur)
+        self._entries: Dict[str, Tuple[Optional[float], bytes]] = {}
+
+    def _live(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._live(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        value = int(self._live(key) or 0) + 1
+        self._entries[key] = (None, str(value).encode())
+        return value
+
+
+class RedisSharedCache(SharedCache):
+    """Cache partagé sur un serveur parlant le protocole Redis (Redis, Valkey, Azure Cache for Redis)."""
+
+    def __init__(self, url: str):
+        """Créer le client ; la connexion est ouverte à la première commande.
+
+        Args:
+            url: URL du serveur, par exemple redis://localhost:6379/0 ou rediss://...
+        """
+        # Import tardif : la dépendance n'est nécessaire que si un serveur est configuré
+        from redis.asyncio import Redis
+
+        self._client = Redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self._client.set(key, value, px=int(ttl_seconds * 1000))
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(key)
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(key)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def open_shared_cache(url: Optional[str]) -> Optional[SharedCache]:
+    """Créer le cache partagé décrit par une URL.
+
+    Args:
+        url: None pour aucun cache partagé, "memory://" pour le cache en
+            mémoire, sinon l'URL d'un serveur Redis
+    """
+    if not url:
+        return None
+    if url == "memory://":
+        return InMemorySharedCache()
+    return RedisSharedCache(url)
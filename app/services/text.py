@@ -0,0 +1,84 @@
+"""
+Normalisation du texte des recettes pour l'indexation et la recherche.
+"""
+from functools import lru_cache
+from typing import List, Set
+import re
+import unicodedata
+
+# Mots vides français ignorés à l'indexation
+STOPWORDS = frozenset({
+    "a", "au", "aux", "avec", "ce", "ces", "d", "dans", "de", "des", "du", "en",
+    "et", "l", "la", "le", "les", "ou", "par", "pour", "sans", "sur", "un", "une",
+})
+
+_WORD = re.compile(r"[a-z0-9]+")
+_LIGATURES = str.maketrans({"œ": "oe", "æ": "ae", "Œ": "oe", "Æ": "ae"})
+
+
+def fold(text: str) -> str:
+    """Mettre en minuscules et retirer les accents ("Crème brûlée" -> "creme brulee").
+
+    Les caractères sans équivalent ASCII sont supprimés : ils ne peuvent de
+    toute façon pas faire partie d'un mot indexé.
+    """
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.translate(_LIGATURES))
+    return decomposed.encode("ascii", "ignore").decode().lower()
+
+
+def words(text: str) -> List[str]:
+    """Découper un texte normalisé en mots alphanumériques."""
+    return _WORD.findall(fold(text))
+
+
+def singular(word: str) -> str:
+    """Retirer la marque du pluriel la plus courante ("tomates" -> "tomate")."""
+    if len(word) > 3 and word[-1] in "sx":
+        return word[:-1]
+    return word
+
+
+def ingredient_keys(name: str) -> Set[str]:
+    """Clés d'index d'un nom d'ingrédient ("Pommes de terre" -> {"pomme", "terre"})."""
+    return {singular(word) for word in words(name) if word not in STOPWORDS and len(word) > 1}
+
+
+def label_key(label: str) -> str:
+    """Clé d'index d'une étiquette, tag ou type de repas ("Plat principal" -> "plat principal")."""
+    return " ".join(words(label))
+
+
+# Suffixes dérivationnels retirés par le raciniseur, du plus long au plus court
+_SUFFIXES = (
+    "issements", "issement", "atrices", "ateurs", "ations", "atrice", "ateur", "ation",
+    "ements", "ement", "euses", "ettes", "euse", "ette", "ables", "able",
+)
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Raciniser un mot français normalisé (raciniseur léger).
+
+    Retire un suffixe dérivationnel, la marque du pluriel puis les finales
+    "er" et "e", pour rapprocher "tomates", "tomate", "grillées" et
+    "griller". Les mots courts sont laissés tels quels.
+    """
+    if word.endswith(_SUFFIXES):
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                return word[:-len(suffix)]
+    word = singular(word)
+    if len(word) > 5 and word.endswith("er"):
+        return word[:-2]
+    if len(word) > 4 and word.endswith("e"):
+        word = word[:-1]
+        if word.endswith("e"):
+            word = word[:-1]
+    return word
+
+
+def analyze(text: str) -> List[str]:
+    """Termes d'indexation d'un texte : mots normalisés, hors mots vides, racinisés."""
+    return [stem(word) for word in words(text) if word not in STOPWORDS and len(word) > 1]
@@ -0,0 +1,383 @@
+"""
+In-memory stand-ins for the Azure SDK clients used by the services.
+"""
+import asyncio
+import base64
+import re
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+from azure.data.tables import TableEntity
+
+from app.schemas.recipe import Ingredient, MealType, RecipeCreate, Unit
+
+
+class FakeTableClient:
+    """Minimal async TableClient keeping entities in a dict.
+
+    `latency` simulates a storage round trip. With `blocking=True` the
+    latency is spent in `time.sleep`, which reproduces the behaviour of a
+    synchronous SDK call made from an `async def`.
+    """
+
+    def __init__(self, latency: float = 0.0, blocking: bool = False):
+        self.entities: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.etags: Dict[Tuple[str, str], str] = {}
+        self.latency = latency
+        self.blocking = blocking
+        self.calls: Dict[str, int] = {}
+        # Entities sent back by queries, to compare what listings download
+        self.rows_returned = 0
+        # Like the service, pages may hold fewer rows than asked for, or none
+        self.max_page_size: Optional[int] = None
+        self.empty_first_pages = False
+        # Round trips in progress, and the most seen at once
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._version = 0
+
+    async def _round_trip(self, operation: str) -> None:
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.blocking:
+                time.sleep(self.latency)
+            else:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+    def _store(self, key: Tuple[str, str], entity: Dict[str, Any]) -> Dict[str, Any]:
+        self._version += 1
+        self.entities[key] = entity
+        self.etags[key] = f'W/"{self._version}"'
+        return {"etag": self.etags[key]}
+
+    def _etag(self, key: Tuple[str, str]) -> str:
+        # Entities seeded directly into `entities` have never been written
+        return self.etags.get(key, 'W/"0"')
+
+    def _check_etag(self, key: Tuple[str, str], kwargs: Dict[str, Any]) -> None:
+        if kwargs.get("match_condition") == MatchConditions.IfNotModified:
+            if self._etag(key) != kwargs.get("etag"):
+                raise ResourceModifiedError("The entity has been modified")
+
+    async def create_entity(self, entity: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        await self._round_trip("create_entity")
+        key = (entity["PartitionKey"], entity["RowKey"])
+        if key in self.entities:
+            raise ResourceExistsError("Entity already exists")
+        return self._store(key, dict(entity))
+
+    async def get_entity(self, partition_key: str, row_key: str, **kwargs) -> TableEntity:
+        await self._round_trip("get_entity")
+        try:
+            stored = self.entities[(partition_key, row_key)]
+        except KeyError:
+            raise ResourceNotFoundError("Entity not found")
+        entity = TableEntity()
+        select = kwargs.get("select")
+        entity.update({k: v for k, v in stored.items() if not select or k in select})
+        entity._metadata = {"etag": self._etag((partition_key, row_key))}
+        return entity
+
+    async def update_entity(self, entity: Dict[str, Any], mode: str = "merge", **kwargs) -> Dict[str, Any]:
+        await self._round_trip("update_entity")
+        key = (entity["PartitionKey"], entity["RowKey"])
+        if key not in self.entities:
+            raise ResourceNotFoundError("Entity not found")
+        self._check_etag(key, kwargs)
+        if mode == "replace":
+            return self._store(key, dict(entity))
+        return self._store(key, {**self.entities[key], **entity})
+
+    async def upsert_entity(self, entity: Dict[str, Any], mode: str = "merge", **kwargs) -> Dict[str, Any]:
+        await self._round_trip("upsert_entity")
+        key = (entity["PartitionKey"], entity["RowKey"])
+        if mode == "replace" or key not in self.entities:
+            return self._store(key, dict(entity))
+        return self._store(key, {**self.entities[key], **entity})
+
+    async def delete_entity(self, partition_key: str, row_key: str, **kwargs) -> None:
+        await self._round_trip("delete_entity")
+        key = (partition_key, row_key)
+        if key in self.entities:
+            self._check_etag(key, kwargs)
+        self.entities.pop(key, None)
+        self.etags.pop(key, None)
+
+    async def submit_transaction(self, operations: List[Tuple[Any, ...]], **kwargs) -> List[Dict[str, Any]]:
+        """Apply a batch of creates atomically, with the service's batch rules.
+
+        The real service rejects the whole batch with TableTransactionError;
+        the first failing operation's error is raised here instead.
+        """
+        await self._round_trip("submit_transaction")
+        keys = [(entity["PartitionKey"], entity["RowKey"]) for _, entity, *_ in operations]
+        if not operations or len(operations) > 100 or len({partition for partition, _ in keys}) != 1:
+            raise ValueError("A transaction holds 1 to 100 operations on a single partition")
+        if any(operation != "create" for operation, *_ in operations):
+            raise NotImplementedError("Only create operations are supported")
+        if len(set(keys)) != len(keys) or any(key in self.entities for key in keys):
+            raise ResourceExistsError("Entity already exists")
+        return [self._store(key, dict(entity)) for key, (_, entity, *_) in zip(keys, operations)]
+
+    def query_entities(
+        self,
+        query_filter: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        select: Optional[List[str]] = None,
+        results_per_page: Optional[int] = None,
+        **kwargs
+    ) -> "FakeItemPaged":
+        predicate = parse_odata_filter(query_filter, parameters or {})
+        return FakeItemPaged(self, predicate, select, results_per_page)
+
+    def list_entities(
+        self,
+        select: Optional[List[str]] = None,
+        results_per_page: Optional[int] = None,
+        **kwargs
+    ) -> "FakeItemPaged":
+        return FakeItemPaged(self, lambda entity: True, select, results_per_page)
+
+    async def close(self) -> None:
+        pass
+
+
+class FakeItemPaged:
+    """AsyncItemPaged stand-in: entities come back in key order, page by page.
+
+    Like the service's x-ms-continuation-Next* headers, continuation tokens
+    are opaque: their values are encoded and only `by_page` can read them.
+    """
+
+    def __init__(
+        self,
+        table: FakeTableClient,
+        predicate: Callable[[Dict[str, Any]], bool],
+        select: Optional[List[str]],
+        results_per_page: Optional[int]
+    ):
+        self.table = table
+        self.predicate = predicate
+        self.select = select
+        # The service caps pages at 1000 entities
+        self.results_per_page = min(results_per_page or 1000, 1000)
+
+    def _project(self, stored: Dict[str, Any]) -> TableEntity:
+        entity = TableEntity()
+        if self.select:
+            entity.update({column: stored[column] for column in self.select if column in stored})
+        else:
+            entity.update(stored)
+        return entity
+
+    def by_page(self, continuation_token: Optional[Dict[str, str]] = None) -> "FakePageIterator":
+        return FakePageIterator(self, continuation_token)
+
+    async def __aiter__(self) -> AsyncIterator[TableEntity]:
+        async for page in self.by_page():
+            async for entity in page:
+                yield entity
+
+
+def _encode_token_key(key: str) -> str:
+    return f"1!{len(key)}!" + base64.b64encode(key.encode()).decode()
+
+
+def _decode_token_key(value: str) -> str:
+    return base64.b64decode(value.split("!", 2)[2]).decode()
+
+
+class FakePageIterator:
+    """AsyncPageIterator stand-in exposing an opaque `continuation_token` after each page."""
+
+    def __init__(self, paged: FakeItemPaged, continuation_token: Optional[Dict[str, str]]):
+        self.paged = paged
+        self.continuation_token = continuation_token
+        self._started = False
+
+    def __aiter__(self) -> "FakePageIterator":
+        return self
+
+    async def __anext__(self) -> AsyncIterator[TableEntity]:
+        if self._started and self.continuation_token is None:
+            raise StopAsyncIteration
+        first = not self._started
+        self._started = True
+        table = self.paged.table
+        await table._round_trip("query_entities")
+        size = min(self.paged.results_per_page, table.max_page_size or self.paged.results_per_page)
+        if first and table.empty_first_pages:
+            size = 0
+
+        start = None
+        if self.continuation_token:
+            start = (
+                _decode_token_key(self.continuation_token["PartitionKey"]),
+                _decode_token_key(self.continuation_token["RowKey"]),
+            )
+        keys = sorted(key for key in self.paged.table.entities if start is None or key >= start)
+
+        page: List[TableEntity] = []
+        self.continuation_token = None
+        for key in keys:
+            stored = self.paged.table.entities[key]
+            if not self.paged.predicate(stored):
+                continue
+            if len(page) == size:
+                self.continuation_token = {
+                    "PartitionKey": _encode_token_key(key[0]),
+                    "RowKey": _encode_token_key(key[1]),
+                }
+                break
+            page.append(self.paged._project(stored))
+        self.paged.table.rows_returned += len(page)
+        return _AsyncList(page)
+
+
+class FakeImageService:
+    """ImageService stand-in: uploads return a unique URL without touching Blob Storage."""
+
+    def __init__(self):
+        self.uploaded: List[str] = []
+
+    async def upload_image(self, file: Any, recipe_id: str, image_type: str = "additional") -> str:
+        await asyncio.sleep(0)
+        url = f"https://images.test/{recipe_id}/{image_type}/{len(self.uploaded)}.jpg"
+        self.uploaded.append(url)
+        return url
+
+    async def delete_image(self, image_url: str) -> bool:
+        return True
+
+
+class _AsyncList:
+    def __init__(self, items: List[Any]):
+        self._items = iter(items)
+
+    def __aiter__(self) -> "_AsyncList":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return next(self._items)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+_ODATA_TOKEN = re.compile(
+    r"\s*(?:(?P<string>'(?:[^']|'')*')|(?P<param>@\w+)|(?P<number>-?\d+(?:\.\d+)?)"
+    r"|(?P<paren>[()])|(?P<word>\w+))"
+)
+_ODATA_COMPARISONS = {
+    "eq": lambda a, b: a == b,
+    "ne": lambda a, b: a != b,
+    "gt": lambda a, b: a > b,
+    "ge": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "le": lambda a, b: a <= b,
+}
+
+
+def parse_odata_filter(query_filter: str, parameters: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """Compile the subset of OData filters used by the services into a predicate.
+
+    Supports comparisons between a column and a literal or `@parameter`,
+    combined with `and`, `or` and parentheses.
+    """
+    tokens = []
+    position = 0
+    query_filter = query_filter.strip()
+    while position < len(query_filter):
+        match = _ODATA_TOKEN.match(query_filter, position)
+        if not match:
+            raise ValueError(f"Unsupported filter: {query_filter}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "string":
+            tokens.append(("value", text[1:-1].replace("''", "'")))
+        elif kind == "param":
+            tokens.append(("value", parameters[text[1:]]))
+        elif kind == "number":
+            tokens.append(("value", float(text) if "." in text else int(text)))
+        elif text in ("true", "false"):
+            tokens.append(("value", text == "true"))
+        else:
+            tokens.append((kind, text))
+        position = match.end()
+
+    def parse_or(index: int):
+        left, index = parse_and(index)
+        while index < len(tokens) and tokens[index] == ("word", "or"):
+            right, index = parse_and(index + 1)
+            left = (lambda l, r: lambda e: l(e) or r(e))(left, right)
+        return left, index
+
+    def parse_and(index: int):
+        left, index = parse_term(index)
+        while index < len(tokens) and tokens[index] == ("word", "and"):
+            right, index = parse_term(index + 1)
+            left = (lambda l, r: lambda e: l(e) and r(e))(left, right)
+        return left, index
+
+    def parse_term(index: int):
+        if tokens[index] == ("paren", "("):
+            inner, index = parse_or(index + 1)
+            return inner, index + 1
+        (_, column), (_, operator), (_, value) = tokens[index:index + 3]
+        compare = _ODATA_COMPARISONS[operator]
+
+        def predicate(entity: Dict[str, Any]) -> bool:
+            if column not in entity:
+                return False
+            try:
+                return compare(entity[column], value)
+            except TypeError:
+                return False
+        return predicate, index + 3
+
+    predicate, _ = parse_or(0)
+    return predicate
+
+
+def make_recipe_entity(recipe_id: str, title: Optional[str] = None, **columns: Any) -> Dict[str, Any]:
+    """Build a stored recipe entity as RecipeService writes it."""
+    entity = {
+        "PartitionKey": "recipe",
+        "RowKey": recipe_id,
+        "title": title or f"Recette {recipe_id}",
+        "description": "",
+        "difficulty": "Facile",
+        "meal_type": '["Plat principal"]',
+        "servings": 4,
+        "prep_time_minutes": 10,
+        "cook_time_minutes": 20,
+        "total_time_minutes": 30,
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "updated_at": "2025-01-01T00:00:00+00:00",
+        "ingredients": '[{"name": "tomate", "quantity": 2, "unit": "pièce"}]',
+        "steps": '["Couper les tomates"]',
+        "tags": "[]",
+    }
+    entity.update(columns)
+    return entity
+
+
+def make_recipe_create(title: str = "Salade de tomates", **fields: Any) -> RecipeCreate:
+    """Build a valid recipe payload as a client would send it."""
+    data = {
+        "title": title,
+        "meal_type": [MealType.MAIN_COURSE],
+        "prep_time_minutes": 10,
+        "cook_time_minutes": 20,
+        "servings": 4,
+        "ingredients": [Ingredient(name="tomate", quantity=2, unit=Unit.PIECE)],
+        "steps": ["Couper les tomates"],
+    }
+    data.update(fields)
+    return RecipeCreate(**data)
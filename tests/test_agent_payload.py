@@ -0,0 +1,94 @@
+"""
+Agent response serialization cost per turn.
+
+Compares the bytes serialized for the compact payload (messages of the
+current turn) with the full thread state as the conversation grows. The
+serialization time is reported by `pytest -m benchmark -s tests/test_agent_payload.py`.
+"""
+import json
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from fastapi.encoders import jsonable_encoder
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from app.services.agent_service import turn_messages
+
+TURNS = 50
+# Size of a typical MCP tool result (knowledge graph dump)
+TOOL_OUTPUT = json.dumps({"entities": [{"name": f"entity-{i}", "observations": ["x" * 40]} for i in range(20)]})
+
+
+def _play_turn(messages: List[Any], turn: int) -> Dict[str, Any]:
+    """Append one ReAct turn (question, tool call, tool result, answer) to the thread."""
+    call_id = f"call-{turn}"
+    messages.extend([
+        HumanMessage(content=f"Question {turn}", id=f"h{turn}"),
+        AIMessage(
+            content="",
+            id=f"a{turn}",
+            tool_calls=[{"id": call_id, "name": "read_graph", "args": {}}],
+        ),
+        ToolMessage(content=TOOL_OUTPUT, name="read_graph", tool_call_id=call_id, id=f"t{turn}"),
+        AIMessage(content=f"Réponse {turn}", id=f"r{turn}"),
+    ])
+    return {"messages": list(messages)}
+
+
+def _serialize(payload: Any) -> bytes:
+    return json.dumps(jsonable_encoder(payload)).encode()
+
+
+def test_compact_payload_cost_is_constant_per_turn():
+    """The compact payload stays flat while the full state grows with the thread."""
+    messages: List[Any] = []
+    full_sizes, compact_sizes = [], []
+
+    for turn in range(1, TURNS + 1):
+        state = _play_turn(messages, turn)
+        full_sizes.append(len(_serialize(state)))
+        compact_sizes.append(len(_serialize(turn_messages(state))))
+
+    assert compact_sizes[-1] - compact_sizes[0] < 20
+    assert full_sizes[-1] > full_sizes[0] * (TURNS / 2)
+    # Over the conversation, the full state serializes quadratically more bytes
+    assert sum(compact_sizes) * 10 < sum(full_sizes)
+
+
+@pytest.mark.benchmark
+def test_serialization_time_per_turn():
+    """Report the time spent serializing the full state and the compact payload."""
+    messages: List[Any] = []
+    full_time = compact_time = 0.0
+
+    for turn in range(1, TURNS + 1):
+        state = _play_turn(messages, turn)
+
+        start = time.perf_counter()
+        _serialize(state)
+        full_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        _serialize(turn_messages(state))
+        compact_time += time.perf_counter() - start
+
+    print(
+        f"\n{TURNS} turns: full state {full_time / TURNS * 1000:.2f}ms/turn, "
+        f"compact {compact_time / TURNS * 1000:.2f}ms/turn"
+    )
+
+
+def test_turn_messages_keeps_only_current_turn():
+    """Only the messages after the last human message are returned."""
+    messages: List[Any] = []
+    _play_turn(messages, 1)
+    state = _play_turn(messages, 2)
+
+    result = turn_messages(state)
+
+    assert [m["id"] for m in result] == ["a2", "t2", "r2"]
+    assert result[0]["tool_calls"] == [{"id": "call-2", "name": "read_graph", "args": {}}]
+    assert result[1]["tool_call_id"] == "call-2"
+    assert result[2]["content"] == "Réponse 2"
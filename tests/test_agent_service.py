@@ -1,10 +1,15 @@
 """
 Tests for the agent service.
 """
+import asyncio
+
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
-from app.services.agent_service import AgentService, get_agent_service
+from app.services import agent_service as agent_module
+from app.services.agent_service import (
+    AgentService, AgentBusyError, get_agent_service, start_agent_service, agent_ready, close_agent_service
+)
 
 
 class TestAgentService:
@@ -44,48 +49,82 @@ class TestAgentService:
     @patch("app.services.agent_service.create_react_agent")
     @patch("app.services.agent_service.ChatOpenAI")
     @patch("app.services.agent_service.settings")
-    def test_invoke_agent(self, mock_settings, mock_chat_openai, mock_create_agent):
+    async def test_invoke_agent(self, mock_settings, mock_chat_openai, mock_create_agent):
         """Test invoking the agent."""
         # Setup mocks
         mock_agent = MagicMock()
         mock_model = MagicMock()
-        mock_agent.invoke.return_value = {"response": "test response"}
+        mock_agent.ainvoke = AsyncMock(return_value={"response": "test response"})
         mock_chat_openai.return_value = mock_model
         mock_create_agent.return_value = mock_agent
+        mock_settings.AGENT_MAX_CONCURRENCY = 4
+        mock_settings.AGENT_QUEUE_TIMEOUT_SECONDS = 0
         
         # Create service and invoke agent
         service = AgentService()
-        response = service.invoke_agent("Hello", "test-thread")
+        service.agent = mock_agent
+        response = await service.invoke_agent("Hello", "test-thread")
         
         # Verify agent was invoked with correct parameters
-        mock_agent.invoke.assert_called_once()
-        args, kwargs = mock_agent.invoke.call_args
+        mock_agent.ainvoke.assert_awaited_once()
+        args, kwargs = mock_agent.ainvoke.call_args
         assert args[0]["messages"][0]["content"] == "Hello"
-        assert kwargs["configurable"]["thread_id"] == "test-thread"
+        assert args[1]["configurable"]["thread_id"] == "test-thread"
         assert response == {"response": "test response"}
     
     @patch("app.services.agent_service.create_react_agent")
     @patch("app.services.agent_service.ChatOpenAI")
     @patch("app.services.agent_service.settings")
-    def test_continue_conversation(self, mock_settings, mock_chat_openai, mock_create_agent):
+    async def test_continue_conversation(self, mock_settings, mock_chat_openai, mock_create_agent):
         """Test continuing a conversation with the agent."""
         # Setup mocks
         mock_agent = MagicMock()
         mock_model = MagicMock()
-        mock_agent.invoke.return_value = {"response": "follow-up response"}
+        mock_agent.ainvoke = AsyncMock(return_value={"response": "follow-up response"})
         mock_chat_openai.return_value = mock_model
         mock_create_agent.return_value = mock_agent
+        mock_settings.AGENT_MAX_CONCURRENCY = 4
+        mock_settings.AGENT_QUEUE_TIMEOUT_SECONDS = 0
         
         # Create service and continue conversation
         service = AgentService()
-        response = service.continue_conversation("Tell me more", "existing-thread")
+        service.agent = mock_agent
+        response = await service.continue_conversation("Tell me more", "existing-thread")
         
         # Verify agent was invoked with correct parameters
-        mock_agent.invoke.assert_called_once()
-        args, kwargs = mock_agent.invoke.call_args
+        mock_agent.ainvoke.assert_awaited_once()
+        args, kwargs = mock_agent.ainvoke.call_args
         assert args[0]["messages"][0]["content"] == "Tell me more"
-        assert kwargs["configurable"]["thread_id"] == "existing-thread"
+        assert args[1]["configurable"]["thread_id"] == "existing-thread"
         assert response == {"response": "follow-up response"}
+
+    @patch("app.services.agent_service.ChatOpenAI")
+    @patch("app.services.agent_service.settings")
+    async def test_invoke_agent_rejects_when_saturated(self, mock_settings, mock_chat_openai):
+        """Test that runs beyond AGENT_MAX_CONCURRENCY are rejected instead of queued."""
+        mock_settings.AGENT_MAX_CONCURRENCY = 1
+        mock_settings.AGENT_QUEUE_TIMEOUT_SECONDS = 0
+        mock_settings.AGENT_RETRY_AFTER_SECONDS = 7
+
+        release = asyncio.Event()
+
+        async def slow_ainvoke(*args, **kwargs):
+            await release.wait()
+            return {"messages": []}
+
+        service = AgentService()
+        service.agent = MagicMock()
+        service.agent.ainvoke = slow_ainvoke
+
+        first = asyncio.create_task(service.invoke_agent("Hello", "thread-1"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AgentBusyError) as exc_info:
+            await service.invoke_agent("Hello again", "thread-2")
+        assert exc_info.value.retry_after == 7
+
+        release.set()
+        assert await first == {"messages": []}
     
     @pytest.mark.asyncio
     async def test_get_agent_service_singleton(self):
@@ -93,3 +132,133 @@ class TestAgentService:
         service1 = await get_agent_service()
         service2 = await get_agent_service()
         assert service1 is service2
+
+    @patch("app.services.agent_service.ChatOpenAI")
+    @patch("app.services.agent_service.settings")
+    async def test_stream_agent(self, mock_settings, mock_chat_openai):
+        """Test that streamed runs yield tokens and tool progress, then an end event."""
+        mock_settings.AGENT_MAX_CONCURRENCY = 4
+        mock_settings.AGENT_QUEUE_TIMEOUT_SECONDS = 0
+
+        async def fake_astream_events(*args, **kwargs):
+            yield {"event": "on_tool_start", "name": "read_graph", "data": {"input": {}}}
+            yield {"event": "on_tool_end", "name": "read_graph", "data": {"output": MagicMock(content="{}")}}
+            yield {"event": "on_chat_model_stream", "name": "model", "data": {"chunk": MagicMock(content="Bon")}}
+            yield {"event": "on_chat_model_stream", "name": "model", "data": {"chunk": MagicMock(content="jour")}}
+
+        service = AgentService()
+        service.agent = MagicMock()
+        service.agent.astream_events = fake_astream_events
+
+        events = [event async for event in service.stream_agent("Hello", "stream-thread")]
+
+        assert [event["event"] for event in events] == ["tool_start", "tool_end", "token", "token", "end"]
+        assert "".join(e["data"]["content"] for e in events if e["event"] == "token") == "Bonjour"
+        assert events[-1]["data"]["thread_id"] == "stream-thread"
+
+
+class TestAgentStartup:
+    """Test cases for warming the agent service at startup."""
+
+    async def test_start_agent_service_warms_in_background(self):
+        """Test that requests arriving during warm-up reuse the service being built."""
+        await close_agent_service()
+        release = asyncio.Event()
+        built = MagicMock(tools=[], close=AsyncMock())
+
+        async def slow_create():
+            await release.wait()
+            return built
+
+        with patch.object(agent_module.AgentService, "create", side_effect=slow_create) as mock_create:
+            start_agent_service()
+            await asyncio.sleep(0)
+            assert not agent_ready()
+
+            pending = asyncio.create_task(get_agent_service())
+            release.set()
+
+            assert await pending is built
+            assert agent_ready()
+            mock_create.assert_called_once()
+
+        await close_agent_service()
+        assert not agent_ready()
+
+    async def test_failed_startup_is_retried_in_the_background(self, monkeypatch, caplog):
+        """Test that a worker becomes ready after a failed build without any chat request."""
+        await close_agent_service()
+        monkeypatch.setattr(agent_module.settings, "AGENT_STARTUP_RETRY_SECONDS", 0.001)
+        monkeypatch.setattr(agent_module.settings, "AGENT_STARTUP_RETRY_MAX_SECONDS", 0.002)
+        built = MagicMock(tools=[], close=AsyncMock())
+        outcomes = [ConnectionError("MCP server down"), ConnectionError("MCP server down"), built]
+
+        with patch.object(agent_module.AgentService, "create", side_effect=outcomes) as mock_create:
+            start_agent_service()
+            for _ in range(100):
+                if agent_ready():
+                    break
+                await asyncio.sleep(0.001)
+
+            assert agent_ready()
+            assert mock_create.call_count == 3
+        assert "MCP server down" in caplog.text
+
+        await close_agent_service()
+
+    @patch("app.services.agent_service.create_react_agent")
+    @patch("app.services.agent_service.ChatOpenAI")
+    @patch("app.services.agent_service.MultiServerMCPClient")
+    @patch("app.services.agent_service.settings")
+    async def test_concurrent_first_requests_build_once(
+        self, mock_settings, mock_mcp_client, mock_chat_openai, mock_create_agent
+    ):
+        """Test that a burst of first requests on a cold worker creates a single MCP client."""
+        await close_agent_service()
+        mock_settings.AGENT_MAX_CONCURRENCY = 4
+        mock_settings.AGENT_MAX_THREADS = 10
+        mock_settings.AGENT_THREAD_IDLE_TTL_SECONDS = 0
+        mock_settings.AGENT_CHECKPOINTER = "memory"
+        mock_settings.MCP_POOL_SIZE = 0
+
+        async def slow_get_tools():
+            await asyncio.sleep(0.01)
+            return []
+
+        mock_mcp_client.return_value.get_tools = slow_get_tools
+
+        services = await asyncio.gather(*(get_agent_service() for _ in range(50)))
+
+        assert mock_mcp_client.call_count == 1
+        assert mock_create_agent.call_count == 1
+        assert all(service is services[0] for service in services)
+
+        await close_agent_service()
+
+    @patch("app.services.agent_service.create_react_agent")
+    @patch("app.services.agent_service.ChatOpenAI")
+    @patch("app.services.agent_service.MultiServerMCPClient")
+    @patch("app.services.agent_service.MCPSessionPool")
+    @patch("app.services.agent_service.open_sqlite_saver")
+    @patch("app.services.agent_service.settings")
+    async def test_failed_build_leaves_nothing_open(
+        self, mock_settings, mock_open_saver, mock_pool_class, mock_mcp_client, mock_chat_openai, mock_create_agent
+    ):
+        """Test that a build failing on the MCP servers closes the pool and the SQLite connection."""
+        mock_settings.AGENT_MAX_CONCURRENCY = 4
+        mock_settings.AGENT_MAX_THREADS = 10
+        mock_settings.AGENT_THREAD_IDLE_TTL_SECONDS = 0
+        mock_settings.AGENT_CHECKPOINTER = "sqlite"
+        mock_settings.MCP_POOL_SIZE = 2
+        saver = MagicMock(conn=MagicMock(close=AsyncMock()))
+        mock_open_saver.return_value = saver
+        pool = mock_pool_class.return_value
+        pool.start = AsyncMock(side_effect=ConnectionError("MCP server down"))
+        pool.close = AsyncMock()
+
+        with pytest.raises(ConnectionError):
+            await AgentService.create()
+
+        pool.close.assert_awaited_once()
+        saver.conn.close.assert_awaited_once()
+        mock_create_agent.assert_not_called()
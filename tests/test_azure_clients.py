@@ -0,0 +1,38 @@
+"""
+Tests for the shared Azure client registry.
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from azure.core.exceptions import HttpResponseError
+
+from app.core.azure_clients import AzureClients
+from app.core.azure_config import AzureSettings
+
+
+class TestAzureClients:
+    """Test cases for AzureClients.open."""
+
+    @patch("app.core.azure_clients.BlobServiceClient")
+    @patch("app.core.azure_clients.TableServiceClient")
+    async def test_failed_provisioning_closes_the_session_and_clients(self, mock_table_service, mock_blob_service):
+        """Test that an error while creating the tables leaves nothing open."""
+        table_service = MagicMock(
+            create_table_if_not_exists=AsyncMock(side_effect=HttpResponseError("throttled")),
+            close=AsyncMock(),
+        )
+        blob_service = MagicMock(close=AsyncMock())
+        mock_table_service.from_connection_string.return_value = table_service
+        mock_blob_service.from_connection_string.return_value = blob_service
+        session = MagicMock(close=AsyncMock())
+        clients = AzureClients(AzureSettings(azure_storage_connection_string="UseDevelopmentStorage=true"))
+
+        with patch.object(clients, "_build_session", return_value=session):
+            with pytest.raises(HttpResponseError):
+                await clients.open()
+
+        table_service.close.assert_awaited_once()
+        blob_service.close.assert_awaited_once()
+        session.close.assert_awaited_once()
+        assert not clients.is_open
+        assert clients.session is None and clients.table_service_client is None
@@ -0,0 +1,80 @@
+"""
+Tests for the bounded in-memory checkpointer.
+"""
+from unittest.mock import patch
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from app.services.checkpointer import BoundedInMemorySaver, open_sqlite_saver
+
+
+def _config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+
+
+def _save(saver: BoundedInMemorySaver, thread_id: str) -> None:
+    saver.put(_config(thread_id), empty_checkpoint(), {}, {})
+
+
+class TestBoundedInMemorySaver:
+    """Test cases for BoundedInMemorySaver."""
+
+    def test_evicts_least_recently_used_thread(self):
+        """Test that the oldest untouched thread is evicted past max_threads."""
+        saver = BoundedInMemorySaver(max_threads=2, idle_ttl_seconds=0)
+        _save(saver, "a")
+        _save(saver, "b")
+        # Reading "a" makes "b" the least recently used thread
+        assert saver.get_tuple(_config("a")) is not None
+        _save(saver, "c")
+
+        assert saver.get_tuple(_config("b")) is None
+        assert saver.get_tuple(_config("a")) is not None
+        assert saver.stats()["resident_threads"] == 2
+        assert saver.stats()["evictions"] == 1
+
+    async def test_async_api_is_bounded(self):
+        """Test that the async methods used by the agent go through the same limits."""
+        saver = BoundedInMemorySaver(max_threads=1, idle_ttl_seconds=0)
+        await saver.aput(_config("a"), empty_checkpoint(), {}, {})
+        await saver.aput(_config("b"), empty_checkpoint(), {}, {})
+
+        assert await saver.aget_tuple(_config("a")) is None
+        assert "a" not in saver.storage
+        assert saver.stats()["evictions"] == 1
+
+    def test_expires_idle_threads(self):
+        """Test that threads idle for longer than the TTL are dropped."""
+        saver = BoundedInMemorySaver(max_threads=10, idle_ttl_seconds=60)
+        with patch("app.services.checkpointer.time.monotonic", return_value=1000.0):
+            _save(saver, "a")
+        with patch("app.services.checkpointer.time.monotonic", return_value=1030.0):
+            _save(saver, "b")
+        with patch("app.services.checkpointer.time.monotonic", return_value=1070.0):
+            assert saver.get_tuple(_config("a")) is None
+            assert saver.get_tuple(_config("b")) is not None
+            stats = saver.stats()
+
+        assert stats["resident_threads"] == 1
+        assert stats["expirations"] == 1
+
+
+class TestSqliteSaver:
+    """Test cases for the SQLite checkpointer."""
+
+    async def test_threads_survive_reopening(self, tmp_path):
+        """Test that a thread saved by one connection is read back by another."""
+        path = str(tmp_path / "checkpoints.sqlite")
+        saver = await open_sqlite_saver(path)
+        await saver.aput(_config("a"), empty_checkpoint(), {}, {})
+        await saver.conn.close()
+
+        # A fresh connection stands for a restarted process or another worker
+        saver = await open_sqlite_saver(path)
+        try:
+            assert await saver.aget_tuple(_config("a")) is not None
+            assert await saver.aget_tuple(_config("b")) is None
+            async with saver.conn.execute("PRAGMA journal_mode") as cursor:
+                assert (await cursor.fetchone())[0] == "wal"
+        finally:
+            await saver.conn.close()
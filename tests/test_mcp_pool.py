@@ -0,0 +1,102 @@
+"""
+Tests for the MCP session pool.
+"""
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+
+from langchain_core.tools import StructuredTool
+
+from app.services.mcp_pool import MCPSessionPool
+
+
+class FakeMCPClient:
+    """Stand-in for MultiServerMCPClient that counts opened sessions."""
+
+    def __init__(self, connections=("memory",), failing_session=None):
+        self.connections = {server_name: {} for server_name in connections}
+        self.opened = 0
+        self.open_sessions = 0
+        # (server, n): the n-th session opened on that server fails to start
+        self.failing_session = failing_session
+        self._opened_per_server = {}
+
+    @asynccontextmanager
+    async def session(self, server_name):
+        self.opened += 1
+        number = self._opened_per_server[server_name] = self._opened_per_server.get(server_name, 0) + 1
+        if self.failing_session == (server_name, number):
+            raise ConnectionError(f"{server_name} did not start")
+        self.open_sessions += 1
+        try:
+            yield {"server": server_name, "number": self.opened}
+        finally:
+            self.open_sessions -= 1
+
+
+async def _fake_load_mcp_tools(session):
+    async def read_graph(**arguments):
+        return f"session {session['number']}", None
+
+    return [
+        StructuredTool(
+            name="read_graph",
+            description="Read the knowledge graph",
+            args_schema={"type": "object", "properties": {}},
+            coroutine=read_graph,
+            response_format="content_and_artifact",
+        )
+    ]
+
+
+class TestMCPSessionPool:
+    """Test cases for MCPSessionPool."""
+
+    @patch("app.services.mcp_pool.load_mcp_tools", side_effect=_fake_load_mcp_tools)
+    async def test_tool_calls_reuse_pooled_sessions(self, mock_load_tools):
+        """Test that tool calls do not open a session each."""
+        client = FakeMCPClient()
+        pool = MCPSessionPool(client, size=2, healthcheck_interval=0)
+        await pool.start()
+        try:
+            tool = pool.get_tools()[0]
+            for _ in range(10):
+                await tool.coroutine()
+
+            assert tool.name == "read_graph"
+            assert client.opened == 2
+            assert pool.stats()["memory"] == {"size": 2, "idle": 2, "alive": 2, "restarts": 0}
+        finally:
+            await pool.close()
+
+    @patch("app.services.mcp_pool.load_mcp_tools", side_effect=_fake_load_mcp_tools)
+    async def test_dead_session_is_restarted(self, mock_load_tools):
+        """Test that a session whose server exited is replaced on next checkout."""
+        client = FakeMCPClient()
+        pool = MCPSessionPool(client, size=1, healthcheck_interval=0)
+        await pool.start()
+        try:
+            slot = pool._slots["memory"][0]
+            await slot.stop()
+            assert not slot.alive
+
+            content, _ = await pool.get_tools()[0].coroutine()
+
+            assert content == "session 2"
+            assert pool.stats()["memory"]["restarts"] == 1
+        finally:
+            await pool.close()
+
+    @patch("app.services.mcp_pool.load_mcp_tools", side_effect=_fake_load_mcp_tools)
+    async def test_failed_start_closes_the_sessions_already_open(self, mock_load_tools):
+        """Test that a session failing to start leaves no other session open."""
+        client = FakeMCPClient(connections=("memory", "search"), failing_session=("search", 2))
+        pool = MCPSessionPool(client, size=2, healthcheck_interval=0)
+
+        with pytest.raises(ConnectionError):
+            await pool.start()
+
+        assert client.opened == 4
+        assert client.open_sessions == 0
+        assert pool.stats() == {}
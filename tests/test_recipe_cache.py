@@ -0,0 +1,99 @@
+"""
+Tests for the per-worker recipe cache.
+"""
+from app.schemas.recipe import RecipeUpdate
+from app.services import recipe_cache
+from app.services.recipe_cache import LRUCache
+from app.services.recipe_service import RecipeService
+from tests.fakes import FakeTableClient, make_recipe_create
+
+
+class TestLRUCache:
+    """Test cases for LRUCache."""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the size limit drops the entry read least recently."""
+        cache = LRUCache(max_entries=2, ttl_seconds=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire_after_the_ttl(self, monkeypatch):
+        """Test that an entry older than the TTL is a miss."""
+        now = [1000.0]
+        monkeypatch.setattr(recipe_cache.time, "monotonic", lambda: now[0])
+        cache = LRUCache(max_entries=10, ttl_seconds=60)
+        cache.put("a", 1)
+
+        now[0] += 61
+
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_value_read_before_an_invalidation_is_not_cached(self):
+        """Test that a stale read racing with a write is dropped."""
+        cache = LRUCache(max_entries=10, ttl_seconds=60)
+        version = cache.version
+        cache.invalidate("a")
+
+        cache.put("a", "stale", version)
+
+        assert cache.get("a") is None
+
+
+class TestRecipeServiceCache:
+    """Test cases for the cache in RecipeService."""
+
+    async def test_repeated_reads_hit_the_cache(self):
+        """Test that only the first read goes to the table."""
+        table_client = FakeTableClient()
+        service = RecipeService(table_client, cache=LRUCache(max_entries=10, ttl_seconds=60))
+        created = await service.create_recipe(make_recipe_create())
+
+        for _ in range(5):
+            assert (await service.get_recipe(created.id)).id == created.id
+
+        assert table_client.calls["get_entity"] == 1
+        assert service.cache.stats()["hits"] == 4
+
+    async def test_writes_invalidate_the_cached_recipe(self):
+        """Test that update, image changes and delete are visible on the next read."""
+        service = RecipeService(FakeTableClient(), cache=LRUCache(max_entries=10, ttl_seconds=60))
+        created = await service.create_recipe(make_recipe_create())
+        await service.get_recipe(created.id)
+
+        await service.update_recipe(created.id, RecipeUpdate(title="Nouveau titre"))
+        assert (await service.get_recipe(created.id)).title == "Nouveau titre"
+
+        await service.add_image_url(created.id, "https://img/1.jpg", image_type="additional")
+        assert (await service.get_recipe(created.id)).additional_images_urls == ["https://img/1.jpg"]
+
+        await service.clear_image_urls(created.id)
+        assert (await service.get_recipe(created.id)).additional_images_urls == []
+
+        await service.delete_recipe(created.id)
+        assert await service.get_recipe(created.id) is None
+
+    async def test_update_does_not_modify_the_cached_copy(self):
+        """Test that a failed update leaves no half-applied change in the cache."""
+        table_client = FakeTableClient()
+        service = RecipeService(table_client, cache=LRUCache(max_entries=10, ttl_seconds=60))
+        created = await service.create_recipe(make_recipe_create(title="Titre"))
+        cached = await service.get_recipe(created.id)
+
+        async def failing_update(*args, **kwargs):
+            raise ConnectionError("network down")
+        table_client.update_entity = failing_update
+        try:
+            await service.update_recipe(created.id, RecipeUpdate(title="Perdu"))
+        except RuntimeError:
+            pass
+
+        assert cached.title == "Titre"
+        assert (await service.get_recipe(created.id)).title == "Titre"
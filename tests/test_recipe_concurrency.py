@@ -0,0 +1,107 @@
+"""
+Tests for optimistic concurrency (entity ETags) on recipe writes.
+"""
+import asyncio
+from typing import AsyncIterator
+
+import httpx
+import pytest
+
+from app.main import app
+from app.schemas.recipe import RecipeUpdate
+from app.services.image_service import get_image_service
+from app.services.recipe_service import RecipePreconditionFailedError, RecipeService, get_recipe_service
+from tests.fakes import FakeImageService, FakeTableClient, make_recipe_entity
+
+CONCURRENT_UPLOADS = 50
+
+
+@pytest.fixture
+def service() -> RecipeService:
+    table_client = FakeTableClient()
+    table_client.entities[("recipe", "r1")] = make_recipe_entity("r1")
+    return RecipeService(table_client)
+
+
+@pytest.fixture
+def image_service() -> FakeImageService:
+    return FakeImageService()
+
+
+@pytest.fixture
+async def client(service: RecipeService, image_service: FakeImageService) -> AsyncIterator[httpx.AsyncClient]:
+    app.dependency_overrides[get_recipe_service] = lambda: service
+    app.dependency_overrides[get_image_service] = lambda: image_service
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_recipe_service, None)
+        app.dependency_overrides.pop(get_image_service, None)
+
+
+class TestConcurrentImageUploads:
+    """Test cases for concurrent writes to the same recipe."""
+
+    async def test_no_additional_image_is_lost(
+        self, client: httpx.AsyncClient, service: RecipeService, image_service: FakeImageService
+    ):
+        """Test that 50 concurrent uploads to one recipe all keep their URL."""
+        async def upload() -> int:
+            response = await client.post(
+                "/api/v1/recipes/r1/images/additional",
+                files={"file": ("photo.jpg", b"\xff\xd8\xff", "image/jpeg")}
+            )
+            return response.status_code
+
+        statuses = await asyncio.gather(*(upload() for _ in range(CONCURRENT_UPLOADS)))
+
+        assert statuses == [200] * CONCURRENT_UPLOADS
+        recipe = await service.get_recipe("r1")
+        assert sorted(recipe.additional_images_urls) == sorted(image_service.uploaded)
+        assert len(recipe.additional_images_urls) == CONCURRENT_UPLOADS
+
+    async def test_concurrent_updates_and_uploads_keep_both_changes(self, service: RecipeService):
+        """Test that an update racing with an upload does not overwrite the new image."""
+        await asyncio.gather(
+            service.update_recipe("r1", RecipeUpdate(title="Nouveau titre")),
+            service.add_image_url("r1", "https://img/1.jpg", image_type="additional"),
+        )
+
+        recipe = await service.get_recipe("r1")
+        assert recipe.title == "Nouveau titre"
+        assert recipe.additional_images_urls == ["https://img/1.jpg"]
+
+
+class TestIfMatch:
+    """Test cases for If-Match on PATCH /recipes/{id}."""
+
+    async def test_matching_etag_updates_and_returns_the_new_etag(self, client: httpx.AsyncClient):
+        """Test that a PATCH with the current ETag succeeds."""
+        etag = (await client.get("/api/v1/recipes/r1")).headers["etag"]
+
+        response = await client.patch(
+            "/api/v1/recipes/r1", json={"title": "Nouveau titre"}, headers={"If-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["title"] == "Nouveau titre"
+        assert response.headers["etag"] != etag
+
+    async def test_stale_etag_is_rejected(self, client: httpx.AsyncClient, service: RecipeService):
+        """Test that a PATCH based on an outdated read gets 412 and changes nothing."""
+        etag = (await client.get("/api/v1/recipes/r1")).headers["etag"]
+        await service.add_image_url("r1", "https://img/1.jpg", image_type="additional")
+
+        response = await client.patch(
+            "/api/v1/recipes/r1", json={"title": "Perdu"}, headers={"If-Match": etag}
+        )
+
+        assert response.status_code == 412
+        assert (await service.get_recipe("r1")).title == "Recette r1"
+
+    async def test_precondition_is_checked_by_the_service(self, service: RecipeService):
+        """Test that update_recipe raises when the precondition does not hold."""
+        with pytest.raises(RecipePreconditionFailedError):
+            await service.update_recipe("r1", RecipeUpdate(title="Perdu"), precondition=lambda recipe: False)
@@ -0,0 +1,109 @@
+"""
+Tests for conditional GET (ETag, Last-Modified, 304) on the recipe endpoints.
+"""
+from typing import AsyncIterator
+
+import httpx
+import pytest
+
+from app.main import app
+from app.schemas.recipe import RecipeUpdate
+from app.services.recipe_service import RecipeService, get_recipe_service
+from tests.fakes import FakeTableClient, make_recipe_entity
+
+
+@pytest.fixture
+def service() -> RecipeService:
+    table_client = FakeTableClient()
+    for recipe_id in ("r1", "r2", "r3"):
+        table_client.entities[("recipe", recipe_id)] = make_recipe_entity(recipe_id)
+    return RecipeService(table_client)
+
+
+@pytest.fixture
+async def client(service: RecipeService) -> AsyncIterator[httpx.AsyncClient]:
+    app.dependency_overrides[get_recipe_service] = lambda: service
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_recipe_service, None)
+
+
+class TestRecipeConditionalGet:
+    """Test cases for GET /recipes/{id}."""
+
+    async def test_validators_are_returned(self, client: httpx.AsyncClient):
+        """Test that a recipe carries a strong ETag and its modification date."""
+        response = await client.get("/api/v1/recipes/r1")
+
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["last-modified"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+
+    async def test_matching_etag_returns_304_until_the_recipe_changes(
+        self, client: httpx.AsyncClient, service: RecipeService
+    ):
+        """Test that If-None-Match gives an empty 304, then a 200 after an update."""
+        etag = (await client.get("/api/v1/recipes/r1")).headers["etag"]
+
+        response = await client.get("/api/v1/recipes/r1", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        await service.update_recipe("r1", RecipeUpdate(title="Nouveau titre"))
+        response = await client.get("/api/v1/recipes/r1", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    async def test_if_modified_since(self, client: httpx.AsyncClient):
+        """Test that If-Modified-Since is compared to the modification date."""
+        response = await client.get(
+            "/api/v1/recipes/r1", headers={"If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"}
+        )
+        assert response.status_code == 304
+
+        response = await client.get(
+            "/api/v1/recipes/r1", headers={"If-Modified-Since": "Tue, 31 Dec 2024 23:59:59 GMT"}
+        )
+        assert response.status_code == 200
+
+
+class TestRecipeListConditionalGet:
+    """Test cases for GET /recipes."""
+
+    async def test_unchanged_page_returns_304(self, client: httpx.AsyncClient):
+        """Test that re-polling an unchanged page costs no body."""
+        etag = (await client.get("/api/v1/recipes/", params={"view": "summary"})).headers["etag"]
+
+        response = await client.get(
+            "/api/v1/recipes/", params={"view": "summary"}, headers={"If-None-Match": f'W/{etag}'}
+        )
+
+        assert response.status_code == 304
+
+    async def test_views_and_page_sizes_of_the_same_recipes_have_distinct_etags(
+        self, client: httpx.AsyncClient
+    ):
+        """Test that a summary page does not validate the full page, nor another page size."""
+        summary = (await client.get("/api/v1/recipes/", params={"view": "summary"})).headers["etag"]
+        full = (await client.get("/api/v1/recipes/")).headers["etag"]
+        larger = (await client.get("/api/v1/recipes/", params={"limit": 50})).headers["etag"]
+
+        assert len({summary, full, larger}) == 3
+        response = await client.get("/api/v1/recipes/", headers={"If-None-Match": summary})
+        assert response.status_code == 200
+
+    async def test_page_etag_changes_with_any_recipe_of_the_page(
+        self, client: httpx.AsyncClient, service: RecipeService
+    ):
+        """Test that an image added to one recipe of the page invalidates the page."""
+        etag = (await client.get("/api/v1/recipes/")).headers["etag"]
+
+        await service.add_image_url("r2", "https://img/1.jpg", image_type="additional")
+        response = await client.get("/api/v1/recipes/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.json()["recipes"][1]["additional_images_urls"] == ["https://img/1.jpg"]
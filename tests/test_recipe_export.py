@@ -0,0 +1,77 @@
+"""
+Tests for the streaming NDJSON export.
+"""
+import json
+
+import httpx
+
+from app.main import app
+from app.services.recipe_partitions import migrate_partitions
+from app.services.recipe_service import RecipeService, get_recipe_service
+from tests.fakes import FakeTableClient, make_recipe_entity
+
+
+def _catalog(size: int) -> FakeTableClient:
+    table_client = FakeTableClient()
+    for number in range(size):
+        recipe_id = f"r{number:04d}"
+        table_client.entities[("recipe", recipe_id)] = make_recipe_entity(recipe_id)
+    return table_client
+
+
+async def _export(service: RecipeService, headers: dict) -> httpx.Response:
+    app.dependency_overrides[get_recipe_service] = lambda: service
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/v1/recipes/export", headers=headers)
+    finally:
+        app.dependency_overrides.pop(get_recipe_service, None)
+
+
+class TestExportRecipes:
+    """Test cases for RecipeService.export_recipes."""
+
+    async def test_export_is_a_single_scan(self):
+        """Test that every recipe is read once, one page query per partition and page."""
+        table_client = _catalog(2500)
+        await migrate_partitions(table_client, 4)
+        table_client.calls.clear()
+        table_client.rows_returned = 0
+        service = RecipeService(table_client, partition_buckets=4)
+
+        ids = [recipe.id async for recipe in service.export_recipes()]
+
+        assert sorted(ids) == [f"r{number:04d}" for number in range(2500)]
+        assert table_client.rows_returned == 2500
+        assert set(table_client.calls) == {"query_entities"}
+
+    async def test_metadata_rows_are_not_exported(self):
+        """Test that the recipe counter is not mistaken for a recipe."""
+        service = RecipeService(_catalog(3))
+        await service.reconcile_recipe_count()
+
+        assert len([recipe async for recipe in service.export_recipes()]) == 3
+
+
+class TestExportEndpoint:
+    """Test cases for GET /recipes/export."""
+
+    async def test_plain_ndjson(self):
+        """Test that the response has one recipe per line."""
+        response = await _export(RecipeService(_catalog(1200)), {"Accept-Encoding": "identity"})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        lines = response.text.splitlines()
+        assert len(lines) == 1200
+        assert json.loads(lines[0])["id"] == "r0000"
+
+    async def test_gzip_when_accepted(self):
+        """Test that the export is gzip-compressed for clients that accept it."""
+        response = await _export(RecipeService(_catalog(1200)), {"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        # httpx decodes the body: compare the bytes received with the decoded size
+        assert response.num_bytes_downloaded < len(response.content) / 5
+        assert len(response.text.splitlines()) == 1200
@@ -0,0 +1,193 @@
+"""
+Tests for filtered recipe listing through the tag and meal-type indexes.
+"""
+from app.schemas.recipe import DifficultyLevel, MealType, RecipeSearchFilters, RecipeUpdate
+from app.services.recipe_index import PostingIndex
+from app.services.recipe_service import RecipeService
+from tests.fakes import FakeTableClient, make_recipe_create, make_recipe_entity
+
+
+def _indexed_service():
+    return RecipeService(
+        FakeTableClient(),
+        ingredient_index=PostingIndex(FakeTableClient()),
+        tag_index=PostingIndex(FakeTableClient()),
+        meal_type_index=PostingIndex(FakeTableClient()),
+    )
+
+
+async def _catalog(service: RecipeService):
+    return [
+        await service.create_recipe(make_recipe_create(
+            title="Tarte aux fraises", meal_type=[MealType.DESSERT], tags=["Été", "rapide"],
+        )),
+        await service.create_recipe(make_recipe_create(
+            title="Salade composée", meal_type=[MealType.STARTER, MealType.MAIN_COURSE], tags=["été"],
+            difficulty=DifficultyLevel.EASY,
+        )),
+        await service.create_recipe(make_recipe_create(
+            title="Bœuf bourguignon", meal_type=[MealType.MAIN_COURSE], tags=["hiver"],
+            prep_time_minutes=45, cook_time_minutes=180,
+        )),
+    ]
+
+
+class TestRecipeFilters:
+    """Test cases for RecipeService.list_recipes."""
+
+    async def test_meal_type_filter_matches_json_arrays(self):
+        """Test that meal_type finds recipes listing several meal types."""
+        service = _indexed_service()
+        tart, salad, stew = await _catalog(service)
+
+        recipes, _, total = await service.list_recipes(filters=RecipeSearchFilters(meal_type=MealType.MAIN_COURSE))
+
+        assert total == 2
+        assert {recipe.id for recipe in recipes} == {salad.id, stew.id}
+
+    async def test_indexed_filters_intersect_before_reading(self):
+        """Test that tag and meal-type postings are intersected without scanning the table."""
+        service = _indexed_service()
+        tart, salad, _ = await _catalog(service)
+
+        recipes, _, total = await service.list_recipes(
+            filters=RecipeSearchFilters(tags=["ete"], meal_type=MealType.DESSERT)
+        )
+
+        assert total == 1 and recipes[0].id == tart.id
+        assert "query_entities" not in service.table_client.calls
+
+    async def test_skip_and_limit_apply_after_filtering(self):
+        """Test that pages are cut from the matching recipes, not from the table."""
+        service = _indexed_service()
+        recipes = await _catalog(service)
+        summer = sorted(recipe.id for recipe in recipes[:2])
+
+        first, _, total = await service.list_recipes(limit=1, filters=RecipeSearchFilters(tags=["été"]))
+        second, _, _ = await service.list_recipes(skip=1, limit=1, filters=RecipeSearchFilters(tags=["été"]))
+
+        assert total == 2
+        assert [first[0].id, second[0].id] == summer
+
+    async def test_residual_filters_are_checked_on_candidates(self):
+        """Test that non-indexed criteria narrow the indexed candidates."""
+        service = _indexed_service()
+        _, salad, stew = await _catalog(service)
+        filters = RecipeSearchFilters(meal_type=MealType.MAIN_COURSE, max_total_time=60)
+
+        recipes, _, total = await service.list_recipes(filters=filters)
+        assert total == 1 and recipes[0].id == salad.id
+
+        summaries, _, _ = await service.list_recipes(
+            filters=RecipeSearchFilters(difficulty=DifficultyLevel.MEDIUM), summary=True
+        )
+        assert stew.id in {summary.id for summary in summaries}
+
+    async def test_indexes_follow_updates_and_deletes(self):
+        """Test that changed and deleted recipes leave no stale postings."""
+        service = _indexed_service()
+        tart, salad, stew = await _catalog(service)
+
+        await service.update_recipe(tart.id, RecipeUpdate(tags=["hiver"], meal_type=MealType.SNACK))
+        assert (await service.list_recipes(filters=RecipeSearchFilters(tags=["rapide"])))[2] == 0
+        assert (await service.list_recipes(filters=RecipeSearchFilters(meal_type=MealType.SNACK)))[2] == 1
+
+        await service.delete_recipe(tart.id)
+        assert set(service.tag_index.table_client.entities) == {("ete", salad.id), ("hiver", stew.id)}
+
+    async def test_scan_fallback_matches_the_indexes(self):
+        """Test that a service without indexes filters the same recipes."""
+        table_client = FakeTableClient()
+        table_client.entities[("recipe", "r1")] = make_recipe_entity(
+            "r1", meal_type='["Entrée", "Plat principal"]', tags='["Été"]'
+        )
+        table_client.entities[("recipe", "r2")] = make_recipe_entity("r2", tags='["hiver"]', difficulty="Moyen")
+        service = RecipeService(table_client)
+
+        async def listed(filters: RecipeSearchFilters):
+            recipes, _, _ = await service.list_recipes(limit=10, filters=filters, summary=True)
+            return [recipe.id for recipe in recipes]
+
+        assert await listed(RecipeSearchFilters(meal_type=MealType.STARTER)) == ["r1"]
+        assert await listed(RecipeSearchFilters(tags=["ete", "hiver"])) == ["r1", "r2"]
+        assert await listed(RecipeSearchFilters(difficulty=DifficultyLevel.MEDIUM)) == ["r2"]
+
+
+def _filter_catalog(size: int) -> FakeTableClient:
+    """Catalog where one recipe in four is hard and one in two is tagged "ete"."""
+    table_client = FakeTableClient()
+    for number in range(size):
+        recipe_id = f"r{number:06d}"
+        table_client.entities[("recipe", recipe_id)] = make_recipe_entity(
+            recipe_id,
+            difficulty="Difficile" if number % 4 == 0 else "Facile",
+            total_time_minutes=30 if number % 8 == 0 else 90,
+            tags='["été"]' if number % 2 == 0 else '["hiver"]',
+        )
+    return table_client
+
+
+async def _walk(service: RecipeService, filters: RecipeSearchFilters, limit: int):
+    seen, cursor, pages = [], None, 0
+    while True:
+        recipes, cursor, _ = await service.list_recipes(limit=limit, filters=filters, cursor=cursor)
+        seen.extend(recipe.id for recipe in recipes)
+        pages += 1
+        if cursor is None:
+            return seen, pages
+
+
+class TestFilteredCursorPagination:
+    """Test cases for the pushed-down filter mode paged by cursor."""
+
+    async def test_cursor_walks_every_match_once(self):
+        """Test that OData predicates page through all matches without overlap."""
+        service = RecipeService(_filter_catalog(100))
+        filters = RecipeSearchFilters(difficulty=DifficultyLevel.HARD, max_total_time=60)
+
+        seen, pages = await _walk(service, filters, limit=4)
+
+        assert seen == [f"r{number:06d}" for number in range(0, 100, 8)]
+        assert pages == 4
+
+    async def test_local_predicates_fill_pages_without_losing_rows(self):
+        """Test that tags checked after reading still give full, contiguous pages."""
+        service = RecipeService(_filter_catalog(50))
+        filters = RecipeSearchFilters(difficulty=DifficultyLevel.EASY, tags=["ete"])
+
+        seen, _ = await _walk(service, filters, limit=3)
+
+        expected = [f"r{number:06d}" for number in range(50) if number % 2 == 0 and number % 4 != 0]
+        assert seen == expected
+
+    async def test_skip_without_cursor_reads_keys_only(self):
+        """Test that skip finds its position with a projected scan, then reads one page."""
+        table_client = _filter_catalog(100)
+        service = RecipeService(table_client)
+
+        recipes, cursor, total = await service.list_recipes(
+            skip=10, limit=5, filters=RecipeSearchFilters(difficulty=DifficultyLevel.HARD)
+        )
+
+        assert [recipe.id for recipe in recipes] == [f"r{number:06d}" for number in range(40, 60, 4)]
+        assert cursor is not None and total is None
+
+
+class TestFilteredPageCost:
+    """Rows downloaded by a deep filtered page."""
+
+    async def test_deep_filtered_page_downloads_limit_rows(self):
+        """Test that page 5 of a filtered listing downloads `limit` rows, not the rows before it."""
+        table_client = _filter_catalog(1_000)
+        service = RecipeService(table_client)
+        filters = RecipeSearchFilters(difficulty=DifficultyLevel.HARD, max_total_time=60)
+        limit = 20
+
+        _, cursor, _ = await service.list_recipes(limit=limit, filters=filters)
+        for _ in range(3):
+            _, cursor, _ = await service.list_recipes(limit=limit, filters=filters, cursor=cursor)
+        table_client.rows_returned = 0
+        recipes, _, _ = await service.list_recipes(limit=limit, filters=filters, cursor=cursor)
+
+        assert len(recipes) == limit
+        assert table_client.rows_returned == limit
@@ -0,0 +1,154 @@
+"""
+Tests for the bulk NDJSON recipe import.
+"""
+import json
+from typing import AsyncIterator, List
+
+import httpx
+import pytest
+
+from app.main import app
+from app.services.recipe_index import PostingIndex
+from app.services.recipe_partitions import recipe_partitions
+from app.services.recipe_service import IMPORT_BATCH_SIZE, RecipeService, get_recipe_service
+from tests.fakes import FakeTableClient, make_recipe_create
+
+
+def _line(title: str = "Salade de tomates") -> bytes:
+    return make_recipe_create(title=title).model_dump_json().encode()
+
+
+async def _lines(lines: List[bytes]) -> AsyncIterator[bytes]:
+    for line in lines:
+        yield line
+
+
+class TestImportRecipes:
+    """Test cases for RecipeService.import_recipes."""
+
+    async def test_rows_are_written_in_batches(self):
+        """Test that valid rows go through transactions of 100, not one create each."""
+        table_client = FakeTableClient()
+        service = RecipeService(table_client)
+        await service.reconcile_recipe_count()
+
+        results = [result async for result in service.import_recipes(_lines([_line()] * 250))]
+
+        assert sorted(result.line for result in results) == list(range(1, 251))
+        assert all(result.id and result.error is None for result in results)
+        assert table_client.calls["submit_transaction"] == 3
+        assert "create_entity" not in table_client.calls
+        assert await service.count_recipes() == 250
+
+    async def test_invalid_rows_are_reported_without_stopping_the_import(self):
+        """Test that a bad line gets its own error result and the others are created."""
+        service = RecipeService(FakeTableClient())
+        lines = [_line(), b"{not json", b"", b'{"title": "ab"}', _line("Soupe")]
+
+        results = {result.line: result async for result in service.import_recipes(_lines(lines))}
+
+        assert sorted(results) == [1, 2, 4, 5]
+        assert results[2].error and results[4].error
+        assert (await service.get_recipe(results[5].id)).title == "Soupe"
+
+    async def test_row_without_prep_time_is_created(self):
+        """Test that a row missing prep_time_minutes does not abort the import."""
+        service = RecipeService(FakeTableClient())
+        row = json.loads(_line())
+        del row["prep_time_minutes"]
+        lines = [json.dumps(row).encode(), _line("Soupe")]
+
+        results = {result.line: result async for result in service.import_recipes(_lines(lines))}
+
+        assert all(result.error is None for result in results.values())
+        recipe = await service.get_recipe(results[1].id)
+        assert recipe.total_time_minutes == (recipe.cook_time_minutes or 0)
+
+    async def test_input_failing_part_way_keeps_submitted_batches(self):
+        """Test that batches in flight when the input breaks are committed, counted and reported."""
+        service = RecipeService(FakeTableClient())
+        await service.reconcile_recipe_count()
+
+        async def broken_input() -> AsyncIterator[bytes]:
+            for _ in range(IMPORT_BATCH_SIZE + 10):
+                yield _line()
+            raise ConnectionError("client went away")
+
+        results = []
+        with pytest.raises(ConnectionError):
+            async for result in service.import_recipes(broken_input()):
+                results.append(result)
+
+        assert len(results) == IMPORT_BATCH_SIZE
+        assert all(result.id and result.error is None for result in results)
+        assert await service.count_recipes() == IMPORT_BATCH_SIZE
+
+    async def test_transactions_stay_within_one_partition(self):
+        """Test that rows are grouped per bucket, as transactions require."""
+        table_client = FakeTableClient()
+        service = RecipeService(table_client, partition_buckets=4)
+
+        results = [result async for result in service.import_recipes(_lines([_line()] * 400))]
+
+        assert all(result.error is None for result in results)
+        assert {partition for partition, _ in table_client.entities} == set(recipe_partitions(4))
+        assert len(table_client.entities) == 400
+
+    async def test_failed_transaction_falls_back_to_single_creates(self):
+        """Test that a rejected batch is retried row by row."""
+        table_client = FakeTableClient()
+
+        async def failing_transaction(operations, **kwargs):
+            raise ConnectionError("batch rejected")
+        table_client.submit_transaction = failing_transaction
+        service = RecipeService(table_client)
+
+        results = [result async for result in service.import_recipes(_lines([_line()] * 3))]
+
+        assert all(result.error is None for result in results)
+        assert table_client.calls["create_entity"] == 3
+
+    async def test_imported_recipes_are_indexed(self):
+        """Test that secondary indexes see the imported recipes."""
+        ingredient_index = PostingIndex(FakeTableClient())
+        service = RecipeService(FakeTableClient(), ingredient_index=ingredient_index)
+
+        results = [result async for result in service.import_recipes(_lines([_line()] * 2))]
+
+        assert await ingredient_index.lookup("tomate") == {result.id for result in results}
+
+    async def test_round_trips_per_recipe(self):
+        """Test that seeding stays far below one storage round trip per recipe."""
+        table_client = FakeTableClient()
+        service = RecipeService(table_client)
+        size = 20 * IMPORT_BATCH_SIZE
+
+        async for _ in service.import_recipes(_lines([_line()] * size)):
+            pass
+
+        round_trips = sum(table_client.calls.values())
+        assert round_trips <= size / IMPORT_BATCH_SIZE + 5
+
+
+class TestImportEndpoint:
+    """Test cases for POST /recipes/bulk."""
+
+    async def test_results_are_streamed_as_ndjson(self):
+        """Test that the endpoint reads NDJSON and answers one JSON line per row."""
+        service = RecipeService(FakeTableClient())
+        app.dependency_overrides[get_recipe_service] = lambda: service
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                body = b"\n".join([_line(), b"[]", _line()]) + b"\n"
+                response = await client.post(
+                    "/api/v1/recipes/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}
+                )
+        finally:
+            app.dependency_overrides.pop(get_recipe_service, None)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        results = {row["line"]: row for row in map(json.loads, response.text.splitlines())}
+        assert results[1]["id"] and results[3]["id"]
+        assert results[2]["error"]
@@ -0,0 +1,118 @@
+"""
+Tests for recipe listing: cursor pagination and counting.
+"""
+import asyncio
+import base64
+import json
+
+import pytest
+
+from app.schemas.recipe import RecipeSummary
+from app.services.recipe_service import META_PARTITION, RECIPE_COUNT_ROW, SUMMARY_COLUMNS, RecipeService
+from tests.fakes import FakeTableClient, make_recipe_create, make_recipe_entity
+
+
+def _catalog(size: int) -> FakeTableClient:
+    table_client = FakeTableClient()
+    for number in range(size):
+        recipe_id = f"r{number:03d}"
+        table_client.entities[("recipe", recipe_id)] = make_recipe_entity(recipe_id)
+    return table_client
+
+
+class TestRecipePagination:
+    """Test cases for RecipeService.get_recipes_page."""
+
+    async def test_pages_follow_the_cursor(self):
+        """Test that walking the cursors visits every recipe once, one page per call."""
+        table_client = _catalog(25)
+        service = RecipeService(table_client)
+
+        seen = []
+        cursor = None
+        for _ in range(3):
+            recipes, cursor = await service.get_recipes_page(limit=10, cursor=cursor)
+            seen.extend(recipe.id for recipe in recipes)
+
+        assert seen == [f"r{number:03d}" for number in range(25)]
+        assert cursor is None
+        assert table_client.calls["query_entities"] == 3
+
+    async def test_skip_is_still_supported(self):
+        """Test that skip without a cursor starts at the right recipe."""
+        service = RecipeService(_catalog(25))
+
+        recipes, cursor = await service.get_recipes_page(limit=5, skip=12)
+
+        assert [recipe.id for recipe in recipes] == ["r012", "r013", "r014", "r015", "r016"]
+        assert cursor is not None
+
+    async def test_skip_past_the_end_returns_an_empty_page(self):
+        """Test that skipping beyond the catalog returns nothing."""
+        service = RecipeService(_catalog(3))
+
+        assert await service.get_recipes_page(limit=5, skip=3) == ([], None)
+
+    async def test_cursors_of_the_previous_format_are_accepted(self):
+        """Test that a cursor naming the next recipe to read still resumes there."""
+        service = RecipeService(_catalog(25))
+        cursor = base64.urlsafe_b64encode(json.dumps({"RowKey": "r010"}).encode()).decode()
+
+        recipes, _ = await service.get_recipes_page(limit=2, cursor=cursor)
+
+        assert [recipe.id for recipe in recipes] == ["r010", "r011"]
+
+    async def test_invalid_cursor_is_rejected(self):
+        """Test that a tampered cursor raises ValueError."""
+        service = RecipeService(_catalog(3))
+
+        with pytest.raises(ValueError):
+            await service.get_recipes_page(limit=5, cursor="not-a-cursor")
+
+    async def test_summary_view_projects_list_columns(self):
+        """Test that the summary view never downloads ingredients or steps."""
+        table_client = _catalog(3)
+        table_client.entities[("recipe", "r001")]["main_image_url"] = "https://img/r001.jpg"
+        service = RecipeService(table_client)
+
+        recipes, _ = await service.get_recipes_page(limit=3, summary=True)
+
+        assert all(isinstance(recipe, RecipeSummary) for recipe in recipes)
+        assert recipes[1].main_image_url == "https://img/r001.jpg"
+        assert recipes[0].total_time_minutes == 30
+        assert "ingredients" not in SUMMARY_COLUMNS and "steps" not in SUMMARY_COLUMNS
+
+
+class TestRecipeCount:
+    """Test cases for the maintained recipe counter."""
+
+    async def test_first_count_creates_the_counter(self):
+        """Test that the counter is built by a scan once, then read in one call."""
+        table_client = _catalog(25)
+        service = RecipeService(table_client)
+
+        assert await service.count_recipes() == 25
+        scans = table_client.calls["query_entities"]
+        assert await service.count_recipes() == 25
+        assert table_client.calls["query_entities"] == scans
+
+    async def test_writes_maintain_the_counter(self):
+        """Test that concurrent creates and a delete keep the counter exact."""
+        service = RecipeService(_catalog(3))
+        await service.count_recipes()
+
+        created = await asyncio.gather(*(service.create_recipe(make_recipe_create()) for _ in range(8)))
+        assert await service.delete_recipe(created[0].id)
+        assert not await service.delete_recipe("missing")
+
+        assert await service.count_recipes() == 10
+
+    async def test_reconcile_fixes_drift(self):
+        """Test that reconciliation rewrites a counter that drifted."""
+        table_client = _catalog(5)
+        service = RecipeService(table_client)
+        await service.count_recipes()
+        table_client.entities[(META_PARTITION, RECIPE_COUNT_ROW)]["count"] = 42
+
+        assert await service.reconcile_recipe_count() == 5
+        assert await service.count_recipes() == 5
@@ -0,0 +1,77 @@
+"""
+Load test for GET /recipes/{id} under 200 concurrent requests.
+
+The "before" run simulates the previous synchronous SDK calls (the storage
+round trip blocks the event loop), the "after" run uses the async client.
+The test counts the storage round trips in flight at once; the p99 latency
+of both runs is reported by `pytest -m benchmark -s tests/test_recipe_load.py`.
+"""
+import asyncio
+import time
+from typing import List, Tuple
+
+import httpx
+import pytest
+
+from app.main import app
+from app.services.recipe_service import RecipeService, get_recipe_service
+from tests.fakes import FakeTableClient, make_recipe_entity
+
+CONCURRENT_REQUESTS = 200
+STORAGE_LATENCY_SECONDS = 0.005
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    index = max(0, int(round(percentile * len(ordered))) - 1)
+    return ordered[index]
+
+
+async def _load(blocking: bool) -> Tuple[FakeTableClient, List[float]]:
+    """Send the concurrent requests and return the storage client and the latencies."""
+    table_client = FakeTableClient(latency=STORAGE_LATENCY_SECONDS, blocking=blocking)
+    table_client.entities[("recipe", "r1")] = make_recipe_entity("r1")
+    service = RecipeService(table_client)
+    app.dependency_overrides[get_recipe_service] = lambda: service
+
+    async def timed_get(client: httpx.AsyncClient) -> float:
+        start = time.perf_counter()
+        response = await client.get("/api/v1/recipes/r1")
+        assert response.status_code == 200
+        return time.perf_counter() - start
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            latencies = await asyncio.gather(
+                *(timed_get(client) for _ in range(CONCURRENT_REQUESTS))
+            )
+    finally:
+        app.dependency_overrides.pop(get_recipe_service, None)
+
+    return table_client, latencies
+
+
+async def test_get_recipe_round_trips_overlap_with_the_async_client():
+    """Concurrent reads overlap their I/O once the storage client is async."""
+    blocking_client, _ = await _load(blocking=True)
+    async_client, _ = await _load(blocking=False)
+
+    # Blocking calls serialize every request behind the others
+    assert blocking_client.max_in_flight == 1
+    assert async_client.max_in_flight > 1
+    assert async_client.calls["get_entity"] <= CONCURRENT_REQUESTS
+
+
+@pytest.mark.benchmark
+async def test_get_recipe_p99_latency_async_vs_blocking():
+    """Report the p99 latency of the blocking and async runs."""
+    _, blocking_latencies = await _load(blocking=True)
+    _, async_latencies = await _load(blocking=False)
+
+    print(
+        f"\nGET /recipes/{{id}} x{CONCURRENT_REQUESTS} concurrent, "
+        f"storage latency {STORAGE_LATENCY_SECONDS * 1000:.0f}ms: "
+        f"p99 before (sync SDK) = {_percentile(blocking_latencies, 0.99) * 1000:.1f}ms, "
+        f"p99 after (aio SDK) = {_percentile(async_latencies, 0.99) * 1000:.1f}ms"
+    )
@@ -0,0 +1,149 @@
+"""
+Tests for hash-bucketed recipe partitions.
+"""
+from app.schemas.recipe import DifficultyLevel, RecipeSearchFilters
+from app.services import recipe_partitions as partitions_module
+from app.services.recipe_partitions import migrate_partitions, recipe_partition, recipe_partitions
+from app.services.recipe_service import META_PARTITION, RECIPE_COUNT_ROW, RecipeService
+from tests.fakes import FakeTableClient, make_recipe_create, make_recipe_entity
+
+
+def _legacy_catalog(size: int) -> FakeTableClient:
+    table_client = FakeTableClient()
+    for number in range(size):
+        recipe_id = f"r{number:03d}"
+        table_client.entities[("recipe", recipe_id)] = make_recipe_entity(
+            recipe_id, difficulty="Difficile" if number % 3 == 0 else "Facile"
+        )
+    return table_client
+
+
+class TestRecipePartition:
+    """Test cases for the partition scheme."""
+
+    def test_single_bucket_keeps_the_legacy_partition(self):
+        """Test that the default scheme is the historical "recipe" partition."""
+        assert recipe_partition("abc", 1) == "recipe"
+        assert recipe_partitions(1) == ["recipe"]
+
+    def test_buckets_are_stable_and_spread(self):
+        """Test that an id always maps to the same bucket and ids use every bucket."""
+        partitions = {recipe_partition(f"r{number}", 8) for number in range(200)}
+
+        assert recipe_partition("r1", 8) == recipe_partition("r1", 8)
+        assert partitions == set(recipe_partitions(8))
+
+
+class TestPartitionedService:
+    """Test cases for RecipeService over several partitions."""
+
+    async def test_writes_and_point_reads_use_the_bucket(self):
+        """Test that a recipe is stored in and read from its own bucket."""
+        table_client = FakeTableClient()
+        service = RecipeService(table_client, partition_buckets=4)
+
+        created = [await service.create_recipe(make_recipe_create()) for _ in range(20)]
+
+        for recipe in created:
+            assert (recipe_partition(recipe.id, 4), recipe.id) in table_client.entities
+            assert (await service.get_recipe(recipe.id)).id == recipe.id
+        assert await service.delete_recipe(created[0].id)
+        assert await service.get_recipe(created[0].id) is None
+
+    async def test_pages_merge_partitions_in_id_order(self):
+        """Test that cursor pages walk every bucket in id order, without duplicates."""
+        table_client = _legacy_catalog(45)
+        await migrate_partitions(table_client, 4)
+        service = RecipeService(table_client, partition_buckets=4)
+
+        seen, cursor = [], None
+        while True:
+            recipes, cursor = await service.get_recipes_page(limit=10, cursor=cursor)
+            seen.extend(recipe.id for recipe in recipes)
+            if cursor is None:
+                break
+
+        assert seen == [f"r{number:03d}" for number in range(45)]
+        recipes, _ = await service.get_recipes_page(limit=3, skip=20)
+        assert [recipe.id for recipe in recipes] == ["r020", "r021", "r022"]
+
+    async def test_short_and_empty_service_pages_lose_no_rows(self):
+        """Test that pages shorter than asked, or empty with a token, neither skip nor repeat rows."""
+        table_client = _legacy_catalog(45)
+        await migrate_partitions(table_client, 4)
+        table_client.max_page_size = 3
+        table_client.empty_first_pages = True
+        service = RecipeService(table_client, partition_buckets=4)
+
+        seen, cursor = [], None
+        while True:
+            recipes, cursor = await service.get_recipes_page(limit=10, cursor=cursor)
+            seen.extend(recipe.id for recipe in recipes)
+            if cursor is None:
+                break
+
+        assert seen == [f"r{number:03d}" for number in range(45)]
+
+    async def test_scans_cover_every_partition(self):
+        """Test that counting and filtering see recipes of all buckets, not the metadata."""
+        table_client = _legacy_catalog(30)
+        await migrate_partitions(table_client, 4)
+        service = RecipeService(table_client, partition_buckets=4)
+
+        assert await service.reconcile_recipe_count() == 30
+        assert (META_PARTITION, RECIPE_COUNT_ROW) in table_client.entities
+        hard, _, _ = await service.list_recipes(
+            limit=30, filters=RecipeSearchFilters(difficulty=DifficultyLevel.HARD), summary=True
+        )
+        assert [recipe.id for recipe in hard] == [f"r{number:03d}" for number in range(0, 30, 3)]
+
+    async def test_scans_fan_out_in_parallel(self):
+        """Test that a full scan costs about one round trip, not one per partition."""
+        table_client = _legacy_catalog(40)
+        await migrate_partitions(table_client, 8)
+        table_client.latency = 0.01
+        table_client.max_in_flight = 0
+        service = RecipeService(table_client, partition_buckets=8)
+
+        assert await service.reconcile_recipe_count() == 40
+
+        assert table_client.max_in_flight == 8
+
+
+class TestPartitionMigration:
+    """Test cases for migrate_partitions."""
+
+    async def test_migration_rekeys_and_can_be_rerun(self):
+        """Test that every recipe moves to its bucket once and metadata stays put."""
+        table_client = _legacy_catalog(25)
+        service = RecipeService(table_client)
+        await service.reconcile_recipe_count()
+
+        assert await migrate_partitions(table_client, 4) == 25
+        assert await migrate_partitions(table_client, 4) == 0
+
+        partitions = {partition for partition, _ in table_client.entities}
+        assert partitions == set(recipe_partitions(4)) | {META_PARTITION}
+        assert await migrate_partitions(table_client, 1) == 25
+        assert (await RecipeService(table_client).get_recipe("r007")).id == "r007"
+
+    async def test_migration_reads_the_table_in_batches(self, monkeypatch):
+        """Test that the migration never reads more than one batch before moving it."""
+        monkeypatch.setattr(partitions_module, "MIGRATION_BATCH_SIZE", 10)
+        table_client = _legacy_catalog(45)
+        table_client.max_page_size = 4
+
+        read_before_first_move = []
+        upsert_entity = table_client.upsert_entity
+
+        async def recording_upsert(*args, **kwargs):
+            if not read_before_first_move:
+                read_before_first_move.append(table_client.rows_returned)
+            return await upsert_entity(*args, **kwargs)
+
+        monkeypatch.setattr(table_client, "upsert_entity", recording_upsert)
+
+        assert await migrate_partitions(table_client, 8) == 45
+
+        assert all(partition == recipe_partition(row, 8) for partition, row in table_client.entities)
+        assert read_before_first_move == [12]
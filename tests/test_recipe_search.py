@@ -0,0 +1,79 @@
+"""
+Tests for recipe search through the ingredient index.
+"""
+from app.schemas.recipe import Ingredient, RecipeUpdate, Unit
+from app.services.recipe_index import PostingIndex
+from app.services.recipe_service import RecipeService
+from app.services.text import ingredient_keys
+from tests.fakes import FakeTableClient, make_recipe_create
+
+
+def _ingredients(*names: str):
+    return [Ingredient(name=name, quantity=1, unit=Unit.PIECE) for name in names]
+
+
+def _indexed_service():
+    index_client = FakeTableClient()
+    return RecipeService(FakeTableClient(), ingredient_index=PostingIndex(index_client)), index_client
+
+
+class TestIngredientKeys:
+    """Test cases for ingredient normalization."""
+
+    def test_keys_fold_accents_plurals_and_stopwords(self):
+        """Test that ingredient names are reduced to comparable keys."""
+        assert ingredient_keys("Pommes de terre") == {"pomme", "terre"}
+        assert ingredient_keys("Crème fraîche") == {"creme", "fraiche"}
+        assert ingredient_keys("Œufs") == {"oeuf"}
+
+
+class TestIngredientSearch:
+    """Test cases for RecipeService.find_recipe_ids_by_ingredient."""
+
+    async def test_search_reads_only_the_hits(self):
+        """Test that the index answers without scanning the recipes table."""
+        service, _ = _indexed_service()
+        salad = await service.create_recipe(make_recipe_create(ingredients=_ingredients("Tomates", "Basilic")))
+        await service.create_recipe(make_recipe_create(ingredients=_ingredients("Pommes de terre")))
+        await service.create_recipe(make_recipe_create(ingredients=_ingredients("Tomate", "Pommes de terre")))
+
+        assert await service.find_recipe_ids_by_ingredient("basilic") == [salad.id]
+        assert len(await service.find_recipe_ids_by_ingredient("tomate")) == 2
+        assert len(await service.find_recipe_ids_by_ingredient("tomates pomme")) == 1
+        assert "query_entities" not in service.table_client.calls
+
+        found = await service.search_recipes_by_ingredient("Basilic")
+        assert [recipe.id for recipe in found] == [salad.id]
+
+    async def test_index_follows_updates_and_deletes(self):
+        """Test that changed and deleted recipes leave no stale postings."""
+        service, index_client = _indexed_service()
+        recipe = await service.create_recipe(make_recipe_create(ingredients=_ingredients("Tomate")))
+
+        await service.update_recipe(recipe.id, RecipeUpdate(ingredients=_ingredients("Courgette")))
+        assert await service.find_recipe_ids_by_ingredient("tomate") == []
+        assert await service.find_recipe_ids_by_ingredient("courgette") == [recipe.id]
+
+        await service.delete_recipe(recipe.id)
+        assert await service.find_recipe_ids_by_ingredient("courgette") == []
+        assert index_client.entities == {}
+
+    async def test_scan_fallback_matches_the_index(self):
+        """Test that a service without index returns the same hits."""
+        service = RecipeService(FakeTableClient())
+        await service.create_recipe(make_recipe_create(ingredients=_ingredients("Tomates", "Basilic")))
+        await service.create_recipe(make_recipe_create(ingredients=_ingredients("Courgette")))
+
+        assert len(await service.find_recipe_ids_by_ingredient("tomate")) == 1
+        assert await service.find_recipe_ids_by_ingredient("de") == []
+
+    async def test_backfill_indexes_existing_recipes(self):
+        """Test that recipes written before the index can be indexed afterwards."""
+        table_client = FakeTableClient()
+        legacy = await RecipeService(table_client).create_recipe(
+            make_recipe_create(ingredients=_ingredients("Tomate"))
+        )
+        service = RecipeService(table_client, ingredient_index=PostingIndex(FakeTableClient()))
+
+        assert await service.backfill_indexes() == 1
+        assert await service.find_recipe_ids_by_ingredient("tomate") == [legacy.id]
@@ -0,0 +1,87 @@
+"""
+Tests for merge-mode partial recipe updates.
+"""
+from typing import Any, Dict, List
+
+from app.schemas.recipe import Ingredient, RecipeUpdate, Unit
+from app.services.recipe_index import PostingIndex
+from app.services.recipe_service import RecipeService
+from tests.fakes import FakeTableClient, make_recipe_entity
+
+
+def _recording(table_client: FakeTableClient) -> List[Dict[str, Any]]:
+    """Record the entities and modes passed to update_entity."""
+    writes: List[Dict[str, Any]] = []
+    update_entity = table_client.update_entity
+
+    async def recording_update(entity, mode="merge", **kwargs):
+        writes.append({"entity": dict(entity), "mode": mode, **kwargs})
+        return await update_entity(entity, mode=mode, **kwargs)
+
+    table_client.update_entity = recording_update
+    return writes
+
+
+class TestPartialUpdate:
+    """Test cases for RecipeService.update_recipe."""
+
+    async def test_title_only_update_writes_only_the_title(self):
+        """Test that a small edit is one unconditional merge of the changed columns."""
+        table_client = FakeTableClient()
+        table_client.entities[("recipe", "r1")] = make_recipe_entity("r1")
+        writes = _recording(table_client)
+        service = RecipeService(table_client)
+
+        recipe = await service.update_recipe("r1", RecipeUpdate(title="Nouveau titre"))
+
+        assert recipe.title == "Nouveau titre"
+        assert len(writes) == 1 and writes[0]["mode"] == "merge"
+        assert set(writes[0]["entity"]) == {"PartitionKey", "RowKey", "title", "updated_at"}
+        assert "etag" not in writes[0]
+        # The only read is the one returning the stored recipe after the write
+        assert table_client.calls["get_entity"] == 1
+        assert recipe.ingredients[0].name == "tomate"
+
+    async def test_total_time_uses_the_stored_cook_time(self):
+        """Test that changing the preparation time alone recomputes the total."""
+        table_client = FakeTableClient()
+        table_client.entities[("recipe", "r1")] = make_recipe_entity("r1")
+        service = RecipeService(table_client)
+
+        recipe = await service.update_recipe("r1", RecipeUpdate(prep_time_minutes=15))
+
+        assert recipe.total_time_minutes == 35
+        assert table_client.entities[("recipe", "r1")]["total_time_minutes"] == 35
+
+    async def test_indexed_columns_are_reindexed(self):
+        """Test that changing ingredients moves the recipe between index keys."""
+        table_client = FakeTableClient()
+        table_client.entities[("recipe", "r1")] = make_recipe_entity("r1")
+        ingredient_index = PostingIndex(FakeTableClient())
+        service = RecipeService(table_client, ingredient_index=ingredient_index)
+        await service.backfill_indexes()
+
+        await service.update_recipe(
+            "r1", RecipeUpdate(ingredients=[Ingredient(name="courgette", quantity=1, unit=Unit.PIECE)])
+        )
+
+        assert await ingredient_index.lookup("courgette") == {"r1"}
+        assert await ingredient_index.lookup("tomate") == set()
+
+    async def test_null_clears_the_main_image(self):
+        """Test that an explicit null removes an optional value."""
+        table_client = FakeTableClient()
+        table_client.entities[("recipe", "r1")] = make_recipe_entity("r1", main_image_url="https://img/1.jpg")
+        service = RecipeService(table_client)
+
+        recipe = await service.update_recipe("r1", RecipeUpdate(main_image_url=None))
+
+        assert recipe.main_image_url is None
+
+    async def test_missing_recipe_is_not_created(self):
+        """Test that a merge on an unknown id does not create a partial row."""
+        table_client = FakeTableClient()
+        service = RecipeService(table_client)
+
+        assert await service.update_recipe("missing", RecipeUpdate(title="Nouveau titre")) is None
+        assert table_client.entities == {}
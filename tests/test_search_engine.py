@@ -0,0 +1,260 @@
+"""
+Tests for the in-memory full-text search engine.
+"""
+import random
+import statistics
+import threading
+import time
+
+import pytest
+
+from app.schemas.recipe import Ingredient, RecipeUpdate, Unit
+from app.services.recipe_index import PostingIndex
+from app.services.recipe_service import RecipeService, SearchNotReadyError
+from app.services.search_engine import SearchEngine, recipe_fields
+from app.services.text import analyze, stem
+from tests.fakes import FakeTableClient, make_recipe_create, make_recipe_entity
+
+
+def _engine(**recipes):
+    engine = SearchEngine()
+    for recipe_id, (title, ingredients) in recipes.items():
+        engine.index(recipe_id, recipe_fields(title, "", [], ingredients))
+    return engine
+
+
+class TestAnalyzer:
+    """Test cases for the text analyzer."""
+
+    def test_stem_groups_inflections(self):
+        """Test that plurals, accents and verb forms share a stem."""
+        assert stem("tomates") == stem("tomate")
+        assert analyze("Poulet grillé") == analyze("poulets grillés")
+        assert analyze("la tarte aux fraises") == [stem("tarte"), stem("fraises")]
+
+
+class TestSearchEngine:
+    """Test cases for SearchEngine."""
+
+    def test_title_matches_rank_first(self):
+        """Test that a term in the title weighs more than in the ingredients."""
+        engine = _engine(
+            soup=("Soupe de légumes", ["tomate", "carotte"]),
+            tart=("Tarte à la tomate", ["tomate", "pâte brisée"]),
+            salad=("Salade verte", ["laitue"]),
+        )
+
+        hits, total = engine.search("tomates")
+
+        assert [recipe_id for recipe_id, _ in hits] == ["tart", "soup"]
+        assert total == 2
+
+    def test_accents_and_plurals_match(self):
+        """Test that the query is normalized like the documents."""
+        engine = _engine(brulee=("Crème brûlée", ["œufs", "crème"]))
+
+        assert engine.search("creme brulee")[0][0][0] == "brulee"
+        assert engine.search("oeuf")[1] == 1
+
+    def test_offset_pages_through_results(self):
+        """Test that offset and limit slice the ranked list."""
+        engine = _engine(**{f"r{number}": (f"Tarte {number}", ["tomate"] * (number + 1)) for number in range(5)})
+
+        first, total = engine.search("tarte", limit=2)
+        second, _ = engine.search("tarte", limit=2, offset=2)
+
+        assert total == 5
+        assert len(first) == len(second) == 2
+        assert not {recipe_id for recipe_id, _ in first} & {recipe_id for recipe_id, _ in second}
+
+    def test_updates_are_incremental(self):
+        """Test that reindexing and removing a recipe are visible immediately."""
+        engine = _engine(tart=("Tarte à la tomate", ["tomate"]), soup=("Soupe", ["tomate"]))
+        engine.warm()
+
+        engine.index("tart", recipe_fields("Tarte aux poires", "", [], ["poire"]))
+        engine.remove("soup")
+
+        assert engine.search("tomate") == ([], 0)
+        assert engine.search("poire")[0][0][0] == "tart"
+        assert len(engine) == 1
+
+    def test_rank_keeps_only_matching_candidates(self):
+        """Test that rank orders candidates and drops the ones without a term."""
+        engine = _engine(
+            soup=("Soupe de légumes", ["tomate"]),
+            tart=("Tarte à la tomate", ["tomate"]),
+            salad=("Salade verte", ["laitue"]),
+        )
+
+        assert engine.rank("tomate", ["salad", "soup", "tart", "missing"]) == ["tart", "soup"]
+
+    def test_top_k_matches_exhaustive_scoring(self):
+        """Test that early termination returns the exact BM25 top-k."""
+        rng = random.Random(7)
+        engine = SearchEngine()
+        for number in range(3000):
+            engine.index(f"r{number}", recipe_fields(
+                " ".join(rng.sample(DISHES, 1) + rng.sample(ADJECTIVES, 1) + rng.sample(INGREDIENTS, 2)),
+                "",
+                [],
+                rng.sample(INGREDIENTS, 5),
+            ))
+
+        for query in ["tarte tomates", "poulet rôti", "gratin courgette fromage"]:
+            hits, _ = engine.search(query, limit=10)
+            scores = {}
+            for term in set(analyze(query)):
+                for number, impact in engine._term_impacts(term).by_document.items():
+                    scores[number] = scores.get(number, 0.0) + impact
+            expected = sorted(scores.values(), reverse=True)[:10]
+            assert [score for _, score in hits] == pytest.approx(expected)
+
+
+class TestRecipeSearchService:
+    """Test cases for RecipeService.search_recipes."""
+
+    async def test_search_is_unavailable_until_built(self):
+        """Test that text queries wait for the engine to be built."""
+        service = RecipeService(FakeTableClient())
+
+        with pytest.raises(SearchNotReadyError):
+            await service.search_recipes(query="tarte")
+
+    async def test_rebuild_reads_the_table_and_follows_writes(self):
+        """Test that the built engine sees existing recipes and later writes."""
+        table_client = FakeTableClient()
+        table_client.entities[("recipe", "r001")] = make_recipe_entity("r001", title="Tarte aux pommes")
+        service = RecipeService(table_client, ingredient_index=PostingIndex(FakeTableClient()))
+
+        assert await service.rebuild_search_engine() == 1
+        created = await service.create_recipe(make_recipe_create(
+            title="Tarte à la tomate",
+            ingredients=[Ingredient(name="Tomates", quantity=3, unit=Unit.PIECE)],
+        ))
+
+        recipes, total = await service.search_recipes(query="tartes")
+        assert total == 2 and {recipe.id for recipe in recipes} == {"r001", created.id}
+
+        recipes, total = await service.search_recipes(query="tarte", ingredient="tomate")
+        assert total == 1 and recipes[0].id == created.id
+
+        await service.update_recipe(created.id, RecipeUpdate(title="Quiche"))
+        assert (await service.search_recipes(query="tarte"))[1] == 1
+        await service.delete_recipe(created.id)
+        assert (await service.search_recipes(query="quiche"))[1] == 0
+
+    async def test_writes_during_rebuild_are_replayed(self):
+        """Test that a write made while the table is being read is not lost."""
+        table_client = FakeTableClient()
+        service = RecipeService(table_client)
+        service._search_replay = []
+        created = await service.create_recipe(make_recipe_create(title="Gratin dauphinois"))
+        replay, service._search_replay = service._search_replay, None
+
+        assert replay == [(created.id, service._recipe_search_fields(created))]
+
+    async def test_rebuild_indexes_and_warms_off_the_event_loop(self, monkeypatch):
+        """Test that indexing the table and warming run in a thread, not on the loop."""
+        table_client = FakeTableClient()
+        for number in range(3):
+            table_client.entities[("recipe", f"r{number}")] = make_recipe_entity(f"r{number}")
+        service = RecipeService(table_client)
+        loop_thread = threading.get_ident()
+        threads = []
+        warm, index = SearchEngine.warm, SearchEngine.index
+
+        def recording_warm(engine):
+            threads.append(("warm", threading.get_ident()))
+            warm(engine)
+
+        def recording_index(engine, recipe_id, fields):
+            threads.append(("index", threading.get_ident()))
+            index(engine, recipe_id, fields)
+
+        monkeypatch.setattr(SearchEngine, "warm", recording_warm)
+        monkeypatch.setattr(SearchEngine, "index", recording_index)
+
+        assert await service.rebuild_search_engine() == 3
+
+        assert [name for name, _ in threads] == ["index"] * 3 + ["warm"]
+        assert all(thread != loop_thread for _, thread in threads)
+
+
+INGREDIENTS = [
+    "tomate", "poulet", "boeuf", "carotte", "oignon", "ail", "basilic", "courgette",
+    "aubergine", "poivron", "riz", "pâtes", "crème fraîche", "beurre", "farine", "œufs",
+    "sucre", "chocolat", "fraises", "pommes de terre", "saumon", "thon", "lentilles",
+    "pois chiches", "champignons", "épinards", "fromage de chèvre", "parmesan", "citron", "miel",
+]
+ADJECTIVES = [
+    "grillé", "rôti", "mijoté", "croustillant", "fondant", "épicé", "léger",
+    "gratiné", "sauté", "vapeur", "maison", "rapide", "provençal", "crémeux",
+]
+DISHES = [
+    "salade", "tarte", "gratin", "soupe", "curry", "risotto", "gâteau",
+    "quiche", "velouté", "poêlée", "tajine", "crumble", "clafoutis", "wok",
+]
+
+
+QUERIES = [
+    "tarte tomates", "poulet rôti", "gratin courgette fromage", "chocolat",
+    "soupe lentilles citron miel", "salade", "risotto champignons parmesan",
+]
+
+
+def _synthetic_engine(size: int) -> SearchEngine:
+    rng = random.Random(42)
+    vocabulary = [f"mot{number}" for number in range(5000)]
+    engine = SearchEngine()
+    for number in range(size):
+        ingredients = rng.sample(INGREDIENTS, 6)
+        engine.index(f"r{number}", recipe_fields(
+            f"{rng.choice(DISHES)} {rng.choice(ADJECTIVES)} {ingredients[0]} {ingredients[1]}",
+            " ".join(rng.choices(vocabulary, k=12)),
+            rng.sample(ADJECTIVES, 2),
+            ingredients,
+        ))
+    engine.warm()
+    return engine
+
+
+class TestSearchCost:
+    """Documents scored by a query on a synthetic catalog."""
+
+    def test_top_k_scores_a_fraction_of_the_matches(self):
+        """Test that queries score far fewer documents than they match."""
+        engine = _synthetic_engine(20_000)
+
+        matched = scored = 0
+        for query in QUERIES:
+            engine.documents_scored = 0
+            results, total = engine.search(query, limit=10)
+            assert len(results) == 10
+            if len(query.split()) == 1:
+                assert engine.documents_scored == 10
+            matched += total
+            scored += engine.documents_scored
+
+        assert scored < matched / 3
+
+
+@pytest.mark.benchmark
+class TestSearchBenchmark:
+    """Latency benchmark on a synthetic catalog of 100k recipes (pytest -m benchmark -s)."""
+
+    def test_query_latency_on_100k_recipes(self):
+        """Report the median and p95 latency of warm queries."""
+        engine = _synthetic_engine(100_000)
+
+        timings = []
+        for _ in range(10):
+            for query in QUERIES:
+                start = time.perf_counter()
+                engine.search(query, limit=10)
+                timings.append(time.perf_counter() - start)
+
+        timings.sort()
+        p50 = statistics.median(timings) * 1000
+        p95 = timings[int(len(timings) * 0.95)] * 1000
+        print(f"\nsearch on 100k recipes: p50 {p50:.2f} ms, p95 {p95:.2f} ms")
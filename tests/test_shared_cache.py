@@ -0,0 +1,105 @@
+"""
+Tests for the cache shared between workers.
+"""
+from app.schemas.recipe import DifficultyLevel, RecipeSearchFilters, RecipeUpdate
+from app.services import shared_cache
+from app.services.recipe_service import RecipeService
+from app.services.shared_cache import InMemorySharedCache, open_shared_cache
+from tests.fakes import FakeTableClient, make_recipe_create
+
+
+class TestInMemorySharedCache:
+    """Test cases for InMemorySharedCache."""
+
+    async def test_entries_expire_after_their_ttl(self, monkeypatch):
+        """Test that a value is gone once its TTL has elapsed."""
+        now = [1000.0]
+        monkeypatch.setattr(shared_cache.time, "monotonic", lambda: now[0])
+        cache = InMemorySharedCache()
+        await cache.set("a", b"1", ttl_seconds=10)
+        assert await cache.get("a") == b"1"
+
+        now[0] += 11
+
+        assert await cache.get("a") is None
+
+    async def test_incr_creates_and_increments_a_counter(self):
+        """Test that incr starts at 1 and is readable with get."""
+        cache = InMemorySharedCache()
+
+        assert await cache.incr("version") == 1
+        assert await cache.incr("version") == 2
+        assert await cache.get("version") == b"2"
+
+    def test_open_shared_cache_from_url(self):
+        """Test that no URL disables the shared cache and memory:// keeps it in process."""
+        assert open_shared_cache(None) is None
+        assert isinstance(open_shared_cache("memory://"), InMemorySharedCache)
+
+
+class TestRecipeServiceSharedCache:
+    """Test cases for the shared cache in RecipeService."""
+
+    async def test_other_workers_read_from_the_shared_cache(self):
+        """Test that a recipe read by one worker is served to another without a table read."""
+        table_client = FakeTableClient()
+        cache = InMemorySharedCache()
+        first = RecipeService(table_client, shared_cache=cache)
+        second = RecipeService(table_client, shared_cache=cache)
+        created = await first.create_recipe(make_recipe_create())
+
+        await first.get_recipe(created.id)
+        recipe = await second.get_recipe(created.id)
+
+        assert recipe.id == created.id
+        assert table_client.calls["get_entity"] == 1
+
+    async def test_update_drops_the_shared_recipe(self):
+        """Test that a write is visible to other workers on their next read."""
+        cache = InMemorySharedCache()
+        table_client = FakeTableClient()
+        first = RecipeService(table_client, shared_cache=cache)
+        second = RecipeService(table_client, shared_cache=cache)
+        created = await first.create_recipe(make_recipe_create(title="Titre"))
+        await second.get_recipe(created.id)
+
+        await first.update_recipe(created.id, RecipeUpdate(title="Nouveau titre"))
+
+        assert (await second.get_recipe(created.id)).title == "Nouveau titre"
+
+    async def test_list_pages_are_cached_until_a_write(self):
+        """Test that list pages are shared, then recomputed after the version is bumped."""
+        table_client = FakeTableClient()
+        cache = InMemorySharedCache()
+        first = RecipeService(table_client, shared_cache=cache)
+        second = RecipeService(table_client, shared_cache=cache)
+        for _ in range(3):
+            await first.create_recipe(make_recipe_create(difficulty=DifficultyLevel.EASY))
+
+        recipes, _ = await first.get_recipes_page(limit=10, summary=True)
+        queries = table_client.calls["query_entities"]
+        cached, _ = await second.get_recipes_page(limit=10, summary=True)
+        assert [recipe.id for recipe in cached] == [recipe.id for recipe in recipes]
+        assert table_client.calls["query_entities"] == queries
+
+        filters = RecipeSearchFilters(difficulty=DifficultyLevel.EASY)
+        assert len((await first.list_recipes(filters=filters))[0]) == 3
+        await second.create_recipe(make_recipe_create(difficulty=DifficultyLevel.EASY))
+
+        assert len((await first.get_recipes_page(limit=10))[0]) == 4
+        assert len((await first.list_recipes(filters=filters))[0]) == 4
+
+    async def test_cache_failures_fall_back_to_the_table(self):
+        """Test that an unreachable shared cache does not fail reads or writes."""
+        class BrokenCache(InMemorySharedCache):
+            async def get(self, key):
+                raise ConnectionError("cache down")
+
+            async def incr(self, key):
+                raise ConnectionError("cache down")
+
+        service = RecipeService(FakeTableClient(), shared_cache=BrokenCache())
+        created = await service.create_recipe(make_recipe_create())
+
+        assert (await service.get_recipe(created.id)).id == created.id
+        assert len((await service.get_recipes_page(limit=10))[0]) == 1